@@ -0,0 +1,56 @@
+"""api request logs partitioned by day
+
+Revision ID: 06b3b04faebb
+Revises: 
+Create Date: 2026-10-18 11:48:22.104857
+
+"""
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '06b3b04faebb'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Partitions created up front, the maintenance task keeps creating them afterwards
+INITIAL_PARTITION_DAYS = range(-1, 8)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('api_request_logs',
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+    sa.Column('method', sa.String(length=10), nullable=False),
+    sa.Column('route', sa.String(length=255), nullable=False),
+    sa.Column('status_code', sa.Integer(), nullable=False),
+    sa.Column('latency_ms', sa.Float(), nullable=False),
+    sa.Column('request_bytes', sa.BigInteger(), nullable=False),
+    sa.Column('response_bytes', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('created_at', 'id'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.create_index('ix_api_request_logs_route_created_at', 'api_request_logs', ['route', 'created_at'], unique=False)
+    op.create_index('ix_api_request_logs_status_code_created_at', 'api_request_logs', ['status_code', 'created_at'], unique=False)
+    today = datetime.utcnow().date()
+    for offset in INITIAL_PARTITION_DAYS:
+        day = today + timedelta(days=offset)
+        op.execute(
+            f"CREATE TABLE api_request_logs_p{day:%Y%m%d} PARTITION OF api_request_logs "
+            f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Dropping the parent drops every partition with it
+    op.drop_index('ix_api_request_logs_status_code_created_at', table_name='api_request_logs')
+    op.drop_index('ix_api_request_logs_route_created_at', table_name='api_request_logs')
+    op.drop_table('api_request_logs')
@@ -0,0 +1,30 @@
+"""api request logs default partition
+
+Revision ID: b7c4d2e91f06
+Revises: 06b3b04faebb
+Create Date: 2026-10-18 20:04:51.730214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c4d2e91f06'
+down_revision: Union[str, Sequence[str], None] = '06b3b04faebb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows outside of every daily partition land here instead of failing the
+    # whole ingest COPY; the maintenance task moves them to their partition
+    op.execute("CREATE TABLE IF NOT EXISTS api_request_logs_default PARTITION OF api_request_logs DEFAULT")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS api_request_logs_default")
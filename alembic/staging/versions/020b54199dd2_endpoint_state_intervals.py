@@ -0,0 +1,46 @@
+"""endpoint state intervals
+
+Revision ID: 020b54199dd2
+Revises: ea419b9f1170
+Create Date: 2026-10-18 14:22:05.916472
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '020b54199dd2'
+down_revision: Union[str, Sequence[str], None] = 'ea419b9f1170'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('endpoint_state_intervals',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+    sa.Column('endpoint_id', sa.Uuid(), nullable=False),
+    sa.Column('state', sa.String(length=10), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('ended_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['endpoint_id'], ['monitored_endpoints.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_endpoint_state_intervals_endpoint_id_started_at', 'endpoint_state_intervals',
+        ['endpoint_id', 'started_at'], unique=False
+    )
+    op.create_index(
+        'uq_endpoint_state_intervals_open', 'endpoint_state_intervals', ['endpoint_id'],
+        unique=True, postgresql_where=sa.text('ended_at IS NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_endpoint_state_intervals_open', table_name='endpoint_state_intervals')
+    op.drop_index('ix_endpoint_state_intervals_endpoint_id_started_at', table_name='endpoint_state_intervals')
+    op.drop_table('endpoint_state_intervals')
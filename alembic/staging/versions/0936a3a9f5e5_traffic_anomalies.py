@@ -0,0 +1,40 @@
+"""traffic anomalies
+
+Revision ID: 0936a3a9f5e5
+Revises: a324c48df353
+Create Date: 2026-10-18 16:31:52.074418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0936a3a9f5e5'
+down_revision: Union[str, Sequence[str], None] = 'a324c48df353'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('traffic_anomalies',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(), nullable=False),
+    sa.Column('route', sa.String(length=255), nullable=False),
+    sa.Column('method', sa.String(length=10), nullable=False),
+    sa.Column('kind', sa.String(length=10), nullable=False),
+    sa.Column('observed', sa.Float(), nullable=False),
+    sa.Column('expected', sa.Float(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_traffic_anomalies_bucket_start', 'traffic_anomalies', ['bucket_start'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_traffic_anomalies_bucket_start', table_name='traffic_anomalies')
+    op.drop_table('traffic_anomalies')
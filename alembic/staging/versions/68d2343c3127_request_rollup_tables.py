@@ -0,0 +1,45 @@
+"""request rollup tables
+
+Revision ID: 68d2343c3127
+Revises: 30142a65775e
+Create Date: 2026-10-18 10:12:41.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '68d2343c3127'
+down_revision: Union[str, Sequence[str], None] = '30142a65775e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ROLLUP_TABLES = ('api_request_rollups_1m', 'api_request_rollups_1h', 'api_request_rollups_1d')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table_name in ROLLUP_TABLES:
+        op.create_table(table_name,
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('route', sa.String(length=255), nullable=False),
+        sa.Column('method', sa.String(length=10), nullable=False),
+        sa.Column('request_count', sa.BigInteger(), nullable=False),
+        sa.Column('client_error_count', sa.BigInteger(), nullable=False),
+        sa.Column('server_error_count', sa.BigInteger(), nullable=False),
+        sa.Column('latency_sum_ms', sa.Float(), nullable=False),
+        sa.Column('latency_max_ms', sa.Float(), nullable=False),
+        sa.Column('request_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('response_bytes', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('bucket_start', 'route', 'method')
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name in reversed(ROLLUP_TABLES):
+        op.drop_table(table_name)
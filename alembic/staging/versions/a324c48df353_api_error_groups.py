@@ -0,0 +1,42 @@
+"""api error groups
+
+Revision ID: a324c48df353
+Revises: c51e1c960bd8
+Create Date: 2026-10-18 15:47:19.630284
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a324c48df353'
+down_revision: Union[str, Sequence[str], None] = 'c51e1c960bd8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('api_error_groups',
+    sa.Column('fingerprint', sa.String(length=40), nullable=False),
+    sa.Column('method', sa.String(length=10), nullable=False),
+    sa.Column('route', sa.String(length=255), nullable=False),
+    sa.Column('status_code', sa.Integer(), nullable=False),
+    sa.Column('message', sa.String(length=255), nullable=False),
+    sa.Column('first_seen', sa.DateTime(), nullable=False),
+    sa.Column('last_seen', sa.DateTime(), nullable=False),
+    sa.Column('count', sa.BigInteger(), nullable=False),
+    sa.Column('samples', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.PrimaryKeyConstraint('fingerprint')
+    )
+    op.create_index('ix_api_error_groups_last_seen', 'api_error_groups', ['last_seen'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_api_error_groups_last_seen', table_name='api_error_groups')
+    op.drop_table('api_error_groups')
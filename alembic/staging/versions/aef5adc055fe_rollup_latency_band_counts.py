@@ -0,0 +1,67 @@
+"""rollup latency band counts
+
+Revision ID: aef5adc055fe
+Revises: 7d63471774e4
+Create Date: 2026-10-18 19:12:40.218337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.utils.ddsketch import DDSketch
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'aef5adc055fe'
+down_revision: Union[str, Sequence[str], None] = '7d63471774e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ROLLUP_TABLES = ('api_request_rollups_1m', 'api_request_rollups_1h', 'api_request_rollups_1d')
+# Heatmap bands (ms) at this revision
+LATENCY_HEATMAP_BANDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+BACKFILL_BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    for table_name in ROLLUP_TABLES:
+        op.add_column(table_name, sa.Column('latency_band_counts', postgresql.ARRAY(sa.BigInteger()), nullable=True))
+        table = sa.table(
+            table_name,
+            sa.column('bucket_start', sa.DateTime()),
+            sa.column('route', sa.String()),
+            sa.column('method', sa.String()),
+            sa.column('latency_sketch', sa.LargeBinary()),
+            sa.column('latency_band_counts', postgresql.ARRAY(sa.BigInteger())),
+        )
+        update = table.update().where(
+            table.c.bucket_start == sa.bindparam('b_bucket_start'),
+            table.c.route == sa.bindparam('b_route'),
+            table.c.method == sa.bindparam('b_method'),
+        ).values(latency_band_counts=sa.bindparam('b_counts'))
+        rows = connection.execute(
+            sa.select(table.c.bucket_start, table.c.route, table.c.method, table.c.latency_sketch)
+            .where(table.c.latency_sketch.is_not(None))
+        ).yield_per(BACKFILL_BATCH_SIZE)
+        for batch in rows.partitions():
+            connection.execute(update, [
+                {
+                    'b_bucket_start': row.bucket_start,
+                    'b_route': row.route,
+                    'b_method': row.method,
+                    'b_counts': DDSketch.from_bytes(row.latency_sketch).band_counts(LATENCY_HEATMAP_BANDS_MS),
+                }
+                for row in batch
+            ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name in ROLLUP_TABLES:
+        op.drop_column(table_name, 'latency_band_counts')
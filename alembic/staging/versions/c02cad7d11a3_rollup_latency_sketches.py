@@ -0,0 +1,33 @@
+"""rollup latency sketches
+
+Revision ID: c02cad7d11a3
+Revises: 68d2343c3127
+Create Date: 2026-10-18 11:02:17.934610
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c02cad7d11a3'
+down_revision: Union[str, Sequence[str], None] = '68d2343c3127'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ROLLUP_TABLES = ('api_request_rollups_1m', 'api_request_rollups_1h', 'api_request_rollups_1d')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table_name in ROLLUP_TABLES:
+        op.add_column(table_name, sa.Column('latency_sketch', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name in ROLLUP_TABLES:
+        op.drop_column(table_name, 'latency_sketch')
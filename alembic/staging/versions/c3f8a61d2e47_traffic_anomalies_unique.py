@@ -0,0 +1,39 @@
+"""traffic anomalies unique per minute and route
+
+Revision ID: c3f8a61d2e47
+Revises: 5a1e0c7f3b92
+Create Date: 2026-10-18 21:12:37.418906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a61d2e47'
+down_revision: Union[str, Sequence[str], None] = '5a1e0c7f3b92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Overlapping ticks stored some minutes twice, keep the first row
+    op.execute(
+        "DELETE FROM traffic_anomalies a USING traffic_anomalies b "
+        "WHERE a.bucket_start = b.bucket_start AND a.route = b.route "
+        "AND a.method = b.method AND a.kind = b.kind AND a.id > b.id"
+    )
+    op.create_index(
+        'uq_traffic_anomalies_bucket_route', 'traffic_anomalies',
+        ['bucket_start', 'route', 'method', 'kind'], unique=True
+    )
+    op.drop_index('ix_traffic_anomalies_bucket_start', table_name='traffic_anomalies')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_traffic_anomalies_bucket_start', 'traffic_anomalies', ['bucket_start'], unique=False)
+    op.drop_index('uq_traffic_anomalies_bucket_route', table_name='traffic_anomalies')
@@ -0,0 +1,39 @@
+"""users trigram search indexes
+
+Revision ID: c4546ede80d9
+Revises: c620c89d1223
+Create Date: 2026-10-18 13:08:12.441093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4546ede80d9'
+down_revision: Union[str, Sequence[str], None] = 'c620c89d1223'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # The expression has to match app.services.user_search.USER_FULL_NAME
+    op.create_index(
+        'ix_users_full_name_trgm', 'users',
+        [sa.text("(first_name || ' ' || last_name) gin_trgm_ops")],
+        unique=False, postgresql_using='gin'
+    )
+    op.create_index(
+        'ix_users_email_trgm', 'users', ['email'],
+        unique=False, postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_email_trgm', table_name='users')
+    op.drop_index('ix_users_full_name_trgm', table_name='users')
@@ -0,0 +1,44 @@
+"""openai usage daily
+
+Revision ID: c51e1c960bd8
+Revises: 020b54199dd2
+Create Date: 2026-10-18 15:03:44.207915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c51e1c960bd8'
+down_revision: Union[str, Sequence[str], None] = '020b54199dd2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('openai_usage_daily',
+    sa.Column('usage_date', sa.Date(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('provider', sa.String(length=20), nullable=False),
+    sa.Column('model', sa.String(length=100), nullable=False),
+    sa.Column('request_count', sa.BigInteger(), nullable=False),
+    sa.Column('prompt_tokens', sa.BigInteger(), nullable=False),
+    sa.Column('completion_tokens', sa.BigInteger(), nullable=False),
+    sa.Column('cached_tokens', sa.BigInteger(), nullable=False),
+    sa.Column('latency_sum_ms', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('usage_date', 'user_id', 'provider', 'model')
+    )
+    op.create_index(
+        'ix_openai_usage_daily_user_id_usage_date', 'openai_usage_daily',
+        ['user_id', 'usage_date'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_openai_usage_daily_user_id_usage_date', table_name='openai_usage_daily')
+    op.drop_table('openai_usage_daily')
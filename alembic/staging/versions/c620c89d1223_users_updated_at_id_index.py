@@ -0,0 +1,28 @@
+"""users updated_at id index
+
+Revision ID: c620c89d1223
+Revises: fc515f8dede7
+Create Date: 2026-10-18 12:31:54.720318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c620c89d1223'
+down_revision: Union[str, Sequence[str], None] = 'fc515f8dede7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_users_updated_at_id', 'users', ['updated_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_updated_at_id', table_name='users')
@@ -0,0 +1,56 @@
+"""monitored endpoints
+
+Revision ID: ea419b9f1170
+Revises: c4546ede80d9
+Create Date: 2026-10-18 13:41:27.518306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ea419b9f1170'
+down_revision: Union[str, Sequence[str], None] = 'c4546ede80d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('monitored_endpoints',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('url', sa.String(length=2048), nullable=False),
+    sa.Column('method', sa.String(length=10), nullable=False),
+    sa.Column('expected_status', sa.Integer(), nullable=False),
+    sa.Column('interval_seconds', sa.Integer(), nullable=False),
+    sa.Column('timeout_seconds', sa.Float(), nullable=False),
+    sa.Column('degraded_latency_ms', sa.Float(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_monitored_endpoints_id'), 'monitored_endpoints', ['id'], unique=False)
+    op.create_index(op.f('ix_monitored_endpoints_is_active'), 'monitored_endpoints', ['is_active'], unique=False)
+    op.create_table('monitored_endpoint_status',
+    sa.Column('endpoint_id', sa.Uuid(), nullable=False),
+    sa.Column('state', sa.String(length=10), nullable=False),
+    sa.Column('status_code', sa.Integer(), nullable=True),
+    sa.Column('latency_ms', sa.Float(), nullable=True),
+    sa.Column('error', sa.String(length=255), nullable=True),
+    sa.Column('checked_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['endpoint_id'], ['monitored_endpoints.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('endpoint_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('monitored_endpoint_status')
+    op.drop_index(op.f('ix_monitored_endpoints_is_active'), table_name='monitored_endpoints')
+    op.drop_index(op.f('ix_monitored_endpoints_id'), table_name='monitored_endpoints')
+    op.drop_table('monitored_endpoints')
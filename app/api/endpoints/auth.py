@@ -1,3 +1,5 @@
+import hashlib
+
 from fastapi import (
     APIRouter, Depends, Query, status
 )
@@ -13,6 +15,8 @@ from app.core.security import (
     logout_user_from_all_devices,
     jwt_decoder_get_payload
 )
+from app.core.session_store import revoke_sessions
+from app.core.token_cache import publish_token_revocation
 from app.db.session import get_db
 from app.schemas.user import (
     UserLogin,
@@ -23,9 +27,9 @@ from app.schemas.user import (
 )
 
 from app.services.user_service import UserService
-from app.services.email_send import BrevoEmailSending #SendgridEmailSending
+from app.services.email_outbox import EmailOutboxService
 from app.schemas.success_schema import SuccessMessage
-from app.core.templates import templates 
+from app.core.templates import get_templates
 from app.core.config import settings
 from app.utils.datetime_utils import response_data_date_conversion
 
@@ -41,7 +45,8 @@ router = APIRouter()
     responses={
         200: {"description": "Login successful"},
         400: {"description": "Incorrect username or password"},
-        422: {"description": "Validation error"}
+        422: {"description": "Validation error"},
+        503: {"description": "Too many password checks in progress, retry shortly"}
     }
 )
 async def login(
@@ -88,7 +93,8 @@ async def logout(
     redis_client: redis.Redis = Depends(get_redis_client)
 ):
     """Logout endpoint to invalidate user token."""
-    await redis_client.delete(f"{current_user['id']}_login")       
+    await revoke_sessions(redis_client, current_user['id'], 'login', current_user.get('sid'))
+    await publish_token_revocation(redis_client, current_user['id'])
     # The token will be invalidated by removing it from Redis
     # This is handled automatically by the token validation middleware
     return {"message": "Successfully logged out"}
@@ -145,21 +151,15 @@ async def forgot_password(
         "email": user.email
     }
     token = await create_forgot_password_token(user_data, redis_client)
-    html_content = templates.get_template("reset_password.html").render({
+    html_content = get_templates().get_template("reset_password.html").render({
         "first_name": user.first_name,
         "reset_url": f"{settings.FRONT_END_PASSWORD_RESET_URL}/{token}"
         })
-    
-    # await SendgridEmailSending(
-    #     to_emails=[user.email], 
-    #     subject="Reset Password: DocuHuB Application",
-    #     html_content= html_content).send_email()
-
-    await BrevoEmailSending(
-        to_emails=[user.email], 
-        subject="Reset Password: DocuHuB Application",
-        html_content= html_content).send_email()
-    
+    # Sent by the mailer process, the response does not wait for the provider
+    await EmailOutboxService(db).enqueue(
+        f"forgot_pwd:{user.id}:{hashlib.sha1(token.encode()).hexdigest()}",
+        [user.email], "Reset Password: DocuHuB Application", html_content)
+    await db.commit()
     return {"message": "If the email exists, a password reset link has been sent"}
 
 
@@ -171,7 +171,8 @@ async def forgot_password(
     response_model=SuccessMessage,
     responses={
         400: {"description": "Invalid token"},
-        422: {"description": "Validation error"}
+        422: {"description": "Validation error"},
+        503: {"description": "Too many password checks in progress, retry shortly"}
     }
 )
 async def reset_password(
@@ -183,5 +184,5 @@ async def reset_password(
     current_user = await jwt_decoder_get_payload(payload.token, "forgot_pwd", redis_client)
     await UserService(db).reset_password(
         current_user['email'], payload.new_password)
-    await redis_client.delete(f"{current_user['id']}_forgot_pwd")      
+    await revoke_sessions(redis_client, current_user['id'], 'forgot_pwd')
     return {"message": "Password reset successful"}
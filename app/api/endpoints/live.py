@@ -0,0 +1,36 @@
+from fastapi import (
+    APIRouter, Depends, status
+)
+from fastapi.responses import StreamingResponse
+
+from app.core.live_updates import live_update_broker
+from app.core.security import get_current_user_from_header_token
+
+router = APIRouter()
+
+
+@router.get(
+    "/stream",
+    summary="Live Dashboard Updates",
+    description="Server-Sent Events stream of dashboard widget updates (request counts, "
+                "error counts and uptime state changes). Each event is a JSON object with "
+                "`type` and `data`; comment lines are heartbeats. The stream ends after a few "
+                "minutes or on server shutdown and the client reconnects",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={
+        200: {"description": "text/event-stream of widget updates"},
+        401: {"description": "Invalid token"}
+    }
+)
+async def live_updates_stream(
+    current_user: dict = Depends(get_current_user_from_header_token)
+):
+    """Stream live dashboard updates."""
+    # No database session here: the stream stays open for up to
+    # LIVE_UPDATE_MAX_STREAM_SECONDS and must not hold a pooled connection.
+    return StreamingResponse(
+        live_update_broker.stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,234 @@
+from datetime import (
+    date, datetime)
+from uuid import UUID
+
+from fastapi import (
+    APIRouter, Depends, Query, status
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.exceptions import BadRequestException
+from app.core.password_hasher import password_hasher
+from app.core.permissions import admin_required
+from app.core.security import get_current_user_from_header_token
+from app.db.session import get_read_db
+from app.schemas.metrics import (
+    ErrorRateWrapResponse,
+    LatencyHeatmapWrapResponse,
+    LatencyPercentilesWrapResponse,
+    OpenAICostReportWrapResponse,
+    OpenAIUsageWrapResponse,
+    PasswordHashingStatsWrapResponse,
+    RequestTrafficWrapResponse,
+    TrafficAnomaliesWrapResponse,
+)
+from app.services.openai_usage import OpenAIUsageService
+from app.services.request_metrics_service import RequestMetricsService
+from app.utils.datetime_utils import is_valid_timezone
+
+router = APIRouter()
+
+# Widgets refresh on every open dashboard; identical reads share one result
+METRICS_CACHE_TTL = int(settings.METRICS_CACHE_TTL_IN_SECONDS)
+
+
+@router.get(
+    "/traffic",
+    response_model=RequestTrafficWrapResponse,
+    summary="Request Traffic",
+    description="Request, error and latency totals per time bucket read from the pre-aggregated rollups",
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"description": "Invalid time zone"},
+        401: {"description": "Invalid token"}
+    }
+)
+async def request_traffic(
+    timezone:  str = Query(..., description="User's local time zone", example="Asia/Kolkata"),
+    hours: int = Query(24, ge=1, le=24 * 90, description="Size of the window in hours"),
+    route: str = Query(None, description="Restrict to one route template"),
+    current_user: dict = Depends(get_current_user_from_header_token),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Request traffic of the last `hours` hours."""
+    if not is_valid_timezone(timezone):
+        raise BadRequestException(f"Unknown time zone: {timezone}")
+    result = await response_cache.get_or_compute(
+        f"metrics:traffic:{timezone}:{hours}:{route}",
+        lambda: RequestMetricsService(db).get_request_traffic(timezone, hours, route),
+        ttl=METRICS_CACHE_TTL)
+    return {"data": result}
+
+
+@router.get(
+    "/error-rate",
+    response_model=ErrorRateWrapResponse,
+    summary="Error Rate",
+    description="Total requests and error rate, overall and per route",
+    status_code=status.HTTP_200_OK,
+    responses={
+        401: {"description": "Invalid token"}
+    }
+)
+async def error_rate(
+    hours: int = Query(24, ge=1, le=24 * 90, description="Size of the window in hours"),
+    current_user: dict = Depends(get_current_user_from_header_token),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Error rate of the last `hours` hours."""
+    result = await response_cache.get_or_compute(
+        f"metrics:error_rate:{hours}",
+        lambda: RequestMetricsService(db).get_error_rate(hours),
+        ttl=METRICS_CACHE_TTL)
+    return {"data": result}
+
+
+@router.get(
+    "/latency",
+    response_model=LatencyPercentilesWrapResponse,
+    summary="Latency Percentiles",
+    description="p50/p95/p99 latency over the window, merged from the stored latency sketches",
+    status_code=status.HTTP_200_OK,
+    responses={
+        401: {"description": "Invalid token"}
+    }
+)
+async def latency_percentiles(
+    hours: int = Query(24, ge=1, le=24 * 90, description="Size of the window in hours"),
+    route: str = Query(None, description="Restrict to one route template"),
+    current_user: dict = Depends(get_current_user_from_header_token),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Latency percentiles of the last `hours` hours."""
+    result = await response_cache.get_or_compute(
+        f"metrics:latency:{hours}:{route}",
+        lambda: RequestMetricsService(db).get_latency_percentiles(hours, route),
+        ttl=METRICS_CACHE_TTL)
+    return {"data": result}
+
+
+@router.get(
+    "/latency-heatmap",
+    response_model=LatencyHeatmapWrapResponse,
+    summary="Latency Heatmap",
+    description="Request counts per time bucket and latency band, built from the stored latency sketches",
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"description": "Invalid time zone"},
+        401: {"description": "Invalid token"}
+    }
+)
+async def latency_heatmap(
+    timezone:  str = Query(..., description="User's local time zone", example="Asia/Kolkata"),
+    hours: int = Query(24, ge=1, le=24 * 90, description="Size of the window in hours"),
+    route: str = Query(None, description="Restrict to one route template"),
+    current_user: dict = Depends(get_current_user_from_header_token),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Latency heatmap of the last `hours` hours."""
+    if not is_valid_timezone(timezone):
+        raise BadRequestException(f"Unknown time zone: {timezone}")
+    result = await response_cache.get_or_compute(
+        f"metrics:latency_heatmap:{timezone}:{hours}:{route}",
+        lambda: RequestMetricsService(db).get_latency_heatmap(timezone, hours, route),
+        ttl=METRICS_CACHE_TTL)
+    return {"data": result}
+
+
+@router.get(
+    "/anomalies",
+    response_model=TrafficAnomaliesWrapResponse,
+    summary="Traffic Anomalies",
+    description="Request count spikes and drops per route, scored every minute against EWMA and hour-of-week baselines",
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"description": "Invalid time zone"},
+        401: {"description": "Invalid token"}
+    }
+)
+async def traffic_anomalies(
+    timezone:  str = Query(..., description="User's local time zone", example="Asia/Kolkata"),
+    hours: int = Query(24, ge=1, le=24 * 90, description="Size of the window in hours"),
+    route: str = Query(None, description="Restrict to one route template"),
+    kind: str = Query(None, pattern="^(spike|drop)$", description="spike or drop"),
+    current_user: dict = Depends(get_current_user_from_header_token),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Traffic anomalies of the last `hours` hours."""
+    if not is_valid_timezone(timezone):
+        raise BadRequestException(f"Unknown time zone: {timezone}")
+    # numpy is only needed here, keep it out of the worker startup
+    from app.services.anomaly_detector import AnomalyDetectionService
+    result = await AnomalyDetectionService(db).get_anomalies(timezone, hours, route, kind)
+    return {"data": result}
+
+
+@router.get(
+    "/openai-usage",
+    response_model=OpenAIUsageWrapResponse,
+    summary="OpenAI Usage Statistics",
+    description="Completions, tokens and estimated cost per model and per day from the daily usage counters. "
+                "Admins see everyone's usage or one user's, other users their own",
+    status_code=status.HTTP_200_OK,
+    responses={
+        401: {"description": "Invalid token"}
+    }
+)
+async def openai_usage(
+    days: int = Query(30, ge=1, le=366, description="Number of days, today included"),
+    user_id: UUID = Query(None, description="Restrict to one user (admin only)"),
+    current_user: dict = Depends(get_current_user_from_header_token),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """OpenAI usage of the last `days` days."""
+    if current_user['role_id'] != 1:
+        user_id = UUID(str(current_user['id']))
+    result = await OpenAIUsageService(db).get_usage_statistics(days, user_id)
+    return {"data": result}
+
+
+@router.get(
+    "/openai-cost",
+    response_model=OpenAICostReportWrapResponse,
+    summary="OpenAI Cost Report",
+    description="Tokens and estimated cost per user and model for a range of UTC days",
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"description": "Invalid date range"},
+        401: {"description": "Invalid token"},
+        403: {"description": "Admin privileges required"}
+    }
+)
+async def openai_cost_report(
+    start: date = Query(None, description="First UTC day, defaults to the first day of the current month"),
+    end: date = Query(None, description="Last UTC day, defaults to today"),
+    current_user: dict = Depends(admin_required),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """OpenAI cost per user and model."""
+    end = end or datetime.utcnow().date()
+    start = start or end.replace(day=1)
+    if start > end:
+        raise BadRequestException("start must not be after end")
+    result = await OpenAIUsageService(db).get_cost_report(start, end)
+    return {"data": result}
+
+
+@router.get(
+    "/password-hashing",
+    response_model=PasswordHashingStatsWrapResponse,
+    summary="Password Hashing Pool",
+    description="Load and rejections of the bcrypt process pool of the API worker serving the request",
+    status_code=status.HTTP_200_OK,
+    responses={
+        401: {"description": "Invalid token"},
+        403: {"description": "Admin privileges required"}
+    }
+)
+async def password_hashing_stats(
+    current_user: dict = Depends(admin_required)
+):
+    """Password hashing pool counters."""
+    return {"data": password_hasher.stats()}
@@ -0,0 +1,88 @@
+from datetime import (
+    datetime, timedelta)
+
+from fastapi import (
+    APIRouter, Depends, Query, status
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import BadRequestException
+from app.core.permissions import admin_required
+from app.core.security import get_current_user_from_header_token
+from app.db.session import get_read_db
+from app.schemas.request_log import PaginatedErrorGroupResponse
+from app.services.error_group_service import ErrorGroupService
+from app.services.request_log_service import RequestLogService
+from app.utils.datetime_utils import (
+    convert_timezone_to_utc_object, is_valid_timezone)
+
+router = APIRouter()
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+@router.get(
+    "/export",
+    summary="Export Request Logs",
+    description="Stream the detailed request logs of a time window as NDJSON or CSV",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={
+        200: {"description": "Log rows streamed as NDJSON lines or CSV rows"},
+        400: {"description": "Invalid time zone or time window"},
+        401: {"description": "Invalid token"},
+        403: {"description": "Admin privileges required"}
+    }
+)
+async def export_request_logs(
+    timezone:  str = Query(..., description="User's local time zone", example="Asia/Kolkata"),
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    start: datetime = Query(None, description="Window start in the user's time zone, defaults to 24 hours ago"),
+    end: datetime = Query(None, description="Window end in the user's time zone, defaults to now"),
+    route: str = Query(None, description="Restrict to one route template"),
+    status_code: int = Query(None, ge=100, le=599, description="Restrict to one status code"),
+    current_user: dict = Depends(admin_required)
+):
+    """Stream the detailed request logs."""
+    if not is_valid_timezone(timezone):
+        raise BadRequestException(f"Unknown time zone: {timezone}")
+    end_utc = convert_timezone_to_utc_object(end, timezone).replace(tzinfo=None) if end else datetime.utcnow()
+    start_utc = convert_timezone_to_utc_object(start, timezone).replace(tzinfo=None) if start else end_utc - timedelta(hours=24)
+    if start_utc >= end_utc:
+        raise BadRequestException("start must be before end")
+    rows = RequestLogService().export_logs(timezone, export_format, start_utc, end_utc, route, status_code)
+    filename = f"request_logs_{start_utc:%Y%m%d%H%M}_{end_utc:%Y%m%d%H%M}.{export_format}"
+    return StreamingResponse(
+        rows,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get(
+    "/errors",
+    response_model=PaginatedErrorGroupResponse,
+    summary="Failed APIs",
+    description="Failed requests grouped by route, status code and normalized error message, "
+                "with occurrence counts and a few samples per group",
+    status_code=status.HTTP_200_OK,
+    responses={
+        401: {"description": "Invalid token"}
+    }
+)
+async def get_error_groups(
+    timezone:  str = Query(..., description="User's local time zone", example="Asia/Kolkata"),
+    hours: int = Query(24, ge=1, le=24 * 90, description="Groups seen in the last `hours` hours"),
+    page: int = Query(1, ge=1, description="Page number"),
+    per_page: int = Query(20, ge=1, le=100, description="Groups per page"),
+    status_code: int = Query(None, ge=400, le=599, description="Restrict to one status code"),
+    route: str = Query(None, description="Restrict to one route template"),
+    current_user: dict = Depends(get_current_user_from_header_token),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Grouped failed requests."""
+    return await ErrorGroupService(db).get_error_groups(timezone, hours, page, per_page, status_code, route)
@@ -0,0 +1,109 @@
+from datetime import (
+    datetime, timedelta)
+from typing import Tuple
+from uuid import UUID
+
+from fastapi import (
+    APIRouter, Depends, Path, Query, status
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import BadRequestException
+from app.core.permissions import admin_required
+from app.core.security import get_current_user_from_header_token
+from app.db.session import (
+    get_db, get_read_db)
+from app.schemas.uptime import (
+    MonitoredEndpointCreate,
+    MonitoredEndpointWrapResponse,
+    StateIntervalsWrapResponse,
+    UptimeWrapResponse,
+)
+from app.services.uptime_service import UptimeService
+from app.utils.datetime_utils import (
+    convert_timezone_to_utc_object, is_valid_timezone)
+
+router = APIRouter()
+
+
+def uptime_window(timezone: str, start: datetime, end: datetime) -> Tuple[datetime, datetime]:
+    """Naive UTC window, defaults to the last 30 days."""
+    if not is_valid_timezone(timezone):
+        raise BadRequestException(f"Unknown time zone: {timezone}")
+    end_utc = convert_timezone_to_utc_object(end, timezone).replace(tzinfo=None) if end else datetime.utcnow()
+    start_utc = convert_timezone_to_utc_object(start, timezone).replace(tzinfo=None) if start else end_utc - timedelta(days=30)
+    if start_utc >= end_utc:
+        raise BadRequestException("start must be before end")
+    return start_utc, end_utc
+
+
+@router.post(
+    "/endpoints",
+    response_model=MonitoredEndpointWrapResponse,
+    summary="Add Monitored Endpoint",
+    description="Register an endpoint with the uptime prober, it is picked up on the next registry refresh",
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        401: {"description": "Invalid token"},
+        403: {"description": "Admin privileges required"},
+        422: {"description": "Validation error"}
+    }
+)
+async def create_monitored_endpoint(
+    payload: MonitoredEndpointCreate,
+    current_user: dict = Depends(admin_required),
+    db: AsyncSession = Depends(get_db)
+):
+    """Add a monitored endpoint."""
+    endpoint = await UptimeService(db).create_monitored_endpoint(payload)
+    return {"data": endpoint}
+
+
+@router.get(
+    "/",
+    response_model=UptimeWrapResponse,
+    summary="Uptime",
+    description="Current state and uptime percentage of every monitored endpoint over the window",
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"description": "Invalid time zone or time window"},
+        401: {"description": "Invalid token"}
+    }
+)
+async def get_uptime(
+    timezone:  str = Query(..., description="User's local time zone", example="Asia/Kolkata"),
+    start: datetime = Query(None, description="Window start in the user's time zone, defaults to 30 days ago"),
+    end: datetime = Query(None, description="Window end in the user's time zone, defaults to now"),
+    current_user: dict = Depends(get_current_user_from_header_token),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Uptime of the monitored endpoints."""
+    start_utc, end_utc = uptime_window(timezone, start, end)
+    result = await UptimeService(db).get_uptime(timezone, start_utc, end_utc)
+    return {"data": result}
+
+
+@router.get(
+    "/{endpoint_id}/intervals",
+    response_model=StateIntervalsWrapResponse,
+    summary="State Intervals",
+    description="Up, degraded and down intervals of one monitored endpoint over the window",
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"description": "Invalid time zone or time window"},
+        401: {"description": "Invalid token"},
+        404: {"description": "Monitored endpoint not found"}
+    }
+)
+async def get_state_intervals(
+    endpoint_id: UUID = Path(..., description="Monitored endpoint ID"),
+    timezone:  str = Query(..., description="User's local time zone", example="Asia/Kolkata"),
+    start: datetime = Query(None, description="Window start in the user's time zone, defaults to 30 days ago"),
+    end: datetime = Query(None, description="Window end in the user's time zone, defaults to now"),
+    current_user: dict = Depends(get_current_user_from_header_token),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """State history of a monitored endpoint."""
+    start_utc, end_utc = uptime_window(timezone, start, end)
+    result = await UptimeService(db).get_state_intervals(endpoint_id, timezone, start_utc, end_utc)
+    return {"data": result}
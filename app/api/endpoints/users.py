@@ -1,18 +1,25 @@
+from typing import List
+
 import redis.asyncio as redis
 
 from fastapi import (
-    APIRouter, Body, Depends, Path, Query, status,
+    APIRouter, BackgroundTasks, Body, Depends, File, Path, Query, UploadFile, status,
     )
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.exceptions import (
     AlreadyExistsException,
+    BadRequestException,
     UnauthorizedException,
 )
 from app.core.security import (
     jwt_decoder_get_payload
     )
-from app.db.session import get_db
+from app.core.session_store import revoke_sessions
+from app.core.token_cache import publish_token_revocation
+from app.db.session import (
+    get_db, get_read_db)
 from app.schemas import (
     SuccessMessage,
     UserCreate,
@@ -21,13 +28,17 @@ from app.schemas import (
     PaginatedUserResponse,
     UserUpdate,
     UserRegistration,
-    UserDashboardWrapResponse
+    UserDashboardWrapResponse,
+    BulkInviteJobWrapResponse,
+    BulkInviteProgressWrapResponse
 )
 from app.core.redis_config import get_redis_client
 from app.core.permissions import (
     admin_required,
     is_self_user_or_admin
 )
+from app.services.bulk_invite import (
+    BulkInviteService, parse_invite_csv, run_bulk_invite_job)
 from app.services.user_service import UserService
 from app.utils.datetime_utils import response_data_date_conversion
 router = APIRouter()
@@ -62,6 +73,90 @@ async def create_user(
     return {"message": "Successfully invited new user"}
 
 
+async def _start_bulk_invite(
+    users: List[UserCreate],
+    errors: List[dict],
+    background_tasks: BackgroundTasks,
+    db: AsyncSession,
+    redis_client: redis.Redis
+) -> dict:
+    total = len(users) + len(errors)
+    if not total:
+        raise BadRequestException("No users to invite")
+    if total > int(settings.BULK_INVITE_MAX_USERS):
+        raise BadRequestException(f"At most {settings.BULK_INVITE_MAX_USERS} users can be invited at once")
+    job_id = await BulkInviteService(db, redis_client).create_job(total, errors)
+    background_tasks.add_task(run_bulk_invite_job, job_id, users)
+    return {"data": {"job_id": job_id, "total": total}}
+
+
+@router.post(
+    "/invite/bulk",
+    summary="Bulk Invite Users",
+    description="Invite many users at once; existing emails are skipped. Poll the returned job for progress",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=BulkInviteJobWrapResponse,
+    responses={
+        400: {"description": "Bad request"},
+        422: {"description": "Validation error"}
+    }
+)
+async def bulk_invite_users(
+    background_tasks: BackgroundTasks,
+    payload: List[UserCreate] = Body(...),
+    current_user: dict = Depends(admin_required),
+    db: AsyncSession = Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis_client)
+):
+    """Bulk invite users from a JSON array."""
+    return await _start_bulk_invite(payload, [], background_tasks, db, redis_client)
+
+
+@router.post(
+    "/invite/bulk/csv",
+    summary="Bulk Invite Users From CSV",
+    description="Invite the users of a CSV file with the columns first_name, last_name, email, department_id "
+                "and optionally role_id. Invalid rows are reported in the job progress",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=BulkInviteJobWrapResponse,
+    responses={
+        400: {"description": "Bad request"},
+        422: {"description": "Validation error"}
+    }
+)
+async def bulk_invite_users_csv(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(..., description="CSV file with a header row"),
+    current_user: dict = Depends(admin_required),
+    db: AsyncSession = Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis_client)
+):
+    """Bulk invite users from a CSV file."""
+    users, errors = parse_invite_csv(await file.read())
+    return await _start_bulk_invite(users, errors, background_tasks, db, redis_client)
+
+
+@router.get(
+    "/invite/bulk/{job_id}",
+    summary="Bulk Invite Progress",
+    description="Progress of a bulk invitation job",
+    status_code=status.HTTP_200_OK,
+    response_model=BulkInviteProgressWrapResponse,
+    responses={
+        404: {"description": "Job not found"}
+    }
+)
+async def bulk_invite_progress(
+    job_id: str = Path(..., description="Bulk invitation job ID"),
+    current_user: dict = Depends(admin_required),
+    db: AsyncSession = Depends(get_db),
+    redis_client: redis.Redis = Depends(get_redis_client)
+):
+    """Get the progress of a bulk invitation job."""
+    return {"data": await BulkInviteService(
+        db, redis_client, int(settings.BULK_INVITE_STALE_AFTER_IN_SECONDS)).get_progress(job_id)}
+
+
 @router.post("/register/",
     summary="User Registration",
     description="From the invitation email Registration has to be completed",
@@ -71,7 +166,8 @@ async def create_user(
         400: {"description": "Bad request"},
         401: {"description": "Invalid token"},
         404: {"description": "User not found"},
-        422: {"description": "Validation error"}
+        422: {"description": "Validation error"},
+        503: {"description": "Too many password checks in progress, retry shortly"}
     }
 )
 async def user_register(
@@ -103,8 +199,9 @@ async def get_users(
     per_page: int = Query(10, ge=1, le=1000, description="Number of records to return per request"),
     is_active: bool = Query(None, description="Filter by active status"),
     name_email_search: str = Query(None, description="Filter by name match or email address"),
+    cursor: str = Query(None, description="next_cursor of the previous page, takes precedence over page"),
     current_user: dict = Depends(admin_required),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
     ):
     """Get list of users with optional filtering."""
     user_service = UserService(db)
@@ -113,7 +210,8 @@ async def get_users(
         page=page,
         per_page=per_page,
         is_active=is_active,
-        name_email_search=name_email_search
+        name_email_search=name_email_search,
+        cursor=cursor
     )
     return result
 
@@ -163,7 +261,8 @@ async def update_user(
     if current_user['role_id'] != 1 and set(payload.dict().keys()) - {'first_name', 'last_name', 'department_id'}:
         raise UnauthorizedException()
     if payload.role_id or payload.permissions:
-        await redis_client.delete(f"{user_id}_login")
+        await revoke_sessions(redis_client, user_id, 'login')
+        await publish_token_revocation(redis_client, user_id)
     await UserService(db).update_user(user_id, payload)
     return {"message": "Successfully updated the details"} 
 
@@ -176,7 +275,7 @@ async def update_user(
     )
 async def user_dashboard_data(
     current_user: dict = Depends(admin_required),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     ):
     result = await UserService(db).get_user_counts()
     return {"data": result} 
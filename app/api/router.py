@@ -6,7 +6,11 @@ from app.api.endpoints import (
     prompts,
     documents,
     open_ai,
-    display_logs
+    display_logs,
+    metrics,
+    request_logs,
+    uptime,
+    live
     )
 
 # Create main API router
@@ -24,3 +28,27 @@ api_router.include_router(
     prefix="/users",
     tags=["Users"]
 )
+
+api_router.include_router(
+    metrics.router,
+    prefix="/metrics",
+    tags=["Metrics"]
+)
+
+api_router.include_router(
+    request_logs.router,
+    prefix="/request-logs",
+    tags=["Request Logs"]
+)
+
+api_router.include_router(
+    uptime.router,
+    prefix="/uptime",
+    tags=["Uptime"]
+)
+
+api_router.include_router(
+    live.router,
+    prefix="/live",
+    tags=["Live Updates"]
+)
\ No newline at end of file
@@ -0,0 +1,185 @@
+import asyncio
+import json
+from typing import (
+    Any, Awaitable, Callable, Dict, Optional)
+from uuid import uuid4
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.core.redis_config import get_redis_connection
+
+
+CACHE_KEY_PREFIX = "cache"
+
+# Value of the current generation of a key, and whether it was invalidated
+# moments ago, in one round trip:
+# KEYS[1] = generation counter, KEYS[2] = settling flag, ARGV[1] = value key prefix
+_GET_SCRIPT = """
+local generation = redis.call('GET', KEYS[1]) or '0'
+return {generation, redis.call('GET', ARGV[1] .. generation), redis.call('EXISTS', KEYS[2])}
+"""
+# Release the recompute lock only if we still own it
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class ResponseCache:
+    """
+    Redis cache for expensive read results with single-flight misses.
+    On a miss one request (across all workers) takes a short lock and
+    recomputes while the others wait for its result; inside a worker
+    concurrent misses on the same key share one waiter, and a cancelled
+    leader hands the computation over to a waiter.
+    Invalidation bumps a generation counter instead of deleting, so a
+    computation that started before a write can never store a stale value
+    under the current generation. For `settle_seconds` after an
+    invalidation values are computed but not stored: reads served by a
+    lagging replica may not see the write yet and must not be cached for
+    the whole TTL.
+    Redis errors never fail the request, the value is then computed directly.
+    """
+
+    def __init__(
+        self,
+        get_redis_client: Callable[[], redis.Redis],
+        default_ttl: int,
+        lock_timeout: float = 10,
+        wait_timeout: float = 5,
+        poll_interval: float = 0.05,
+        settle_seconds: float = 0
+    ):
+        self.get_redis_client = get_redis_client
+        self.default_ttl = default_ttl
+        self.settle_seconds = settle_seconds
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.hits = 0
+        self.misses = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def _keys(key: str):
+        base = f"{CACHE_KEY_PREFIX}:{key}"
+        return f"{base}:generation", f"{base}:value:", f"{base}:lock", f"{base}:settling"
+
+    async def _read(self, client: redis.Redis, key: str):
+        generation_key, value_prefix, _, settling_key = self._keys(key)
+        generation, value, settling = await client.eval(
+            _GET_SCRIPT, 2, generation_key, settling_key, value_prefix)
+        return generation, value, bool(settling)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None
+    ) -> Any:
+        """Cached value of `key`, computed by `compute` (JSON serializable) on a miss."""
+        while True:
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # Our own cancellation propagates; the leader's (its client went
+                # away) makes the next waiter the leader, with its own compute,
+                # as the leader's compute may use its closed request session
+                if not inflight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._get_or_compute(key, compute, ttl or self.default_ttl)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark it retrieved in case there are none
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]], ttl: int) -> Any:
+        try:
+            client = self.get_redis_client()
+            generation, cached, settling = await self._read(client, key)
+        except Exception as e:
+            print(f"ResponseCache read {key} failed: {e}")
+            return await compute()
+        if cached is not None:
+            self.hits += 1
+            return json.loads(cached)
+
+        self.misses += 1
+        if settling:
+            return await compute()
+        _, value_prefix, lock_key, _ = self._keys(key)
+        token = uuid4().hex
+        try:
+            leader = await client.set(lock_key, token, nx=True, px=int(self.lock_timeout * 1000))
+        except Exception as e:
+            print(f"ResponseCache lock {key} failed: {e}")
+            return await compute()
+        if leader:
+            try:
+                value = await compute()
+                try:
+                    await client.set(f"{value_prefix}{generation}", json.dumps(value, default=str), ex=ttl)
+                except Exception as e:
+                    print(f"ResponseCache write {key} failed: {e}")
+                return value
+            finally:
+                try:
+                    await client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except Exception as e:
+                    # The lock expires after lock_timeout anyway
+                    print(f"ResponseCache unlock {key} failed: {e}")
+
+        # Someone else is recomputing: wait for the value, or for the lock to
+        # go away (holder failed) and compute it ourselves.
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.wait_timeout
+        while loop.time() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                _, cached, _ = await self._read(client, key)
+                if cached is not None:
+                    return json.loads(cached)
+                if not await client.exists(lock_key):
+                    break
+            except Exception as e:
+                print(f"ResponseCache wait {key} failed: {e}")
+                break
+        return await compute()
+
+    async def invalidate(self, *keys: str) -> None:
+        """Make the current values of `keys` unreachable."""
+        try:
+            async with self.get_redis_client().pipeline(transaction=False) as pipe:
+                for key in keys:
+                    generation_key, _, _, settling_key = self._keys(key)
+                    pipe.incr(generation_key)
+                    if self.settle_seconds:
+                        pipe.set(settling_key, 1, px=int(self.settle_seconds * 1000))
+                await pipe.execute()
+        except Exception as e:
+            print(f"ResponseCache invalidate {keys} failed: {e}")
+
+
+response_cache = ResponseCache(
+    get_redis_connection,
+    int(settings.RESPONSE_CACHE_TTL_IN_SECONDS),
+    # Values recomputed while the replica may lag behind a write are not cached
+    settle_seconds=float(settings.READ_YOUR_WRITES_WINDOW_IN_SECONDS) if settings.DATABASE_READ_REPLICA_URL else 0
+)
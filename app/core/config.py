@@ -37,6 +37,15 @@ class Settings(BaseSettings):
     DATABASE_POOL_RECYCLE_IN_SECONDS: int = os.environ['DATABASE_POOL_RECYCLE_IN_SECONDS']
     DATABASE_POOL_TIMEOUT_IN_SECONDS: int = os.environ['DATABASE_POOL_TIMEOUT_IN_SECONDS']
     DATABASE_CONNECT_TIMEOUT: int = os.environ['DATABASE_CONNECT_TIMEOUT']
+    # Compiled SQL cached per engine, and statements prepared per asyncpg connection
+    DATABASE_QUERY_CACHE_SIZE: int = os.environ.get('DATABASE_QUERY_CACHE_SIZE', 1200)
+    DATABASE_PREPARED_STATEMENT_CACHE_SIZE: int = os.environ.get('DATABASE_PREPARED_STATEMENT_CACHE_SIZE', 500)
+    # Read replica of the list, dashboard, log and metric reads; unset reads from the primary
+    DATABASE_READ_REPLICA_URL: str = os.environ.get('DATABASE_READ_REPLICA_URL', '')
+    DATABASE_READ_POOL_SIZE: int = os.environ.get('DATABASE_READ_POOL_SIZE', 10)
+    DATABASE_READ_MAX_OVERFLOW: int = os.environ.get('DATABASE_READ_MAX_OVERFLOW', 20)
+    # A client's reads stay on the primary this long after its own write
+    READ_YOUR_WRITES_WINDOW_IN_SECONDS: int = os.environ.get('READ_YOUR_WRITES_WINDOW_IN_SECONDS', 5)
 
     # Redis settings
     REDIS_HOST: str = os.environ['REDIS_HOST']
@@ -63,6 +72,7 @@ class Settings(BaseSettings):
     OPEN_AI_MODEL: str = os.environ['OPEN_AI_MODEL']
     OPEN_AI_PROMPT_BEHAVIOUR: str = os.environ['OPEN_AI_PROMPT_BEHAVIOUR']
     OPEN_AI_PROMPT_MAX_TOKEN: int = os.environ['OPEN_AI_PROMPT_MAX_TOKEN']
+    OPEN_AI_USAGE_FLUSH_INTERVAL_IN_SECONDS: float = os.environ.get('OPEN_AI_USAGE_FLUSH_INTERVAL_IN_SECONDS', 60)
 
     # Azure
     AZURE_ENDPOINT: str = os.environ['AZURE_ENDPOINT']
@@ -79,6 +89,74 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: str = os.environ['AWS_SECRET_ACCESS_KEY']
     AWS_REGION: str = os.environ['AWS_REGION']
     S3_BUCKET_NAME: str = os.environ['S3_BUCKET_NAME']
+    # Empty for AWS, or the URL of a local S3 stand-in (MinIO, moto server)
+    S3_ENDPOINT_URL: str = os.environ.get('S3_ENDPOINT_URL', '')
+    S3_MAX_POOL_CONNECTIONS: int = os.environ.get('S3_MAX_POOL_CONNECTIONS', 50)
+    S3_MULTIPART_CHUNK_SIZE_IN_MB: int = os.environ.get('S3_MULTIPART_CHUNK_SIZE_IN_MB', 8)
+    S3_TRANSFER_MAX_CONCURRENCY: int = os.environ.get('S3_TRANSFER_MAX_CONCURRENCY', 8)
+    S3_PRESIGNED_URL_EXPIRY_IN_SECONDS: int = os.environ.get('S3_PRESIGNED_URL_EXPIRY_IN_SECONDS', 43200)
+    S3_PRESIGNED_URL_CACHE_SIZE: int = os.environ.get('S3_PRESIGNED_URL_CACHE_SIZE', 10000)
+
+    # Request capture (per worker buffer flushed in batches to the Redis ingest queue)
+    REQUEST_LOG_BUFFER_SIZE: int = os.environ.get('REQUEST_LOG_BUFFER_SIZE', 50000)
+    REQUEST_LOG_BATCH_SIZE: int = os.environ.get('REQUEST_LOG_BATCH_SIZE', 1000)
+    REQUEST_LOG_FLUSH_INTERVAL_IN_SECONDS: float = os.environ.get('REQUEST_LOG_FLUSH_INTERVAL_IN_SECONDS', 2)
+    REQUEST_LOG_QUEUE_MAX_BACKLOG: int = os.environ.get('REQUEST_LOG_QUEUE_MAX_BACKLOG', 1000000)
+    REQUEST_LOG_INGEST_BATCH_SIZE: int = os.environ.get('REQUEST_LOG_INGEST_BATCH_SIZE', 10000)
+    REQUEST_LOG_INGEST_MAX_BATCHES: int = os.environ.get('REQUEST_LOG_INGEST_MAX_BATCHES', 50)
+    REQUEST_LOG_INGEST_INTERVAL_IN_SECONDS: float = os.environ.get('REQUEST_LOG_INGEST_INTERVAL_IN_SECONDS', 10)
+    # Held by the running ingest and extended after every batch, expires if its worker dies
+    REQUEST_LOG_INGEST_LOCK_TIMEOUT_IN_SECONDS: float = os.environ.get('REQUEST_LOG_INGEST_LOCK_TIMEOUT_IN_SECONDS', 120)
+    # A batch failing this many ingest runs in a row (~5 minutes) is moved to the dead letter list
+    REQUEST_LOG_INGEST_MAX_ATTEMPTS: int = os.environ.get('REQUEST_LOG_INGEST_MAX_ATTEMPTS', 30)
+    REQUEST_LOG_DEAD_LETTER_MAX_LENGTH: int = os.environ.get('REQUEST_LOG_DEAD_LETTER_MAX_LENGTH', 100000)
+    LATENCY_SKETCH_RELATIVE_ACCURACY: float = os.environ.get('LATENCY_SKETCH_RELATIVE_ACCURACY', 0.01)
+
+    # Detailed request logs (daily partitions of api_request_logs)
+    REQUEST_LOG_RETENTION_DAYS: int = os.environ.get('REQUEST_LOG_RETENTION_DAYS', 30)
+    REQUEST_LOG_PARTITIONS_AHEAD_DAYS: int = os.environ.get('REQUEST_LOG_PARTITIONS_AHEAD_DAYS', 7)
+
+    # Request count anomaly detection (scored on the 1m rollups)
+    ANOMALY_DETECTION_INTERVAL_IN_SECONDS: float = os.environ.get('ANOMALY_DETECTION_INTERVAL_IN_SECONDS', 60)
+    ANOMALY_Z_SCORE_THRESHOLD: float = os.environ.get('ANOMALY_Z_SCORE_THRESHOLD', 4)
+    ANOMALY_MIN_EXPECTED_REQUESTS: float = os.environ.get('ANOMALY_MIN_EXPECTED_REQUESTS', 5)
+    # Held by the running tick so ticks never overlap, expires if its worker dies
+    ANOMALY_DETECTION_LOCK_TIMEOUT_IN_SECONDS: float = os.environ.get('ANOMALY_DETECTION_LOCK_TIMEOUT_IN_SECONDS', 120)
+
+    # bcrypt process pool per API worker, and the calls it may hold before rejecting
+    PASSWORD_HASH_WORKERS: int = os.environ.get('PASSWORD_HASH_WORKERS', 2)
+    PASSWORD_HASH_MAX_PENDING: int = os.environ.get('PASSWORD_HASH_MAX_PENDING', 16)
+
+    # Verified login tokens kept per worker
+    TOKEN_CACHE_MAX_SIZE: int = os.environ.get('TOKEN_CACHE_MAX_SIZE', 10000)
+
+    # Redis response cache of the dashboard reads
+    RESPONSE_CACHE_TTL_IN_SECONDS: int = os.environ.get('RESPONSE_CACHE_TTL_IN_SECONDS', 60)
+    METRICS_CACHE_TTL_IN_SECONDS: int = os.environ.get('METRICS_CACHE_TTL_IN_SECONDS', 10)
+
+    # Email outbox mailer process
+    EMAIL_OUTBOX_BATCH_SIZE: int = os.environ.get('EMAIL_OUTBOX_BATCH_SIZE', 50)
+    EMAIL_OUTBOX_CONCURRENCY: int = os.environ.get('EMAIL_OUTBOX_CONCURRENCY', 10)
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = os.environ.get('EMAIL_OUTBOX_MAX_ATTEMPTS', 8)
+    EMAIL_OUTBOX_POLL_INTERVAL_IN_SECONDS: float = os.environ.get('EMAIL_OUTBOX_POLL_INTERVAL_IN_SECONDS', 1)
+
+    # Per request instrumentation (Server-Timing header)
+    SLOW_REQUEST_THRESHOLD_IN_MS: float = os.environ.get('SLOW_REQUEST_THRESHOLD_IN_MS', 500)
+    # A statement run this many times in one request is logged as a possible N+1
+    REPEATED_STATEMENT_THRESHOLD: int = os.environ.get('REPEATED_STATEMENT_THRESHOLD', 5)
+
+    # Bulk user invitations
+    BULK_INVITE_BATCH_SIZE: int = os.environ.get('BULK_INVITE_BATCH_SIZE', 500)
+    BULK_INVITE_MAX_USERS: int = os.environ.get('BULK_INVITE_MAX_USERS', 10000)
+    # A queued or running job without progress for this long lost its worker (restart, crash)
+    BULK_INVITE_STALE_AFTER_IN_SECONDS: int = os.environ.get('BULK_INVITE_STALE_AFTER_IN_SECONDS', 300)
+
+    # Uptime prober (single asyncio process probing the monitored endpoints)
+    UPTIME_PROBE_MAX_CONCURRENCY: int = os.environ.get('UPTIME_PROBE_MAX_CONCURRENCY', 200)
+    UPTIME_PROBE_MAX_CONNECTIONS_PER_HOST: int = os.environ.get('UPTIME_PROBE_MAX_CONNECTIONS_PER_HOST', 10)
+    UPTIME_PROBE_JITTER_RATIO: float = os.environ.get('UPTIME_PROBE_JITTER_RATIO', 0.1)
+    UPTIME_REGISTRY_REFRESH_IN_SECONDS: float = os.environ.get('UPTIME_REGISTRY_REFRESH_IN_SECONDS', 60)
+    UPTIME_RESULT_FLUSH_INTERVAL_IN_SECONDS: float = os.environ.get('UPTIME_RESULT_FLUSH_INTERVAL_IN_SECONDS', 5)
 
     # System Timezone
     TIMEZONE: str = os.environ['TIMEZONE'] 
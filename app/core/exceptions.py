@@ -35,6 +35,15 @@ class BadRequestException(HTTPException):
     def __init__(self, detail: str = "Something went wrong with the input data."):
         super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
 
+class ServiceBusyException(HTTPException):
+    """
+    Custom exception for when a bounded resource is saturated.
+    """
+    def __init__(self, detail: str = "Server is busy, kindly retry in a moment", retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=detail,
+            headers={"Retry-After": str(retry_after)})
+
 class InternalErrorException(HTTPException):
     """
     Custom exception for input related issues.
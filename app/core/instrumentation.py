@@ -0,0 +1,154 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+import redis.asyncio as redis
+from redis.asyncio.client import Pipeline
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class RequestMetrics:
+    """Resources used by one request: SQL queries and Redis calls and their time."""
+
+    __slots__ = ("db_queries", "db_ms", "redis_calls", "redis_ms", "statements")
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_ms = 0.0
+        self.redis_calls = 0
+        self.redis_ms = 0.0
+        # Executions per SQL text; parameters are bound, so a loop repeats the same text
+        self.statements: Counter = Counter()
+
+    def repeated_statements(self, threshold: int) -> list:
+        """
+        Statements run at least `threshold` times, the mark of an N+1 query:
+        a lookup per row of a list of at least `threshold` rows. One extra
+        query per request (a single lookup after another) is not flagged.
+        """
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+    def server_timing(self, total_ms: float) -> str:
+        return ", ".join((
+            f'db;dur={self.db_ms:.1f};desc="{self.db_queries} queries"',
+            f'redis;dur={self.redis_ms:.1f};desc="{self.redis_calls} calls"',
+            f"total;dur={total_ms:.1f}",
+        ))
+
+
+_request_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    """Metrics of the request being served, None outside of a request."""
+    return _request_metrics.get()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Count the queries of an engine, and their time, into the current request."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started_at = conn.info["query_started_at"].pop()
+        metrics = _request_metrics.get()
+        if metrics is not None:
+            metrics.db_queries += 1
+            metrics.db_ms += (time.perf_counter() - started_at) * 1000
+            metrics.statements[statement] += 1
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        started = exception_context.connection.info.get("query_started_at") if exception_context.connection else None
+        if started:
+            started.pop()
+
+
+class InstrumentedPipeline(Pipeline):
+    """Pipeline whose round trip counts as one Redis call of the current request."""
+
+    async def execute(self, raise_on_error: bool = True):
+        metrics = _request_metrics.get()
+        if metrics is None:
+            return await super().execute(raise_on_error)
+        started_at = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            metrics.redis_calls += 1
+            metrics.redis_ms += (time.perf_counter() - started_at) * 1000
+
+
+class InstrumentedRedis(redis.Redis):
+    """Redis client counting its commands, and their time, into the current request."""
+
+    async def execute_command(self, *args, **options):
+        metrics = _request_metrics.get()
+        if metrics is None:
+            return await super().execute_command(*args, **options)
+        started_at = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            metrics.redis_calls += 1
+            metrics.redis_ms += (time.perf_counter() - started_at) * 1000
+
+    def pipeline(self, transaction: bool = True, shard_hint=None) -> InstrumentedPipeline:
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+class ServerTimingMiddleware:
+    """
+    Pure ASGI middleware giving every HTTP request a RequestMetrics. The
+    totals go out as a Server-Timing header; slow requests and statements
+    repeated within one request (N+1 queries) are logged with their route.
+    Long-lived requests (`exclude_paths`) are passed through untouched.
+    """
+
+    def __init__(self, app, slow_request_ms: float, repeated_statement_threshold: int,
+                 exclude_paths: frozenset = frozenset()):
+        self.app = app
+        self.slow_request_ms = slow_request_ms
+        self.repeated_statement_threshold = repeated_statement_threshold
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        metrics = RequestMetrics()
+        token = _request_metrics.set(metrics)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                elapsed_ms = (time.perf_counter() - started_at) * 1000
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", metrics.server_timing(elapsed_ms).encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_metrics.reset(token)
+            self._report(scope, metrics, (time.perf_counter() - started_at) * 1000)
+
+    def _report(self, scope, metrics: RequestMetrics, elapsed_ms: float) -> None:
+        route = scope.get("route")
+        endpoint = f"{scope['method']} {route.path if route is not None else scope['path']}"
+        if elapsed_ms >= self.slow_request_ms:
+            print(
+                f"Slow request {endpoint} {elapsed_ms:.0f}ms: "
+                f"db {metrics.db_queries} queries {metrics.db_ms:.0f}ms, "
+                f"redis {metrics.redis_calls} calls {metrics.redis_ms:.0f}ms")
+        for statement, count in metrics.repeated_statements(self.repeated_statement_threshold):
+            print(f"Possible N+1 in {endpoint}: statement ran {count} times: {' '.join(statement.split())[:300]}")
@@ -0,0 +1,181 @@
+import asyncio
+import json
+import random
+import signal
+from typing import (
+    AsyncIterator, Callable, Iterable, Optional, Set, Tuple)
+
+import redis.asyncio as redis
+
+from app.core.redis_config import create_subscriber_client
+
+
+LIVE_UPDATES_CHANNEL = "dashboard:live_updates"
+LIVE_UPDATE_HEARTBEAT_SECONDS = 15
+# Frames waiting per client; a client further behind loses its oldest frames
+LIVE_UPDATE_CLIENT_QUEUE_SIZE = 32
+LIVE_UPDATE_RECONNECT_SECONDS = 2
+# A stream ends after this long (minus up to 20% jitter) and the browser's
+# EventSource reconnects, so no stream outlives a deploy by more than that
+LIVE_UPDATE_MAX_STREAM_SECONDS = 300
+
+_HEARTBEAT_FRAME = b": ping\n\n"
+_RETRY_FRAME = b"retry: 5000\n\n"
+
+
+def encode_live_update(event_type: str, data: dict) -> str:
+    return json.dumps({"type": event_type, "data": data}, separators=(",", ":"), default=str)
+
+
+async def publish_live_updates(redis_client: redis.Redis, events: Iterable[Tuple[str, dict]]) -> None:
+    """
+    Publish (type, data) events to every connected dashboard in one
+    pipelined round trip. Live updates are best effort, a failure is only
+    logged.
+    """
+    events = list(events)
+    if not events:
+        return
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for event_type, data in events:
+                pipe.publish(LIVE_UPDATES_CHANNEL, encode_live_update(event_type, data))
+            await pipe.execute()
+    except Exception as e:
+        print(f"publish_live_updates failed, dropped {len(events)} events: {e}")
+
+
+class LiveUpdateBroker:
+    """
+    Per-worker fan out of the live update channel to Server-Sent Event
+    streams. The worker holds a single Redis subscription; every message is
+    encoded into an SSE frame once and the same bytes object is queued for
+    each connected client, so an idle client costs one small queue and a
+    suspended generator. One heartbeat task keeps every stream alive
+    instead of a timer per client.
+    The server waits for open responses before running the lifespan
+    shutdown, so streams end on SIGTERM/SIGINT (end_streams) and after
+    max_stream_seconds at the latest.
+    """
+
+    def __init__(
+        self,
+        create_redis_client: Callable[[], redis.Redis],
+        channel: str = LIVE_UPDATES_CHANNEL,
+        heartbeat_interval: float = LIVE_UPDATE_HEARTBEAT_SECONDS,
+        queue_size: int = LIVE_UPDATE_CLIENT_QUEUE_SIZE,
+        max_stream_seconds: float = LIVE_UPDATE_MAX_STREAM_SECONDS
+    ):
+        # A new client per subscription, closed with it
+        self.create_redis_client = create_redis_client
+        self.channel = channel
+        self.heartbeat_interval = heartbeat_interval
+        self.queue_size = queue_size
+        self.max_stream_seconds = max_stream_seconds
+        self.dropped = 0
+        self.closing = False
+        self._clients: Set[asyncio.Queue] = set()
+        self._tasks = []
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def broadcast(self, frame: Optional[bytes]) -> None:
+        for queue in self._clients:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(frame)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                redis_client = self.create_redis_client()
+                pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+                try:
+                    await pubsub.subscribe(self.channel)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.broadcast(f"data: {message['data']}\n\n".encode())
+                finally:
+                    await pubsub.aclose()
+                    await redis_client.aclose()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"LiveUpdateBroker subscription lost, retrying: {e}")
+                await asyncio.sleep(LIVE_UPDATE_RECONNECT_SECONDS)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            self.broadcast(_HEARTBEAT_FRAME)
+
+    def start(self) -> None:
+        """Subscribe on the running event loop (application startup) and end the streams on shutdown signals."""
+        self.closing = False
+        self._tasks = [asyncio.create_task(self._listen()), asyncio.create_task(self._heartbeat())]
+        self._chain_shutdown_signals()
+
+    def _chain_shutdown_signals(self) -> None:
+        """
+        Run end_streams when the server is told to stop, then the server's own
+        handler, so the open streams do not hold up its connection drain.
+        """
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            previous = signal.getsignal(signum)
+            if not callable(previous):
+                # Default action terminates the process, nothing to drain
+                continue
+
+            def handler(received, frame, previous=previous):
+                loop.call_soon_threadsafe(self.end_streams)
+                previous(received, frame)
+
+            try:
+                signal.signal(signum, handler)
+            except ValueError:
+                # Not the main thread (tests, embedded servers): max_stream_seconds still applies
+                return
+
+    def end_streams(self) -> None:
+        """End every open stream and every stream opened from now on."""
+        self.closing = True
+        self.broadcast(None)
+
+    async def stop(self) -> None:
+        """Unsubscribe and end every open stream."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.end_streams()
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """
+        SSE frames for one client, until it disconnects, the worker stops or
+        the stream reaches its lifetime; the client then reconnects.
+        """
+        if self.closing:
+            return
+        queue = asyncio.Queue(self.queue_size)
+        self._clients.add(queue)
+        loop = asyncio.get_running_loop()
+        # Jitter so streams opened together do not all reconnect together
+        ends_at = loop.time() + self.max_stream_seconds * random.uniform(0.8, 1.0)
+        try:
+            yield _RETRY_FRAME
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), ends_at - loop.time())
+                except asyncio.TimeoutError:
+                    return
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            self._clients.discard(queue)
+
+
+live_update_broker = LiveUpdateBroker(create_subscriber_client)
@@ -6,6 +6,7 @@ from redis.asyncio.connection import ConnectionPool
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
+from app.core.instrumentation import InstrumentedRedis
 
 
 # Global Redis connection pool
@@ -27,7 +28,7 @@ async def connect_to_redis():
             ssl_cert_reqs=ssl.CERT_NONE,
             ssl_check_hostname=False,
         )
-        _redis_client = redis.Redis(connection_pool=_redis_pool)
+        _redis_client = InstrumentedRedis(connection_pool=_redis_pool)
         await _redis_client.ping()
         print("Redis connection successful!")
     except Exception as e:
@@ -57,6 +58,32 @@ async def get_redis_client() -> AsyncGenerator[redis.Redis, None]:
         yield _redis_client
     finally:
         pass
+
+
+def get_redis_connection() -> redis.Redis:
+    """
+    Returns the shared Redis client for code running outside of a request
+    (middleware, background flushers).
+    """
+    if _redis_client is None:
+        raise RuntimeError("Redis client not initialized. Ensure connect_to_redis() is called on startup.")
+    return _redis_client
+
+
+def create_subscriber_client() -> redis.Redis:
+    """
+    Returns a new Redis client with a pool of its own for a long lived
+    subscription, so the subscription does not hold one of the shared
+    pool's connections forever. The caller closes it.
+    """
+    return redis.Redis.from_url(
+        settings.REDIS_URL,
+        decode_responses=True,
+        encoding="utf-8",
+        max_connections=1,
+        ssl_cert_reqs=ssl.CERT_NONE,
+        ssl_check_hostname=False,
+    )
     
 # @asynccontextmanager
 # def get_sync_redis():
@@ -0,0 +1,43 @@
+from uuid import uuid4
+
+import redis.asyncio as redis
+
+
+# Release or extend the lock only if we still own it
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+_EXTEND_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class RedisLock:
+    """
+    Lock shared by every worker process (SET NX PX) so a periodic task never
+    overlaps with itself, whatever the worker concurrency or however long a
+    run takes compared to the beat interval. Only the owner (random token)
+    can extend or release it; a crashed owner's lock expires after `timeout`.
+    """
+
+    def __init__(self, redis_client: redis.Redis, key: str, timeout: float):
+        self.redis_client = redis_client
+        self.key = key
+        self.timeout_ms = int(timeout * 1000)
+        self.token = uuid4().hex
+
+    async def acquire(self) -> bool:
+        return bool(await self.redis_client.set(self.key, self.token, nx=True, px=self.timeout_ms))
+
+    async def extend(self) -> bool:
+        """Restart the timeout; False when the lock expired and may be held by someone else."""
+        return bool(await self.redis_client.eval(_EXTEND_SCRIPT, 1, self.key, self.token, self.timeout_ms))
+
+    async def release(self) -> None:
+        await self.redis_client.eval(_RELEASE_SCRIPT, 1, self.key, self.token)
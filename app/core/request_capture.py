@@ -0,0 +1,271 @@
+import asyncio
+import base64
+import json
+import time
+from collections import deque
+from typing import (
+    Awaitable, Callable, Dict, List, Optional, Tuple)
+
+import redis.asyncio as redis
+
+from app.utils.ddsketch import DDSketch
+
+
+# (epoch seconds, method, route template, status code, latency ms, request bytes, response bytes,
+#  error: start of the response body or the exception of a failed request, None otherwise)
+RequestRecord = Tuple[float, str, str, int, float, int, int, Optional[str]]
+RequestLogSink = Callable[[List[RequestRecord]], Awaitable[None]]
+
+UNMATCHED_ROUTE = "<unmatched>"
+REQUEST_LOG_QUEUE_KEY = "request_logs:queue"
+LATENCY_SKETCH_QUEUE_KEY = "request_logs:sketches"
+SKETCH_BUCKET_SECONDS = 60
+# Characters of a failed response body kept for error grouping
+ERROR_BODY_LIMIT = 500
+
+
+class RequestLogBuffer:
+    """
+    Fixed-size, per-worker buffer of captured requests.
+    Records are appended from the request path without any I/O and are
+    handed to the sink in batches, either when `batch_size` records are
+    waiting or every `flush_interval` seconds, whichever comes first.
+    When the sink cannot keep up the oldest records are overwritten and
+    counted in `dropped`.
+    """
+
+    def __init__(self, capacity: int, batch_size: int, flush_interval: float):
+        self.capacity = capacity
+        self.batch_size = min(batch_size, capacity)
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.flushed = 0
+        self._records: deque = deque(maxlen=capacity)
+        self._sink: Optional[RequestLogSink] = None
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def append(self, record: RequestRecord) -> None:
+        """Add a record; never blocks and never awaits."""
+        records = self._records
+        if len(records) == self.capacity:
+            self.dropped += 1
+        records.append(record)
+        if len(records) >= self.batch_size and self._flush_requested is not None:
+            self._flush_requested.set()
+
+    def drain(self) -> List[RequestRecord]:
+        """Take every buffered record out of the buffer."""
+        batch = list(self._records)
+        self._records.clear()
+        return batch
+
+    async def flush(self) -> int:
+        """Hand the buffered records to the sink in `batch_size` chunks."""
+        batch = self.drain()
+        if not batch or self._sink is None:
+            return 0
+        for start in range(0, len(batch), self.batch_size):
+            chunk = batch[start:start + self.batch_size]
+            try:
+                await self._sink(chunk)
+                self.flushed += len(chunk)
+            except Exception as e:
+                self.dropped += len(chunk)
+                print(f"RequestLogBuffer flush failed, dropped {len(chunk)} records: {e}")
+        return len(batch)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+
+    def start(self, sink: RequestLogSink) -> None:
+        """Start the background flusher on the running event loop."""
+        self._sink = sink
+        self._stopping = False
+        self._flush_requested = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background flusher and flush whatever is left."""
+        if self._task is not None:
+            # Wake the flusher up instead of cancelling it, so a batch that is
+            # being written is never interrupted half way.
+            self._stopping = True
+            self._flush_requested.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+
+class LatencySketchAccumulator:
+    """
+    Per-worker latency sketches keyed by (minute, route, method).
+    A minute is only shipped once it is closed, so each worker sends one
+    sketch per route per minute no matter how often the buffer flushes.
+    """
+
+    def __init__(self, relative_accuracy: float):
+        self.relative_accuracy = relative_accuracy
+        self._sketches: Dict[Tuple[int, str, str], DDSketch] = {}
+
+    def add_records(self, batch: List[RequestRecord]) -> None:
+        sketches = self._sketches
+        for timestamp, method, route, _, latency_ms, *_ in batch:
+            key = (int(timestamp) - int(timestamp) % SKETCH_BUCKET_SECONDS, route, method)
+            sketch = sketches.get(key)
+            if sketch is None:
+                sketch = sketches[key] = DDSketch(self.relative_accuracy)
+            sketch.add(latency_ms)
+
+    def drain(self, include_open: bool = False) -> List[str]:
+        """Serialize and remove closed minutes (or everything when `include_open`)."""
+        current_minute = int(time.time()) - int(time.time()) % SKETCH_BUCKET_SECONDS
+        payloads = []
+        for key in list(self._sketches):
+            if include_open or key[0] < current_minute:
+                sketch = self._sketches.pop(key)
+                payloads.append(json.dumps({
+                    "b": key[0],
+                    "r": key[1],
+                    "m": key[2],
+                    "s": base64.b64encode(sketch.to_bytes()).decode(),
+                }, separators=(",", ":")))
+        return payloads
+
+    def restore(self, payloads: List[str]) -> None:
+        """Merge drained sketches back in, after they could not be shipped."""
+        for payload in payloads:
+            item = json.loads(payload)
+            sketch = DDSketch.from_bytes(base64.b64decode(item["s"]))
+            key = (item["b"], item["r"], item["m"])
+            if key in self._sketches:
+                self._sketches[key].merge(sketch)
+            else:
+                self._sketches[key] = sketch
+
+
+class RedisRequestLogSink:
+    """
+    Pushes a whole batch onto the Redis ingest queue in one pipelined
+    round trip. The client is resolved on every flush so a Redis outage at
+    startup only drops batches instead of breaking the application.
+    Both queues are capped at `max_backlog` entries so a stalled consumer
+    cannot exhaust Redis memory. Sketches that fail to ship are kept for the
+    next flush.
+    """
+
+    def __init__(
+        self,
+        get_redis_client: Callable[[], redis.Redis],
+        max_backlog: int,
+        sketches: Optional[LatencySketchAccumulator] = None,
+        key: str = REQUEST_LOG_QUEUE_KEY
+    ):
+        self.get_redis_client = get_redis_client
+        self.max_backlog = max_backlog
+        self.sketches = sketches
+        self.key = key
+
+    async def __call__(self, batch: List[RequestRecord]) -> None:
+        payloads = [json.dumps(record, separators=(",", ":")) for record in batch]
+        sketch_payloads = []
+        if self.sketches is not None:
+            self.sketches.add_records(batch)
+            sketch_payloads = self.sketches.drain()
+        try:
+            async with self.get_redis_client().pipeline(transaction=False) as pipe:
+                pipe.rpush(self.key, *payloads)
+                pipe.ltrim(self.key, -self.max_backlog, -1)
+                if sketch_payloads:
+                    pipe.rpush(LATENCY_SKETCH_QUEUE_KEY, *sketch_payloads)
+                    pipe.ltrim(LATENCY_SKETCH_QUEUE_KEY, -self.max_backlog, -1)
+                await pipe.execute()
+        except Exception:
+            if sketch_payloads:
+                self.sketches.restore(sketch_payloads)
+            raise
+
+    async def close(self) -> None:
+        """Ship the sketches of the still open minute on shutdown."""
+        if self.sketches is None:
+            return
+        sketch_payloads = self.sketches.drain(include_open=True)
+        if not sketch_payloads:
+            return
+        try:
+            async with self.get_redis_client().pipeline(transaction=False) as pipe:
+                pipe.rpush(LATENCY_SKETCH_QUEUE_KEY, *sketch_payloads)
+                pipe.ltrim(LATENCY_SKETCH_QUEUE_KEY, -self.max_backlog, -1)
+                await pipe.execute()
+        except Exception as e:
+            print(f"RedisRequestLogSink close failed, dropped {len(sketch_payloads)} sketches: {e}")
+
+
+class RequestCaptureMiddleware:
+    """
+    Pure ASGI middleware recording method, route template, status,
+    latency and payload sizes of every HTTP request into a RequestLogBuffer.
+    For failed requests the start of the response body (or the exception)
+    is kept as well, successful ones pay nothing extra.
+    Requests to `exclude_paths` (streams and exports that stay open for
+    minutes) are not recorded, they would swamp the latency statistics.
+    """
+
+    def __init__(self, app, buffer: RequestLogBuffer, exclude_paths: frozenset = frozenset()):
+        self.app = app
+        self.buffer = buffer
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        sizes = [0, 0]  # request bytes, response bytes
+        status_holder = [500]
+        error_body = []
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request":
+                sizes[0] += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+            elif message["type"] == "http.response.body":
+                body = message.get("body", b"")
+                sizes[1] += len(body)
+                if status_holder[0] >= 400 and not error_body:
+                    error_body.append(body[:ERROR_BODY_LIMIT].decode("utf-8", "replace"))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except Exception as e:
+            error_body[:] = [f"{type(e).__name__}: {e}"[:ERROR_BODY_LIMIT]]
+            raise
+        finally:
+            route = scope.get("route")
+            self.buffer.append((
+                time.time(),
+                scope["method"],
+                route.path if route is not None else UNMATCHED_ROUTE,
+                status_holder[0],
+                (time.perf_counter() - started_at) * 1000,
+                sizes[0],
+                sizes[1],
+                error_body[0] if error_body else None,
+            ))
@@ -1,37 +1,42 @@
 from datetime import (
     datetime, timedelta, timezone)
 from typing import Optional
+from uuid import uuid4
 
 import jwt # Changed from jose import jwt
 from jwt import PyJWTError # Changed from jose import JWTError
 import redis.asyncio as redis
 from fastapi import Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from passlib.context import CryptContext
 
 from app.core.config import settings
 from app.core.exceptions import InvalidCredentialsException
+from app.core.password_hasher import (
+    check_password, hash_password)
 from app.core.redis_config import get_redis_client
+from app.core.session_store import (
+    get_session_token, revoke_sessions, session_field, store_session_token)
+from app.core.token_cache import (
+    publish_token_revocation, verified_token_cache)
 
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 oauth2_scheme = HTTPBearer()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verifies a plain password against a hashed password.
+    Blocks; async code awaits password_hasher.verify instead.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return check_password(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """
     Hashes a plain password.
+    Blocks; async code awaits password_hasher.hash instead.
     """
-    return pwd_context.hash(password)
+    return hash_password(password)
 
 
 def create_access_token(purpose: str, data: dict, expiry_in_minutes: timedelta) -> str:
@@ -47,9 +52,11 @@ def create_access_token(purpose: str, data: dict, expiry_in_minutes: timedelta)
 async def create_login_token(user_data: dict, redis_client: redis.Redis) -> str:
     """
     Creates a JWT login token and stores it in Redis.
+    Every login is its own session (`sid`) so devices stay logged in side by side.
     """
     purpose = 'login'
     data = {
+        "sid": uuid4().hex,
         "id": user_data["id"],
         "email": user_data["email"],
         "first_name": user_data["first_name"],
@@ -60,7 +67,9 @@ async def create_login_token(user_data: dict, redis_client: redis.Redis) -> str:
     }
     access_token = create_access_token(purpose, data, settings.LOGIN_ACCESS_TOKEN_EXPIRY)
     # Store token in Redis with 24-hour TTL
-    await redis_client.setex(f"{user_data['id']}_{purpose}", settings.LOGIN_ACCESS_TOKEN_EXPIRY, access_token)
+    await store_session_token(
+        redis_client, user_data['id'], session_field(purpose, data["sid"]),
+        access_token, settings.LOGIN_ACCESS_TOKEN_EXPIRY)
     return access_token
 
 
@@ -68,9 +77,8 @@ async def logout_user_from_all_devices(user_id: str, redis_client: redis.Redis)
     """
     Remove user all tokens from redis
     """
-    keys = await redis_client.keys(f"{user_id}_*")
-    for key in keys:
-        await redis_client.delete(key)
+    await revoke_sessions(redis_client, user_id)
+    await publish_token_revocation(redis_client, user_id)
     return True
 
 
@@ -80,13 +88,13 @@ async def create_forgot_password_token(user_data: dict, redis_client: redis.Redi
     """
     purpose = "forgot_pwd"
     access_token = create_access_token(purpose, user_data, settings.FORGOT_PASSWORD_EXPIRY)
-    await redis_client.setex(f"{user_data['id']}_{purpose}", settings.FORGOT_PASSWORD_EXPIRY, access_token)
+    await store_session_token(redis_client, user_data['id'], purpose, access_token, settings.FORGOT_PASSWORD_EXPIRY)
     return access_token
 
 async def jwt_decoder_get_payload(token: str, type_: str, redis_client: redis.Redis):
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        stored_token = await redis_client.get(f"{payload['id']}_{type_}")
+        stored_token = await get_session_token(redis_client, payload['id'], type_, payload.get('sid'))
         if stored_token == token:
             return payload
     except PyJWTError as e:
@@ -105,9 +113,17 @@ async def get_current_user_from_header_token(
     """
     Dependency to get the current user from a JWT token.
     Validates the token using PyJWT and checks if it exists in Redis.
+    Tokens already verified by this worker are served from
+    verified_token_cache until they expire or are revoked.
     """
     token = credentials.credentials
-    return await jwt_decoder_get_payload(token, type_, redis_client)
+    payload = verified_token_cache.get(token, type_)
+    if payload is not None:
+        return payload
+    sequence = verified_token_cache.sequence
+    payload = await jwt_decoder_get_payload(token, type_, redis_client)
+    verified_token_cache.set(token, type_, payload, sequence)
+    return payload
 
 async def invalidate_token(token: str, redis_client: redis.Redis) -> bool:
     """
@@ -117,9 +133,9 @@ async def invalidate_token(token: str, redis_client: redis.Redis) -> bool:
         # Decode to get user ID
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         # Remove the token from Redis
-        stored_token = await redis_client.get(f"{payload['id']}_{payload['sub']}")
+        stored_token = await get_session_token(redis_client, payload['id'], payload['sub'], payload.get('sid'))
         if stored_token == token:
-            await redis_client.delete(f"{payload['id']}_{payload['sub']}")
+            await revoke_sessions(redis_client, payload['id'], payload['sub'], payload.get('sid'))
         return True
     except PyJWTError as e:
         print(f"PyJWTError--> as {e}")
@@ -0,0 +1,135 @@
+"""
+Token storage per user in one Redis hash, `user_sessions:{user_id}`.
+
+Every field is one live token: `login:{sid}` for each logged in device and
+`invitation` / `forgot_pwd` for the single use tokens. Values are
+`{expires_at}:{token}`; expired fields are pruned whenever a token is
+stored and the hash itself expires with its last token. Revoking the
+tokens of a user therefore touches only that user's fields.
+
+Tokens written before this index existed live in `{user_id}_{purpose}`
+string keys. They are still accepted and revoked here until they expire
+or are moved by scripts/migrate_session_keys.py.
+"""
+import time
+from typing import (
+    List, Optional, Tuple)
+
+import redis.asyncio as redis
+
+
+SESSION_KEY_PREFIX = "user_sessions"
+LEGACY_TOKEN_PURPOSES = ("login", "forgot_pwd", "invitation")
+
+# KEYS[1] = hash, ARGV = field, value, now, expires_at
+_STORE_SCRIPT = """
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+local now = tonumber(ARGV[3])
+local max_expires_at = tonumber(ARGV[4])
+local entries = redis.call('HGETALL', KEYS[1])
+for i = 1, #entries, 2 do
+    local expires_at = tonumber(string.match(entries[i + 1], '^(%d+):'))
+    if expires_at == nil or expires_at <= now then
+        redis.call('HDEL', KEYS[1], entries[i])
+    elseif expires_at > max_expires_at then
+        max_expires_at = expires_at
+    end
+end
+redis.call('EXPIREAT', KEYS[1], max_expires_at)
+return 1
+"""
+# KEYS[1] = hash, KEYS[2..] = legacy keys, ARGV[1] = field prefix ('' for all)
+_REVOKE_SCRIPT = """
+local removed = 0
+if ARGV[1] == '' then
+    removed = redis.call('HLEN', KEYS[1])
+    redis.call('DEL', KEYS[1])
+else
+    local fields = redis.call('HKEYS', KEYS[1])
+    for _, field in ipairs(fields) do
+        if field == ARGV[1] or string.sub(field, 1, #ARGV[1] + 1) == ARGV[1] .. ':' then
+            removed = removed + redis.call('HDEL', KEYS[1], field)
+        end
+    end
+end
+for i = 2, #KEYS do
+    removed = removed + redis.call('DEL', KEYS[i])
+end
+return removed
+"""
+
+
+def session_key(user_id) -> str:
+    return f"{SESSION_KEY_PREFIX}:{user_id}"
+
+
+def legacy_token_key(user_id, purpose: str) -> str:
+    return f"{user_id}_{purpose}"
+
+
+def session_field(purpose: str, session_id: Optional[str] = None) -> str:
+    return f"{purpose}:{session_id}" if session_id else purpose
+
+
+def encode_session_value(token: str, expires_at: int) -> str:
+    return f"{expires_at}:{token}"
+
+
+async def store_session_token(
+    redis_client: redis.Redis,
+    user_id,
+    field: str,
+    token: str,
+    expiry_in_seconds: int
+) -> None:
+    now = int(time.time())
+    expires_at = now + int(expiry_in_seconds)
+    await redis_client.eval(
+        _STORE_SCRIPT, 1, session_key(user_id),
+        field, encode_session_value(token, expires_at), now, expires_at)
+
+
+async def store_session_tokens(
+    redis_client: redis.Redis,
+    tokens: List[Tuple[str, str, str]],
+    expiry_in_seconds: int
+) -> None:
+    """store_session_token for many (user_id, field, token) in one pipelined round trip."""
+    now = int(time.time())
+    expires_at = now + int(expiry_in_seconds)
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for user_id, field, token in tokens:
+            pipe.eval(
+                _STORE_SCRIPT, 1, session_key(user_id),
+                field, encode_session_value(token, expires_at), now, expires_at)
+        await pipe.execute()
+
+
+async def get_session_token(redis_client: redis.Redis, user_id, purpose: str, session_id: Optional[str] = None) -> Optional[str]:
+    """Stored token of the session; tokens without a session id may still be legacy keys."""
+    value = await redis_client.hget(session_key(user_id), session_field(purpose, session_id))
+    if value is not None:
+        expires_at, _, token = value.partition(":")
+        return token if int(expires_at) > time.time() else None
+    if session_id is None:
+        return await redis_client.get(legacy_token_key(user_id, purpose))
+    return None
+
+
+async def revoke_sessions(
+    redis_client: redis.Redis,
+    user_id,
+    purpose: Optional[str] = None,
+    session_id: Optional[str] = None
+) -> int:
+    """
+    Revoke one session, every session of a purpose, or (no purpose) every
+    token of the user, together with the matching legacy keys, in a single
+    script. Returns the number of tokens removed.
+    """
+    if session_id:
+        return await redis_client.hdel(session_key(user_id), session_field(purpose, session_id))
+    purposes = (purpose,) if purpose else LEGACY_TOKEN_PURPOSES
+    legacy_keys = [legacy_token_key(user_id, name) for name in purposes]
+    return await redis_client.eval(
+        _REVOKE_SCRIPT, 1 + len(legacy_keys), session_key(user_id), *legacy_keys, purpose or "")
@@ -1,3 +1,11 @@
-from fastapi.templating import Jinja2Templates
+from functools import lru_cache
 
-templates = Jinja2Templates(directory="app/templates")
\ No newline at end of file
+
+@lru_cache()
+def get_templates():
+    """
+    Jinja2 environment of the email templates, built on the first render so
+    importing the app does not pay for Jinja2.
+    """
+    from fastapi.templating import Jinja2Templates
+    return Jinja2Templates(directory="app/templates")
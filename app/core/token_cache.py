@@ -0,0 +1,151 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import (
+    Callable, Optional, Tuple)
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.core.redis_config import get_redis_connection
+from app.utils.lru import LRUCache
+
+
+TOKEN_REVOCATION_CHANNEL = "auth:token_revocations"
+TOKEN_CACHE_RECONNECT_SECONDS = 1
+
+
+def token_digest(token: str, type_: str) -> bytes:
+    return hashlib.blake2b(f"{type_}:{token}".encode(), digest_size=16).digest()
+
+
+class VerifiedTokenCache:
+    """
+    Per-worker LRU of tokens already verified against Redis, keyed by a
+    digest of the token. An entry holds the decoded payload until the token
+    expires, so repeated requests skip both the JWT decode and the Redis GET.
+    Revocations of a user's tokens are pushed to every worker over Redis
+    pub/sub. The cache is only used while that subscription is up; losing
+    it clears the cache and every request goes back to Redis.
+    A revocation is remembered for `max_token_age` seconds: every token
+    issued before it has expired by then.
+    """
+
+    def __init__(
+        self,
+        get_redis_client: Callable[[], redis.Redis],
+        max_size: int,
+        max_token_age: float,
+        channel: str = TOKEN_REVOCATION_CHANNEL
+    ):
+        self.get_redis_client = get_redis_client
+        self.max_token_age = max_token_age
+        self.channel = channel
+        self.active = False
+        self._tokens = LRUCache(max_size)
+        # Revocation sequence number, and the last one seen per user. An entry
+        # whose verification started before the last revocation of its user,
+        # or before the cache was last cleared, is stale. Users are kept in
+        # revocation order with the time of the revocation, oldest first.
+        self._sequence = 0
+        self._cleared_at = 0
+        self._revoked: OrderedDict[str, Tuple[int, float]] = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    @property
+    def sequence(self) -> int:
+        """Take before verifying a token and pass to `set`."""
+        return self._sequence
+
+    def get(self, token: str, type_: str) -> Optional[dict]:
+        if not self.active:
+            return None
+        digest = token_digest(token, type_)
+        entry = self._tokens.get(digest)
+        if entry is None:
+            return None
+        payload, verified_at = entry
+        if payload["exp"] <= time.time() or self._revoked_at(payload["id"]) > verified_at:
+            self._tokens.pop(digest)
+            return None
+        return payload
+
+    def set(self, token: str, type_: str, payload: dict, sequence: int) -> None:
+        if self.active and sequence >= self._cleared_at and self._revoked_at(payload["id"]) <= sequence:
+            self._tokens.set(token_digest(token, type_), (payload, sequence))
+
+    def _revoked_at(self, user_id) -> int:
+        """Sequence number of the last revocation of the user's tokens, 0 if none."""
+        entry = self._revoked.get(str(user_id))
+        return entry[0] if entry is not None else 0
+
+    def evict_user(self, user_id: str) -> None:
+        self._sequence += 1
+        now = time.time()
+        self._revoked[str(user_id)] = (self._sequence, now)
+        self._revoked.move_to_end(str(user_id))
+        while self._revoked:
+            oldest_user, (_, revoked_at) = next(iter(self._revoked.items()))
+            if revoked_at > now - self.max_token_age:
+                break
+            del self._revoked[oldest_user]
+
+    def clear(self) -> None:
+        # Revocations may be missed until the next subscription. Entries older
+        # than the clear are rejected by `_cleared_at`, so the recorded
+        # revocations are no longer needed.
+        self._sequence += 1
+        self._cleared_at = self._sequence
+        self._tokens.clear()
+        self._revoked.clear()
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self.get_redis_client().pubsub(ignore_subscribe_messages=True)
+                try:
+                    await pubsub.subscribe(self.channel)
+                    self.active = True
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.evict_user(message["data"])
+                finally:
+                    self.active = False
+                    self.clear()
+                    await pubsub.aclose()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"VerifiedTokenCache subscription lost, retrying: {e}")
+                await asyncio.sleep(TOKEN_CACHE_RECONNECT_SECONDS)
+
+    def start(self) -> None:
+        """Subscribe on the running event loop (application startup)."""
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+async def publish_token_revocation(redis_client: redis.Redis, user_id: str) -> None:
+    """Drop the cached tokens of a user on every worker."""
+    verified_token_cache.evict_user(user_id)
+    try:
+        await redis_client.publish(TOKEN_REVOCATION_CHANNEL, str(user_id))
+    except Exception as e:
+        print(f"publish_token_revocation failed for {user_id}: {e}")
+
+
+verified_token_cache = VerifiedTokenCache(
+    get_redis_connection,
+    int(settings.TOKEN_CACHE_MAX_SIZE),
+    # Only login tokens are cached
+    float(settings.LOGIN_ACCESS_TOKEN_EXPIRY)
+)
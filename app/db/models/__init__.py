@@ -1,5 +1,31 @@
 from .user import Users
+from .request_rollup import (
+    RequestRollupMinute,
+    RequestRollupHour,
+    RequestRollupDay,
+    )
+from .request_log import ApiRequestLogs
+from .monitored_endpoint import (
+    MonitoredEndpoints,
+    MonitoredEndpointStatus,
+    EndpointStateIntervals,
+    )
+from .openai_usage import OpenAIUsageDaily
+from .error_group import ApiErrorGroups
+from .traffic_anomaly import TrafficAnomalies
+from .email_outbox import EmailOutbox
 
 __all__ = [
     "Users",
+    "RequestRollupMinute",
+    "RequestRollupHour",
+    "RequestRollupDay",
+    "ApiRequestLogs",
+    "MonitoredEndpoints",
+    "MonitoredEndpointStatus",
+    "EndpointStateIntervals",
+    "OpenAIUsageDaily",
+    "ApiErrorGroups",
+    "TrafficAnomalies",
+    "EmailOutbox",
     ]    
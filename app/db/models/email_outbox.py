@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import (
+    BigInteger, DateTime, Identity, Index, Integer, String, Text, text)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import (
+    Mapped, mapped_column)
+
+from app.db.base import Base
+
+
+EMAIL_PENDING = "pending"
+EMAIL_SENT = "sent"
+EMAIL_FAILED = "failed"
+
+
+class EmailOutbox(Base):
+    """
+    Emails waiting to be sent, written in the same transaction as the change
+    that triggers them and delivered by the mailer process. `dedup_key`
+    makes enqueueing the same email twice a no-op.
+    """
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index(
+            "ix_email_outbox_due", "next_attempt_at",
+            postgresql_where=text("status = 'pending'")),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    dedup_key: Mapped[str] = mapped_column(String(255), unique=True)
+    to_emails: Mapped[list] = mapped_column(JSONB)
+    subject: Mapped[str] = mapped_column(String(255))
+    html_content: Mapped[str] = mapped_column(Text)
+    status: Mapped[str] = mapped_column(String(10), default=EMAIL_PENDING)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    last_error: Mapped[Optional[str]] = mapped_column(String(500))
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
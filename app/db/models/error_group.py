@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger, DateTime, Index, Integer, String)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import (
+    Mapped, mapped_column)
+
+from app.db.base import Base
+
+
+class ApiErrorGroups(Base):
+    """
+    One row per error fingerprint (method, route template, status code and
+    normalized error message) with its occurrence count and a few samples,
+    so identical failures are counted instead of listed.
+    """
+    __tablename__ = "api_error_groups"
+    __table_args__ = (
+        Index("ix_api_error_groups_last_seen", "last_seen"),
+    )
+
+    fingerprint: Mapped[str] = mapped_column(String(40), primary_key=True)
+    method: Mapped[str] = mapped_column(String(10))
+    route: Mapped[str] = mapped_column(String(255))
+    status_code: Mapped[int] = mapped_column(Integer)
+    message: Mapped[str] = mapped_column(String(255))
+    first_seen: Mapped[datetime] = mapped_column(DateTime)
+    last_seen: Mapped[datetime] = mapped_column(DateTime)
+    count: Mapped[int] = mapped_column(BigInteger, default=0)
+    # [{"at": ISO time, "error": raw error, "latency_ms": float}, ...], oldest first
+    samples: Mapped[list] = mapped_column(JSONB, default=list)
@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import (
+    BigInteger, DateTime, Float, ForeignKey, Identity, Index, Integer, String, text)
+from sqlalchemy.orm import (
+    Mapped, mapped_column)
+
+from app.db.base import (
+    Base, BaseModel)
+
+
+class MonitoredEndpoints(BaseModel, Base):
+    """Registry of the external APIs checked by the uptime prober."""
+    __tablename__ = "monitored_endpoints"
+
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4, index=True)
+    name: Mapped[str] = mapped_column(String(255))
+    url: Mapped[str] = mapped_column(String(2048))
+    method: Mapped[str] = mapped_column(String(10), default="GET")
+    expected_status: Mapped[int] = mapped_column(Integer, default=200)
+    interval_seconds: Mapped[int] = mapped_column(Integer, default=30)
+    timeout_seconds: Mapped[float] = mapped_column(Float, default=10)
+    # Responses slower than this are reported as degraded instead of up
+    degraded_latency_ms: Mapped[float] = mapped_column(Float, default=2000)
+
+
+class MonitoredEndpointStatus(Base):
+    """Result of the latest probe of every monitored endpoint."""
+    __tablename__ = "monitored_endpoint_status"
+
+    endpoint_id: Mapped[UUID] = mapped_column(ForeignKey("monitored_endpoints.id", ondelete="CASCADE"), primary_key=True)
+    state: Mapped[str] = mapped_column(String(10))
+    status_code: Mapped[Optional[int]] = mapped_column(Integer)
+    latency_ms: Mapped[Optional[float]] = mapped_column(Float)
+    error: Mapped[Optional[str]] = mapped_column(String(255))
+    checked_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+class EndpointStateIntervals(Base):
+    """
+    Run-length encoded probe history: one row per stretch of time an
+    endpoint stayed in the same state. The current stretch has no ended_at.
+    """
+    __tablename__ = "endpoint_state_intervals"
+    __table_args__ = (
+        Index("ix_endpoint_state_intervals_endpoint_id_started_at", "endpoint_id", "started_at"),
+        # At most one open interval per endpoint
+        Index(
+            "uq_endpoint_state_intervals_open", "endpoint_id",
+            unique=True, postgresql_where=text("ended_at IS NULL")),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    endpoint_id: Mapped[UUID] = mapped_column(ForeignKey("monitored_endpoints.id", ondelete="CASCADE"))
+    state: Mapped[str] = mapped_column(String(10))
+    started_at: Mapped[datetime] = mapped_column(DateTime)
+    ended_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
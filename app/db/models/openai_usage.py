@@ -0,0 +1,31 @@
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy import (
+    BigInteger, Date, Float, Index, String)
+from sqlalchemy.orm import (
+    Mapped, mapped_column)
+
+from app.db.base import Base
+
+
+class OpenAIUsageDaily(Base):
+    """
+    OpenAI/Azure completion usage per user, model and (UTC) day.
+    Rows are only ever incremented by the usage flush task.
+    """
+    __tablename__ = "openai_usage_daily"
+    __table_args__ = (
+        Index("ix_openai_usage_daily_user_id_usage_date", "user_id", "usage_date"),
+    )
+
+    usage_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    user_id: Mapped[UUID] = mapped_column(primary_key=True)
+    provider: Mapped[str] = mapped_column(String(20), primary_key=True)
+    model: Mapped[str] = mapped_column(String(100), primary_key=True)
+
+    request_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    prompt_tokens: Mapped[int] = mapped_column(BigInteger, default=0)
+    completion_tokens: Mapped[int] = mapped_column(BigInteger, default=0)
+    cached_tokens: Mapped[int] = mapped_column(BigInteger, default=0)
+    latency_sum_ms: Mapped[float] = mapped_column(Float, default=0)
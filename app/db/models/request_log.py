@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger, DateTime, Float, Identity, Index, Integer, String)
+from sqlalchemy.orm import (
+    Mapped, mapped_column)
+
+from app.db.base import Base
+
+
+class ApiRequestLogs(Base):
+    """
+    One row per captured request.
+    The table is range partitioned by day on created_at (partitions are named
+    api_request_logs_pYYYYMMDD and managed by RequestLogPartitionService), so
+    time filtered reads only touch the partitions of the window and
+    retention is a DROP of whole partitions.
+    """
+    __tablename__ = "api_request_logs"
+    __table_args__ = (
+        Index("ix_api_request_logs_route_created_at", "route", "created_at"),
+        Index("ix_api_request_logs_status_code_created_at", "status_code", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    # The partition key has to be part of the primary key
+    created_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    id: Mapped[int] = mapped_column(BigInteger, Identity(always=True), primary_key=True)
+    method: Mapped[str] = mapped_column(String(10))
+    route: Mapped[str] = mapped_column(String(255))
+    status_code: Mapped[int] = mapped_column(Integer)
+    latency_ms: Mapped[float] = mapped_column(Float)
+    request_bytes: Mapped[int] = mapped_column(BigInteger)
+    response_bytes: Mapped[int] = mapped_column(BigInteger)
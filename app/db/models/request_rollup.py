@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import (
+    List, Optional)
+
+from sqlalchemy import (
+    BigInteger, DateTime, Float, LargeBinary, String)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import (
+    Mapped, mapped_column)
+
+from app.db.base import Base
+
+
+class RequestRollupMixin:
+    """
+    Pre-aggregated request counters of one route for one time bucket.
+    Rows are only ever incremented by the aggregation task.
+    """
+    bucket_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    route: Mapped[str] = mapped_column(String(255), primary_key=True)
+    method: Mapped[str] = mapped_column(String(10), primary_key=True)
+
+    request_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    client_error_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    server_error_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    latency_sum_ms: Mapped[float] = mapped_column(Float, default=0)
+    latency_max_ms: Mapped[float] = mapped_column(Float, default=0)
+    request_bytes: Mapped[int] = mapped_column(BigInteger, default=0)
+    response_bytes: Mapped[int] = mapped_column(BigInteger, default=0)
+    # Serialized DDSketch of the bucket's latencies (app.utils.ddsketch)
+    latency_sketch: Mapped[Optional[bytes]] = mapped_column(LargeBinary)
+    # Request counts per latency heatmap band, from the sketch, so the heatmap sums them in SQL
+    latency_band_counts: Mapped[Optional[List[int]]] = mapped_column(ARRAY(BigInteger))
+
+
+class RequestRollupMinute(RequestRollupMixin, Base):
+    __tablename__ = "api_request_rollups_1m"
+
+
+class RequestRollupHour(RequestRollupMixin, Base):
+    __tablename__ = "api_request_rollups_1h"
+
+
+class RequestRollupDay(RequestRollupMixin, Base):
+    __tablename__ = "api_request_rollups_1d"
+
+
+# Resolution label -> (model, bucket width in seconds)
+ROLLUP_RESOLUTIONS = {
+    "1m": (RequestRollupMinute, 60),
+    "1h": (RequestRollupHour, 3600),
+    "1d": (RequestRollupDay, 86400),
+}
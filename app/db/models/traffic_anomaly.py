@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger, DateTime, Float, Identity, Index, String)
+from sqlalchemy.orm import (
+    Mapped, mapped_column)
+
+from app.db.base import Base
+
+
+class TrafficAnomalies(Base):
+    """Request count spikes and drops flagged by the anomaly detector, one row per route and minute."""
+    __tablename__ = "traffic_anomalies"
+    __table_args__ = (
+        # One row per minute, route and kind; also serves the bucket_start range scans
+        Index("uq_traffic_anomalies_bucket_route", "bucket_start", "route", "method", "kind", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime)
+    route: Mapped[str] = mapped_column(String(255))
+    method: Mapped[str] = mapped_column(String(10))
+    kind: Mapped[str] = mapped_column(String(10))
+    observed: Mapped[float] = mapped_column(Float)
+    expected: Mapped[float] = mapped_column(Float)
+    score: Mapped[float] = mapped_column(Float)
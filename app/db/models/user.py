@@ -5,7 +5,7 @@ from uuid import UUID, uuid4
 
 from sqlalchemy import (
     String, Boolean, Integer, 
-    DateTime, JSON, ForeignKey)
+    DateTime, JSON, ForeignKey, Index)
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import (
     Mapped, mapped_column, relationship)
@@ -16,6 +16,13 @@ from app.db.base import (
 
 class Users(BaseModel, Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Serves the keyset pagination of the user list (ORDER BY updated_at DESC, id DESC)
+        Index("ix_users_updated_at_id", "updated_at", "id"),
+        # Trigram index for the email prefix search (app.services.user_search), the
+        # full name one is an expression index that only lives in the migration
+        Index("ix_users_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+    )
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4, index=True)
     first_name: Mapped[str] = mapped_column(String(255), index=True)
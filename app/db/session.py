@@ -1,28 +1,112 @@
-from typing import AsyncGenerator
+import hashlib
+from typing import (
+    AsyncGenerator, Optional)
 
+from fastapi import Request
 from sqlalchemy.ext.asyncio import (
-    AsyncSession, create_async_engine, 
+    AsyncEngine, AsyncSession, create_async_engine,
     async_sessionmaker)
 
 from app.core.config import settings
+from app.core.instrumentation import instrument_engine
+from app.core.redis_config import get_redis_connection
 
 
-engine = create_async_engine(
-    settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"),
-    echo=True, # You can also use settings.DEBUG here
-    pool_size=settings.DATABASE_POOL_SIZE,
-    max_overflow=settings.DATABASE_MAX_OVERFLOW,
-    pool_recycle=settings.DATABASE_POOL_RECYCLE_IN_SECONDS,
-    pool_timeout=settings.DATABASE_POOL_TIMEOUT_IN_SECONDS,
-    connect_args={"timeout": settings.DATABASE_CONNECT_TIMEOUT},
-    pool_pre_ping=True
-    )
+PRIMARY_STICKY_KEY_PREFIX = "db:primary_sticky"
+
+
+def _create_engine(database_url: str, pool_size: int, max_overflow: int) -> AsyncEngine:
+    engine = create_async_engine(
+        database_url.replace("postgresql://", "postgresql+asyncpg://"),
+        echo=False,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE_IN_SECONDS,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT_IN_SECONDS,
+        connect_args={
+            "timeout": settings.DATABASE_CONNECT_TIMEOUT,
+            "prepared_statement_cache_size": int(settings.DATABASE_PREPARED_STATEMENT_CACHE_SIZE),
+            },
+        query_cache_size=int(settings.DATABASE_QUERY_CACHE_SIZE),
+        pool_pre_ping=True
+        )
+    # Query counts and time per request, see ServerTimingMiddleware
+    instrument_engine(engine)
+    return engine
+
+
+def _sticky_key(request: Request) -> Optional[str]:
+    # Per client (login token) rather than per user: a write is visible to whoever made it
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return f"{PRIMARY_STICKY_KEY_PREFIX}:{hashlib.blake2b(authorization.encode(), digest_size=16).hexdigest()}"
+
+
+class PrimarySession(AsyncSession):
+    """
+    Session of the primary. When a request's session commits, the reads of
+    that client stay on the primary for READ_YOUR_WRITES_WINDOW_IN_SECONDS,
+    long enough for the replica to replay the write.
+    """
+
+    async def commit(self) -> None:
+        await super().commit()
+        sticky_key = self.info.get("sticky_key")
+        if sticky_key:
+            try:
+                await get_redis_connection().set(
+                    sticky_key, 1, ex=int(settings.READ_YOUR_WRITES_WINDOW_IN_SECONDS))
+            except Exception as e:
+                print(f"PrimarySession sticky primary window not set: {e}")
+
+
+engine = _create_engine(settings.DATABASE_URL, settings.DATABASE_POOL_SIZE, settings.DATABASE_MAX_OVERFLOW)
+# Without a replica every read goes to the primary
+read_engine = _create_engine(
+    settings.DATABASE_READ_REPLICA_URL,
+    int(settings.DATABASE_READ_POOL_SIZE),
+    int(settings.DATABASE_READ_MAX_OVERFLOW)
+    ) if settings.DATABASE_READ_REPLICA_URL else engine
+
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     expire_on_commit=False,
+    class_=PrimarySession
+)
+ReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
+    expire_on_commit=False,
     class_=AsyncSession
 )
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
+        if read_engine is not engine:
+            session.info["sticky_key"] = _sticky_key(request)
+        yield session
+
+
+async def _reads_from_primary(request: Request) -> bool:
+    sticky_key = _sticky_key(request)
+    if sticky_key is None:
+        return False
+    try:
+        return bool(await get_redis_connection().exists(sticky_key))
+    except Exception as e:
+        # Stale reads are worse than a busier primary
+        print(f"get_read_db sticky primary check failed: {e}")
+        return True
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only endpoints (lists, dashboards, logs, metrics): the
+    read replica, or the primary for a client that wrote moments ago.
+    """
+    if read_engine is engine or await _reads_from_primary(request):
+        session_factory = AsyncSessionLocal
+    else:
+        session_factory = ReadSessionLocal
+    async with session_factory() as session:
         yield session
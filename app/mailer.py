@@ -0,0 +1,52 @@
+"""
+Mailer process: delivers the queued emails of the email_outbox table over
+one long-lived, pooled HTTP client.
+
+    python -m app.mailer
+"""
+import asyncio
+import signal
+
+import httpx
+
+from app.core.config import settings
+from app.db.session import (
+    AsyncSessionLocal, engine)
+from app.services.email_outbox import EmailOutboxService
+
+
+async def main() -> None:
+    stop_requested = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_requested.set)
+
+    batch_size = int(settings.EMAIL_OUTBOX_BATCH_SIZE)
+    concurrency = int(settings.EMAIL_OUTBOX_CONCURRENCY)
+    client = httpx.AsyncClient(
+        timeout=10,
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    )
+    try:
+        while not stop_requested.is_set():
+            claimed = 0
+            try:
+                async with AsyncSessionLocal() as db:
+                    claimed = await EmailOutboxService(db).deliver_due(
+                        client, batch_size, concurrency, int(settings.EMAIL_OUTBOX_MAX_ATTEMPTS))
+            except Exception as e:
+                print(f"Mailer delivery failed: {e}")
+            # A full batch means more are probably due right away
+            if claimed < batch_size:
+                try:
+                    await asyncio.wait_for(
+                        stop_requested.wait(), timeout=float(settings.EMAIL_OUTBOX_POLL_INTERVAL_IN_SECONDS))
+                except asyncio.TimeoutError:
+                    pass
+    finally:
+        await client.aclose()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
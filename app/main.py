@@ -7,9 +7,27 @@ from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
 from app.api.router import api_router
 from app.core.config import settings
-from app.core.templates import templates
 from app.core.redis_config import (
-    close_redis_connection, connect_to_redis)
+    close_redis_connection, connect_to_redis, get_redis_connection)
+from app.core.live_updates import live_update_broker
+from app.core.instrumentation import ServerTimingMiddleware
+from app.core.password_hasher import password_hasher
+from app.core.token_cache import verified_token_cache
+from app.core.request_capture import (
+    LatencySketchAccumulator, RedisRequestLogSink,
+    RequestCaptureMiddleware, RequestLogBuffer)
+
+
+request_log_buffer = RequestLogBuffer(
+    capacity=settings.REQUEST_LOG_BUFFER_SIZE,
+    batch_size=settings.REQUEST_LOG_BATCH_SIZE,
+    flush_interval=settings.REQUEST_LOG_FLUSH_INTERVAL_IN_SECONDS
+)
+request_log_sink = RedisRequestLogSink(
+    get_redis_connection,
+    settings.REQUEST_LOG_QUEUE_MAX_BACKLOG,
+    sketches=LatencySketchAccumulator(settings.LATENCY_SKETCH_RELATIVE_ACCURACY)
+)
 
 
 # @asynccontextmanager
@@ -27,10 +45,18 @@ async def lifespan(app: FastAPI):
     print("Application startup (via lifespan)...")
     # Call Redis connection on startup
     await connect_to_redis()
+    request_log_buffer.start(request_log_sink)
+    live_update_broker.start()
+    verified_token_cache.start()
     yield
     # Call Redis disconnection on shutdown
     print("Application shutdown (via lifespan)...")
+    await verified_token_cache.stop()
+    await live_update_broker.stop()
+    await request_log_buffer.stop()
+    await request_log_sink.close()
     await close_redis_connection()
+    password_hasher.shutdown()
 
 
 
@@ -75,6 +101,24 @@ app.add_middleware(
     allowed_hosts=["*"]  # Configure this properly for production
 )
 
+# Streams and exports stay open for minutes; timing them would skew the
+# latency metrics and flag them as slow requests
+LONG_LIVED_PATHS = frozenset({
+    "/api/v1/live/stream",
+    "/api/v1/request-logs/export",
+})
+
+# SQL and Redis time per request, as a Server-Timing header
+app.add_middleware(
+    ServerTimingMiddleware,
+    slow_request_ms=float(settings.SLOW_REQUEST_THRESHOLD_IN_MS),
+    repeated_statement_threshold=int(settings.REPEATED_STATEMENT_THRESHOLD),
+    exclude_paths=LONG_LIVED_PATHS
+)
+
+# Capture every request (added last so it wraps the other middlewares)
+app.add_middleware(RequestCaptureMiddleware, buffer=request_log_buffer, exclude_paths=LONG_LIVED_PATHS)
+
 
 # @app.on_event("startup")
 # async def startup_event():
@@ -0,0 +1,78 @@
+"""
+Uptime prober process: probes every active monitored endpoint from one
+event loop and stores the results in batches.
+
+    python -m app.prober
+"""
+import asyncio
+import signal
+import ssl
+from functools import partial
+from typing import List
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.core.request_capture import RequestLogBuffer
+from app.db.session import (
+    AsyncSessionLocal, engine)
+from app.services.uptime_prober import (
+    ProbeResult, UptimeProber, build_probe_client)
+from app.services.uptime_service import UptimeService
+
+
+PROBE_RESULT_BUFFER_SIZE = 20000
+PROBE_RESULT_BATCH_SIZE = 2000
+
+
+async def store_probe_results(redis_client: redis.Redis, batch: List[ProbeResult]) -> None:
+    async with AsyncSessionLocal() as db:
+        await UptimeService(db, redis_client).record_probe_results(batch)
+
+
+async def main() -> None:
+    stop_requested = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_requested.set)
+
+    # Only used to publish state changes to the live dashboards
+    redis_client = redis.Redis.from_url(
+        settings.REDIS_URL, decode_responses=True,
+        ssl_cert_reqs=ssl.CERT_NONE, ssl_check_hostname=False)
+    buffer = RequestLogBuffer(
+        capacity=PROBE_RESULT_BUFFER_SIZE,
+        batch_size=PROBE_RESULT_BATCH_SIZE,
+        flush_interval=float(settings.UPTIME_RESULT_FLUSH_INTERVAL_IN_SECONDS)
+    )
+    async with build_probe_client(int(settings.UPTIME_PROBE_MAX_CONCURRENCY)) as client:
+        prober = UptimeProber(
+            client, buffer,
+            max_concurrency=int(settings.UPTIME_PROBE_MAX_CONCURRENCY),
+            max_connections_per_host=int(settings.UPTIME_PROBE_MAX_CONNECTIONS_PER_HOST),
+            jitter_ratio=float(settings.UPTIME_PROBE_JITTER_RATIO)
+        )
+        buffer.start(partial(store_probe_results, redis_client))
+        try:
+            while not stop_requested.is_set():
+                try:
+                    async with AsyncSessionLocal() as db:
+                        targets = await UptimeService(db).get_probe_targets()
+                    prober.sync_targets(targets)
+                    print(f"UptimeProber probing {len(prober)} endpoints, {prober.probes} probes so far")
+                except Exception as e:
+                    print(f"UptimeProber registry refresh failed: {e}")
+                try:
+                    await asyncio.wait_for(
+                        stop_requested.wait(), timeout=float(settings.UPTIME_REGISTRY_REFRESH_IN_SECONDS))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await prober.stop()
+            await buffer.stop()
+            await redis_client.aclose()
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
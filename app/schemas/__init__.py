@@ -9,7 +9,9 @@ from .user import (
     UserPasswordReset,
     UserPasswordResetConfirm,
     UserRegistration,
-    UserDashboardWrapResponse
+    UserDashboardWrapResponse,
+    BulkInviteJobWrapResponse,
+    BulkInviteProgressWrapResponse
     )
 from .pagination import Pagination
 
@@ -26,6 +28,8 @@ __all__ = [
     "UserRegistration",
     "PaginatedUserResponse",
     "UserDashboardWrapResponse",
+    "BulkInviteJobWrapResponse",
+    "BulkInviteProgressWrapResponse",
     "Pagination",
 ]
     
\ No newline at end of file
@@ -0,0 +1,153 @@
+from typing import (
+    List, Optional)
+from uuid import UUID
+
+from pydantic import (
+    BaseModel, Field)
+
+
+class TrafficBucket(BaseModel):
+    bucket_start: str = Field(..., description="Start of the bucket in the requested time zone")
+    request_count: int = Field(..., description="Requests received in the bucket")
+    error_count: int = Field(..., description="Requests answered with a 4xx or 5xx status")
+    avg_latency_ms: float = Field(..., description="Average latency in milliseconds")
+
+
+class RequestTraffic(BaseModel):
+    resolution: str = Field(..., description="Rollup resolution the buckets were read from (1m, 1h or 1d)")
+    buckets: List[TrafficBucket] = Field(..., description="Traffic per bucket, oldest first")
+
+
+class RequestTrafficWrapResponse(BaseModel):
+    data: RequestTraffic = Field(..., description="Request traffic information")
+
+
+class RouteErrorRate(BaseModel):
+    route: str = Field(..., description="Route template")
+    method: str = Field(..., description="HTTP method")
+    request_count: int = Field(..., description="Requests received in the window")
+    error_count: int = Field(..., description="Requests answered with a 4xx or 5xx status")
+    error_rate: float = Field(..., description="Error percentage")
+
+
+class ErrorRate(BaseModel):
+    total_requests: int = Field(..., description="Requests received in the window")
+    client_error_count: int = Field(..., description="Requests answered with a 4xx status")
+    server_error_count: int = Field(..., description="Requests answered with a 5xx status")
+    error_rate: float = Field(..., description="Error percentage")
+    routes: List[RouteErrorRate] = Field(..., description="Per route breakdown, highest error rate first")
+
+
+class ErrorRateWrapResponse(BaseModel):
+    data: ErrorRate = Field(..., description="Error rate information")
+
+
+class LatencySummary(BaseModel):
+    request_count: int = Field(..., description="Requests measured in the window")
+    avg_latency_ms: Optional[float] = Field(None, description="Average latency in milliseconds")
+    max_latency_ms: Optional[float] = Field(None, description="Highest latency in milliseconds")
+    p50_ms: Optional[float] = Field(None, description="Median latency in milliseconds")
+    p95_ms: Optional[float] = Field(None, description="95th percentile latency in milliseconds")
+    p99_ms: Optional[float] = Field(None, description="99th percentile latency in milliseconds")
+
+
+class RouteLatency(LatencySummary):
+    route: str = Field(..., description="Route template")
+    method: str = Field(..., description="HTTP method")
+
+
+class LatencyPercentiles(LatencySummary):
+    routes: List[RouteLatency] = Field(..., description="Per route breakdown, slowest p95 first")
+
+
+class LatencyPercentilesWrapResponse(BaseModel):
+    data: LatencyPercentiles = Field(..., description="Latency percentile information")
+
+
+class LatencyHeatmapBucket(BaseModel):
+    bucket_start: str = Field(..., description="Start of the bucket in the requested time zone")
+    counts: List[int] = Field(..., description="Requests per latency band, aligned with bands_ms plus one open ended band")
+
+
+class LatencyHeatmap(BaseModel):
+    resolution: str = Field(..., description="Rollup resolution the buckets were read from (1m, 1h or 1d)")
+    bands_ms: List[int] = Field(..., description="Upper edge of every latency band in milliseconds")
+    buckets: List[LatencyHeatmapBucket] = Field(..., description="Latency distribution per bucket, oldest first")
+
+
+class LatencyHeatmapWrapResponse(BaseModel):
+    data: LatencyHeatmap = Field(..., description="Latency heatmap information")
+
+
+class ModelUsage(BaseModel):
+    provider: str = Field(..., description="openai or azure")
+    model: str = Field(..., description="Model or deployment name")
+    request_count: int = Field(..., description="Completions in the window")
+    prompt_tokens: int = Field(..., description="Prompt tokens, cached ones included")
+    completion_tokens: int = Field(..., description="Completion tokens")
+    cached_tokens: int = Field(..., description="Prompt tokens served from the prompt cache")
+    total_tokens: int = Field(..., description="Prompt plus completion tokens")
+    avg_latency_ms: Optional[float] = Field(None, description="Average completion latency in milliseconds")
+    estimated_cost: Optional[float] = Field(None, description="Estimated cost in USD, empty for models without a known price")
+
+
+class DailyUsage(BaseModel):
+    date: str = Field(..., description="UTC day")
+    request_count: int = Field(..., description="Completions on the day")
+    total_tokens: int = Field(..., description="Prompt plus completion tokens on the day")
+
+
+class OpenAIUsage(BaseModel):
+    request_count: int = Field(..., description="Completions in the window")
+    total_tokens: int = Field(..., description="Prompt plus completion tokens in the window")
+    estimated_cost: float = Field(..., description="Estimated cost in USD of the priced models")
+    models: List[ModelUsage] = Field(..., description="Per model breakdown, most tokens first")
+    daily: List[DailyUsage] = Field(..., description="Usage per day, oldest first")
+
+
+class OpenAIUsageWrapResponse(BaseModel):
+    data: OpenAIUsage = Field(..., description="OpenAI usage information")
+
+
+class UserModelCost(BaseModel):
+    user_id: UUID = Field(..., description="User's unique identifier")
+    email: Optional[str] = Field(None, description="User's email address")
+    provider: str = Field(..., description="openai or azure")
+    model: str = Field(..., description="Model or deployment name")
+    request_count: int = Field(..., description="Completions in the period")
+    prompt_tokens: int = Field(..., description="Prompt tokens, cached ones included")
+    completion_tokens: int = Field(..., description="Completion tokens")
+    cached_tokens: int = Field(..., description="Prompt tokens served from the prompt cache")
+    estimated_cost: Optional[float] = Field(None, description="Estimated cost in USD, empty for models without a known price")
+
+
+class OpenAICostReportWrapResponse(BaseModel):
+    data: List[UserModelCost] = Field(..., description="Cost per user and model, most expensive first")
+
+
+class TrafficAnomaly(BaseModel):
+    bucket_start: str = Field(..., description="Minute of the anomaly in the requested time zone")
+    route: str = Field(..., description="Route template")
+    method: str = Field(..., description="HTTP method")
+    kind: str = Field(..., description="spike or drop")
+    observed: float = Field(..., description="Requests received in the minute")
+    expected: float = Field(..., description="Baseline requests for the minute")
+    score: float = Field(..., description="Distance from the baseline in standard deviations")
+
+
+class TrafficAnomaliesWrapResponse(BaseModel):
+    data: List[TrafficAnomaly] = Field(..., description="Anomalies, most recent first")
+
+
+class PasswordHashingStats(BaseModel):
+    workers: int = Field(..., description="bcrypt processes of the API worker")
+    max_pending: int = Field(..., description="Calls that may run or wait before new ones are rejected")
+    pending: int = Field(..., description="Calls running or waiting now")
+    completed: int = Field(..., description="Calls finished since the API worker started")
+    rejected: int = Field(..., description="Calls rejected with 503 because the pool was full")
+    avg_latency_ms: Optional[float] = Field(None, description="Average time of a call, waiting included")
+    max_latency_ms: float = Field(..., description="Slowest call, waiting included")
+
+
+class PasswordHashingStatsWrapResponse(BaseModel):
+    data: PasswordHashingStats = Field(..., description="Password hashing pool counters of the API worker that answered")
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 class Pagination(BaseModel):
@@ -5,3 +7,4 @@ class Pagination(BaseModel):
     per_page: int
     length: int
     total: int
+    next_cursor: Optional[str] = None
@@ -0,0 +1,30 @@
+from typing import (
+    List, Optional)
+
+from pydantic import (
+    BaseModel, Field)
+
+from .pagination import Pagination
+
+
+class ErrorSample(BaseModel):
+    at: str = Field(..., description="When the failure happened (UTC, ISO 8601)")
+    error: Optional[str] = Field(None, description="Start of the error response body or the exception")
+    latency_ms: float = Field(..., description="Latency of the failed request in milliseconds")
+
+
+class ErrorGroup(BaseModel):
+    fingerprint: str = Field(..., description="Stable id of the group")
+    method: str = Field(..., description="HTTP method")
+    route: str = Field(..., description="Route template")
+    status_code: int = Field(..., description="Response status code")
+    message: str = Field(..., description="Normalized error message")
+    first_seen: str = Field(..., description="First occurrence in the requested time zone")
+    last_seen: str = Field(..., description="Latest occurrence in the requested time zone")
+    count: int = Field(..., description="Number of occurrences")
+    samples: List[ErrorSample] = Field(..., description="First few occurrences")
+
+
+class PaginatedErrorGroupResponse(BaseModel):
+    data: List[ErrorGroup] = Field(..., description="Error groups, most recently seen first")
+    pagination: Pagination = Field(..., description="Pagination details")
@@ -0,0 +1,55 @@
+from typing import (
+    List, Optional)
+from uuid import UUID
+
+from pydantic import (
+    BaseModel, ConfigDict, Field)
+
+
+class MonitoredEndpointCreate(BaseModel):
+    """Schema for registering an endpoint with the uptime prober."""
+    name: str = Field(..., min_length=1, max_length=255, description="Display name of the endpoint")
+    url: str = Field(..., min_length=1, max_length=2048, pattern="^https?://", description="URL to probe")
+    method: str = Field("GET", pattern="^(GET|HEAD|POST|OPTIONS)$", description="HTTP method of the probe")
+    expected_status: int = Field(200, ge=100, le=599, description="Status code of a healthy response")
+    interval_seconds: int = Field(30, ge=10, le=3600, description="Seconds between probes")
+    timeout_seconds: float = Field(10, gt=0, le=60, description="Probe timeout in seconds")
+    degraded_latency_ms: float = Field(2000, gt=0, description="Slower responses are reported as degraded")
+
+
+class MonitoredEndpointResponse(MonitoredEndpointCreate):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID = Field(..., description="Monitored endpoint's unique identifier")
+
+
+class MonitoredEndpointWrapResponse(BaseModel):
+    data: MonitoredEndpointResponse = Field(..., description="Monitored endpoint information")
+
+
+class EndpointUptime(BaseModel):
+    id: UUID = Field(..., description="Monitored endpoint's unique identifier")
+    name: str = Field(..., description="Display name of the endpoint")
+    url: str = Field(..., description="Probed URL")
+    state: Optional[str] = Field(None, description="Current state (up, degraded or down), empty before the first probe")
+    last_checked_at: Optional[str] = Field(None, description="Latest probe in the requested time zone")
+    uptime_percentage: Optional[float] = Field(None, description="Up or degraded share of the monitored time")
+    up_seconds: int = Field(..., description="Seconds up in the window")
+    degraded_seconds: int = Field(..., description="Seconds degraded in the window")
+    down_seconds: int = Field(..., description="Seconds down in the window")
+    monitored_seconds: int = Field(..., description="Seconds of the window covered by probes")
+
+
+class UptimeWrapResponse(BaseModel):
+    data: List[EndpointUptime] = Field(..., description="Uptime of every active monitored endpoint")
+
+
+class StateInterval(BaseModel):
+    state: str = Field(..., description="up, degraded or down")
+    started_at: str = Field(..., description="Start of the interval (clipped to the window)")
+    ended_at: Optional[str] = Field(None, description="End of the interval, empty while it is still open")
+    duration_seconds: int = Field(..., description="Length of the interval inside the window")
+
+
+class StateIntervalsWrapResponse(BaseModel):
+    data: List[StateInterval] = Field(..., description="State intervals, oldest first")
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import (
     List, Optional, Dict)
 from uuid import UUID
@@ -109,4 +110,37 @@ class UserDashboard(BaseModel):
 
 
 class UserDashboardWrapResponse(BaseModel):
-    data: UserDashboard = Field(..., description="User count information")
\ No newline at end of file
+    data: UserDashboard = Field(..., description="User count information")
+
+
+class BulkInviteJob(BaseModel):
+    job_id: str = Field(..., description="Bulk invitation job ID, to poll its progress")
+    total: int = Field(..., description="Invitations received")
+
+
+class BulkInviteJobWrapResponse(BaseModel):
+    data: BulkInviteJob = Field(..., description="Queued bulk invitation job")
+
+
+class BulkInviteRowError(BaseModel):
+    row: int = Field(..., description="CSV line of the invalid row")
+    email: Optional[str] = Field(None, description="Email of the invalid row")
+    error: str = Field(..., description="Validation error")
+
+
+class BulkInviteProgress(BaseModel):
+    job_id: str = Field(..., description="Bulk invitation job ID")
+    status: str = Field(..., description="queued, running, completed or failed")
+    total: int = Field(..., description="Invitations received")
+    processed: int = Field(..., description="Invitations processed so far")
+    created: int = Field(..., description="Users invited")
+    skipped: int = Field(..., description="Existing or duplicated emails")
+    failed: int = Field(..., description="Invalid rows")
+    errors: List[BulkInviteRowError] = Field(default_factory=list, description="First invalid rows")
+    created_at: datetime = Field(..., description="Job creation time")
+    finished_at: Optional[datetime] = Field(None, description="Job completion time")
+    error: Optional[str] = Field(None, description="Why the job failed")
+
+
+class BulkInviteProgressWrapResponse(BaseModel):
+    data: BulkInviteProgress = Field(..., description="Bulk invitation job progress")
@@ -0,0 +1,275 @@
+import base64
+import json
+import time
+from datetime import (
+    datetime, timedelta)
+from typing import (
+    Dict, Iterable, List, Optional, Tuple)
+
+import numpy as np
+import redis.asyncio as redis
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.live_updates import publish_live_updates
+from app.core.redis_lock import RedisLock
+from app.db.models import (
+    RequestRollupMinute, TrafficAnomalies)
+from app.services.request_metrics_service import bucket_start_for
+from app.utils.datetime_utils import convert_datetime_utc_to_timezone_str
+
+
+ANOMALY_STATE_KEY = "anomaly_detector:state"
+ANOMALY_TICK_LOCK_KEY = "anomaly_detector:tick_lock"
+ANOMALY_SPIKE = "spike"
+ANOMALY_DROP = "drop"
+
+BUCKET_SECONDS = 60
+EWMA_ALPHA = 0.1
+SEASONAL_ALPHA = 0.05
+# One seasonal baseline per hour of the week
+SEASONAL_SLOTS = 168
+# Minutes a route has to be observed before it can be flagged
+EWMA_WARMUP_BUCKETS = 30
+SEASONAL_WARMUP_SAMPLES = 30
+# After a long pause only the most recent minutes are scored
+MAX_CATCHUP_BUCKETS = 120
+
+RouteKey = Tuple[str, str]
+
+
+def seasonal_slot(bucket_start: datetime) -> int:
+    return bucket_start.weekday() * 24 + bucket_start.hour
+
+
+def _ewma_update(mean: np.ndarray, var: np.ndarray, counts: np.ndarray, alpha: float) -> None:
+    """Exponentially weighted mean and variance, updated in place."""
+    diff = counts - mean
+    increment = alpha * diff
+    mean += increment
+    var *= 1 - alpha
+    var += (1 - alpha) * diff * increment
+
+
+class TrafficBaselines:
+    """
+    Per-route request count baselines kept as NumPy arrays, one row per
+    (route, method): a fast EWMA of the per-minute count and a slower EWMA
+    for every hour of the week (seasonal). Each closed minute is scored for
+    every route at once and then folded into the baselines.
+    """
+
+    _FLOAT_ARRAYS = ("ewma_mean", "ewma_var", "seasonal_mean", "seasonal_var")
+    _COUNT_ARRAYS = ("ewma_count", "seasonal_count")
+
+    def __init__(self, routes: Iterable[RouteKey] = (), last_bucket: Optional[datetime] = None):
+        self.routes: List[RouteKey] = [tuple(route) for route in routes]
+        self.index: Dict[RouteKey, int] = {route: i for i, route in enumerate(self.routes)}
+        self.last_bucket = last_bucket
+        size = len(self.routes)
+        self.ewma_mean = np.zeros(size)
+        self.ewma_var = np.zeros(size)
+        self.ewma_count = np.zeros(size, dtype=np.int32)
+        self.seasonal_mean = np.zeros((size, SEASONAL_SLOTS), dtype=np.float32)
+        self.seasonal_var = np.zeros((size, SEASONAL_SLOTS), dtype=np.float32)
+        self.seasonal_count = np.zeros((size, SEASONAL_SLOTS), dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.routes)
+
+    def ensure_routes(self, routes: Iterable[RouteKey]) -> None:
+        """Add zeroed baselines for routes seen for the first time."""
+        new_routes = [route for route in set(routes) if route not in self.index]
+        if not new_routes:
+            return
+        for route in new_routes:
+            self.index[route] = len(self.routes)
+            self.routes.append(route)
+        extra = len(new_routes)
+        for name in (*self._FLOAT_ARRAYS, *self._COUNT_ARRAYS):
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate([array, np.zeros((extra, *array.shape[1:]), dtype=array.dtype)]))
+
+    def step(
+        self,
+        counts: np.ndarray,
+        slot: int,
+        z_threshold: float,
+        min_expected: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Score one minute of request counts (one per route, in `routes`
+        order) against the current baselines, then update them.
+        Returns (score, expected, spikes, drops).
+        """
+        seasonal_ready = self.seasonal_count[:, slot] >= SEASONAL_WARMUP_SAMPLES
+        expected = np.where(seasonal_ready, self.seasonal_mean[:, slot], self.ewma_mean)
+        variance = np.where(seasonal_ready, self.seasonal_var[:, slot], self.ewma_var)
+        # Request counts vary at least as much as a Poisson process
+        std = np.sqrt(np.maximum(variance, np.maximum(expected, 1.0)))
+        score = (counts - expected) / std
+        ready = seasonal_ready | (self.ewma_count >= EWMA_WARMUP_BUCKETS)
+        spikes = ready & (score >= z_threshold)
+        drops = ready & (score <= -z_threshold) & (expected >= min_expected)
+
+        # Baselines start from the first observation instead of zero
+        fresh = self.ewma_count == 0
+        self.ewma_mean[fresh] = counts[fresh]
+        _ewma_update(self.ewma_mean, self.ewma_var, counts, EWMA_ALPHA)
+        self.ewma_count += 1
+        seasonal_mean = self.seasonal_mean[:, slot].astype(np.float64)
+        seasonal_var = self.seasonal_var[:, slot].astype(np.float64)
+        fresh = self.seasonal_count[:, slot] == 0
+        seasonal_mean[fresh] = counts[fresh]
+        _ewma_update(seasonal_mean, seasonal_var, counts, SEASONAL_ALPHA)
+        self.seasonal_mean[:, slot] = seasonal_mean
+        self.seasonal_var[:, slot] = seasonal_var
+        self.seasonal_count[:, slot] += 1
+        return score, expected, spikes, drops
+
+    def dumps(self) -> Dict[str, str]:
+        """Redis hash fields (base64 text, the shared clients decode responses)."""
+        mapping = {
+            "routes": json.dumps(self.routes),
+            "last_bucket": self.last_bucket.isoformat() if self.last_bucket else "",
+        }
+        for name in (*self._FLOAT_ARRAYS, *self._COUNT_ARRAYS):
+            mapping[name] = base64.b64encode(getattr(self, name).tobytes()).decode()
+        return mapping
+
+    @classmethod
+    def loads(cls, mapping: Dict[str, str]) -> "TrafficBaselines":
+        baselines = cls(
+            json.loads(mapping["routes"]),
+            datetime.fromisoformat(mapping["last_bucket"]) if mapping.get("last_bucket") else None
+        )
+        for name in (*cls._FLOAT_ARRAYS, *cls._COUNT_ARRAYS):
+            array = getattr(baselines, name)
+            stored = np.frombuffer(base64.b64decode(mapping[name]), dtype=array.dtype)
+            setattr(baselines, name, stored.reshape(array.shape).copy())
+        return baselines
+
+
+class AnomalyDetectionService:
+    """Service class for the request count anomaly detector."""
+
+    def __init__(self, db: AsyncSession, redis_client: Optional[redis.Redis] = None):
+        self.db = db
+        self.redis_client = redis_client
+
+    async def load_baselines(self) -> TrafficBaselines:
+        mapping = await self.redis_client.hgetall(ANOMALY_STATE_KEY)
+        if not mapping:
+            return TrafficBaselines()
+        try:
+            return TrafficBaselines.loads(mapping)
+        except (KeyError, ValueError) as e:
+            print(f"AnomalyDetectionService baselines unreadable, starting over: {e}")
+            return TrafficBaselines()
+
+    async def run_tick(
+        self, z_threshold: float, min_expected: float, settle_seconds: float, lock_timeout: float = 120
+    ) -> int:
+        """
+        Score every minute closed since the last tick for all routes and
+        store the flagged spikes and drops. A minute counts as closed once
+        `settle_seconds` have passed so late ingests are included.
+        Ticks never overlap: the baselines are saved after the anomalies are
+        committed, so a concurrent tick would score the same minutes again.
+        Returns the number of anomalies found.
+        """
+        lock = RedisLock(self.redis_client, ANOMALY_TICK_LOCK_KEY, lock_timeout)
+        if not await lock.acquire():
+            print("AnomalyDetectionService tick skipped: another tick is running")
+            return 0
+        try:
+            return await self._score_closed_minutes(z_threshold, min_expected, settle_seconds)
+        finally:
+            await lock.release()
+
+    async def _score_closed_minutes(self, z_threshold: float, min_expected: float, settle_seconds: float) -> int:
+        baselines = await self.load_baselines()
+        width = timedelta(seconds=BUCKET_SECONDS)
+        last_closed = bucket_start_for(time.time() - settle_seconds, BUCKET_SECONDS) - width
+        first = last_closed - width * (MAX_CATCHUP_BUCKETS - 1)
+        if baselines.last_bucket is not None and baselines.last_bucket + width > first:
+            first = baselines.last_bucket + width
+        if first > last_closed:
+            return 0
+
+        result = (await self.db.execute(
+            select(
+                RequestRollupMinute.bucket_start, RequestRollupMinute.route,
+                RequestRollupMinute.method, RequestRollupMinute.request_count
+                ).where(
+                    RequestRollupMinute.bucket_start >= first,
+                    RequestRollupMinute.bucket_start <= last_closed
+                )
+        )).all()
+        baselines.ensure_routes((row.route, row.method) for row in result)
+        bucket_count = int((last_closed - first) / width) + 1
+        counts = np.zeros((bucket_count, len(baselines)))
+        if result:
+            bucket_index = np.fromiter(
+                (int((row.bucket_start - first) / width) for row in result), dtype=np.intp, count=len(result))
+            route_index = np.fromiter(
+                (baselines.index[(row.route, row.method)] for row in result), dtype=np.intp, count=len(result))
+            counts[bucket_index, route_index] = np.fromiter(
+                (row.request_count for row in result), dtype=np.float64, count=len(result))
+
+        anomalies = []
+        for i in range(bucket_count):
+            bucket_start = first + width * i
+            score, expected, spikes, drops = baselines.step(
+                counts[i], seasonal_slot(bucket_start), z_threshold, min_expected)
+            for j in np.flatnonzero(spikes | drops):
+                route, method = baselines.routes[j]
+                anomalies.append({
+                    "bucket_start": bucket_start,
+                    "route": route,
+                    "method": method,
+                    "kind": ANOMALY_SPIKE if spikes[j] else ANOMALY_DROP,
+                    "observed": float(counts[i, j]),
+                    "expected": round(float(expected[j]), 3),
+                    "score": round(float(score[j]), 3),
+                })
+        baselines.last_bucket = last_closed
+
+        if anomalies:
+            # Minutes already stored (baselines not saved after the last commit) are skipped
+            await self.db.execute(
+                insert(TrafficAnomalies).on_conflict_do_nothing(
+                    index_elements=["bucket_start", "route", "method", "kind"]),
+                anomalies)
+            await self.db.commit()
+        await self.redis_client.hset(ANOMALY_STATE_KEY, mapping=baselines.dumps())
+        await publish_live_updates(self.redis_client, [
+            ("anomaly", {**anomaly, "bucket_start": anomaly["bucket_start"].isoformat()}) for anomaly in anomalies
+        ])
+        return len(anomalies)
+
+    async def get_anomalies(
+        self,
+        timezone: str,
+        hours: int,
+        route: Optional[str] = None,
+        kind: Optional[str] = None
+    ) -> List[dict]:
+        """Anomalies flagged in the last `hours` hours, most recent first."""
+        query = select(
+            TrafficAnomalies.bucket_start, TrafficAnomalies.route, TrafficAnomalies.method,
+            TrafficAnomalies.kind, TrafficAnomalies.observed, TrafficAnomalies.expected,
+            TrafficAnomalies.score
+            ).where(TrafficAnomalies.bucket_start >= datetime.utcnow() - timedelta(hours=hours))
+        if route:
+            query = query.where(TrafficAnomalies.route == route)
+        if kind:
+            query = query.where(TrafficAnomalies.kind == kind)
+        result = await self.db.execute(query.order_by(TrafficAnomalies.bucket_start.desc()))
+        anomalies = []
+        for row in result:
+            anomaly = row._asdict()
+            anomaly["bucket_start"] = convert_datetime_utc_to_timezone_str(row.bucket_start, timezone)
+            anomalies.append(anomaly)
+        return anomalies
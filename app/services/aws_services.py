@@ -1,28 +1,89 @@
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import (
+    AsyncIterator, Dict, List, Optional)
 from uuid import uuid4
-from typing import List, Dict
-
-import boto3
 
 from app.core.config import settings
 from app.core.exceptions import InternalErrorException, NotFoundException
+from app.utils.lru import LRUCache
 
-class AmazonServices:
-    def __init__(self):
-        self.s3_client = boto3.client(
+
+MB = 1024 * 1024
+# A cached presigned URL is handed out only while it stays valid this long
+PRESIGNED_URL_MIN_REMAINING_SECONDS = 600
+
+_s3_client = None
+_s3_executor: Optional[ThreadPoolExecutor] = None
+_presigned_urls = LRUCache(int(settings.S3_PRESIGNED_URL_CACHE_SIZE))
+
+
+def get_s3_client():
+    """
+    S3 client shared by the whole worker (boto3 clients are thread safe),
+    so every call reuses the same connection pool. boto3 is imported here,
+    on first use, as it takes longer to import than the rest of the app.
+    """
+    global _s3_client
+    if _s3_client is None:
+        import boto3
+        from botocore.config import Config
+        _s3_client = boto3.client(
             "s3",
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            region_name=settings.AWS_REGION,
+            # Local S3 stand-in (MinIO, moto server) when set
+            endpoint_url=settings.S3_ENDPOINT_URL or None,
+            config=Config(
+                max_pool_connections=int(settings.S3_MAX_POOL_CONNECTIONS),
+                retries={"max_attempts": 3, "mode": "standard"}
+            )
         )
+    return _s3_client
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # One thread per pooled connection; S3 calls never use the default executor
+    global _s3_executor
+    if _s3_executor is None:
+        _s3_executor = ThreadPoolExecutor(int(settings.S3_MAX_POOL_CONNECTIONS), thread_name_prefix="s3")
+    return _s3_executor
+
+
+def _transfer_config():
+    from boto3.s3.transfer import TransferConfig
+    part_size = int(settings.S3_MULTIPART_CHUNK_SIZE_IN_MB) * MB
+    return TransferConfig(
+        multipart_threshold=part_size,
+        multipart_chunksize=part_size,
+        max_concurrency=int(settings.S3_TRANSFER_MAX_CONCURRENCY)
+    )
+
+
+class AmazonServices:
+    """
+    S3 access for async code: the blocking boto3 calls run in a bounded
+    thread pool on one shared client, large bodies go through multipart
+    transfers, and presigned URLs are cached until shortly before they
+    expire. Errors are caught as `s3_client.exceptions.ClientError` so
+    botocore is not imported with the module.
+    """
+
+    def __init__(self):
+        self.s3_client = get_s3_client()
         self.bucket_name = settings.S3_BUCKET_NAME
-        # self.s3_resource = boto3.resource(
-        #     "s3",
-        #     aws_access_key_id=Config_is.AWS_ACCESS_KEY_ID,
-        #     aws_secret_access_key=Config_is.AWS_SECRET_ACCESS_KEY,
-        # )
-    
+
+    async def _call(self, fn, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(_get_executor(), partial(fn, *args, **kwargs))
+
     async def put_object(self, file_is, path: str, content_type: str) -> bool:
-        response = self.s3_client.put_object(
-            Bucket=settings.S3_BUCKET,
+        response = await self._call(
+            self.s3_client.put_object,
+            Bucket=self.bucket_name,
             Key=path,
             Body=file_is,
             ContentType=content_type
@@ -30,94 +91,138 @@ class AmazonServices:
         if response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0) != 200:
             raise InternalErrorException()
         return True
-    
+
+    async def upload_fileobj(self, file_object, path: str, content_type: str, public: bool = False) -> bool:
+        """
+        Stream a file-like object to S3. Bodies above the part size are sent
+        as a multipart upload with parts in parallel, never read into memory
+        at once.
+        """
+        if isinstance(file_object, (bytes, bytearray)):
+            file_object = io.BytesIO(file_object)
+        extra_args = {"ContentType": content_type}
+        if public:
+            extra_args["ACL"] = "public-read"
+        try:
+            await self._call(
+                self.s3_client.upload_fileobj, file_object, self.bucket_name, path,
+                ExtraArgs=extra_args, Config=_transfer_config())
+        except self.s3_client.exceptions.ClientError as e:
+            print(f"upload_fileobj -- {e}")
+            raise InternalErrorException()
+        return True
+
     async def delete_s3_object(self, path: str) -> bool:
         """
         Delete an object from s3
         """
-        self.s3_client.delete_object(Bucket=self.bucket_name, Key=path)
+        await self._call(self.s3_client.delete_object, Bucket=self.bucket_name, Key=path)
         return True
 
     async def acl_file_upload_obj_s3(self, file_object, path: str, content_type: str) -> Dict:
         """
         Upload files to s3
         """
-        try:
-            response = self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=path,
-                Body=file_object,
-                ACL="public-read",
-                ContentType=content_type,
-            )
-            print(response)
-            if response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0) != 200:
-                print(response)
-                raise InternalErrorException()
-        except Exception as e:
-            print(f"acl_file_upload_obj_s3 -- {e}")
-            raise InternalErrorException()
-        return True
+        return await self.upload_fileobj(file_object, path, content_type, public=True)
 
     async def get_object_content(self, path: str) -> str:
         """
         Reads and returns the content of an S3 object as a string.
         """
         try:
-            response = self.s3_client.get_object(
+            response = await self._call(
+                self.s3_client.get_object,
                 Bucket=self.bucket_name,
                 Key=path,
             )
-            object_content = response['Body'].read().decode('utf-8')
-            return object_content
-        except Exception as e:
+            object_content = await self._call(response['Body'].read)
+            return object_content.decode('utf-8')
+        except self.s3_client.exceptions.ClientError as e:
             # Handle specific S3 errors, like the object not existing
             if e.response['Error']['Code'] == 'NoSuchKey':
                 print(f"Object not found at path: {path}")
                 raise NotFoundException(f"Sorry this changes are not available")
-            else:
-                print(f"get_object_content -- {e}")
-                raise InternalErrorException("An unexpected error occurred. Please try again later")
-        except Exception as e:
             print(f"get_object_content -- {e}")
             raise InternalErrorException("An unexpected error occurred. Please try again later")
 
-    # def file_encoded_uploader(
-    #     self, file_is: object, image_type: str, file_path: str) -> bool:
-    #     """
-    #     Upload base64 images to S3 bucket
-    #     """
-    #     s3_obj = self.s3_resource.Object(Config_is.S3_BUCKET_NAME, file_path)
-    #     s3_obj.put(
-    #         Body=base64.b64decode(file_is), ContentType=image_type, ACL="public-read"
-    #     )
-    #     return True
-
-
-    async def presigned_url(self, file_path: str) -> str:
-        response = self.s3_client.generate_presigned_url(
-            "get_object", Params={"Bucket": self.bucket_name, "Key": file_path}
-        )
-        return response
+    async def stream_object(self, path: str, chunk_size: int = MB) -> AsyncIterator[bytes]:
+        """Object body in chunks, e.g. for a StreamingResponse."""
+        try:
+            response = await self._call(self.s3_client.get_object, Bucket=self.bucket_name, Key=path)
+        except self.s3_client.exceptions.ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchKey':
+                raise NotFoundException("File not found")
+            print(f"stream_object -- {e}")
+            raise InternalErrorException("An unexpected error occurred. Please try again later")
+        body = response['Body']
+        try:
+            while True:
+                chunk = await self._call(body.read, chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            body.close()
 
-    async def download_s3_object(self, s3_obj_name: str):
-        status = self.s3_client.download_file(
-            self.bucket_name, s3_obj_name, uuid4().hex
-        )
-        return status
+    async def presigned_url(self, file_path: str, expires_in: Optional[int] = None) -> str:
+        return (await self.presigned_urls([file_path], expires_in))[file_path]
+
+    async def presigned_urls(self, file_paths: List[str], expires_in: Optional[int] = None) -> Dict[str, str]:
+        """
+        Presigned GET URLs of many objects. URLs signed earlier are reused
+        while they have enough lifetime left; the rest are signed together
+        in a single hop to the thread pool.
+        """
+        expires_in = int(expires_in or settings.S3_PRESIGNED_URL_EXPIRY_IN_SECONDS)
+        now = time.time()
+        urls = {}
+        missing = []
+        for path in file_paths:
+            cached = _presigned_urls.get((self.bucket_name, path, expires_in))
+            if cached is not None and cached[1] - now > min(PRESIGNED_URL_MIN_REMAINING_SECONDS, expires_in / 2):
+                urls[path] = cached[0]
+            else:
+                missing.append(path)
+        if missing:
+            signed = await self._call(self._sign, missing, expires_in)
+            for path, url in signed.items():
+                _presigned_urls.set((self.bucket_name, path, expires_in), (url, now + expires_in))
+            urls.update(signed)
+        return urls
+
+    def _sign(self, file_paths: List[str], expires_in: int) -> Dict[str, str]:
+        return {
+            path: self.s3_client.generate_presigned_url(
+                ClientMethod="get_object",
+                Params={"Bucket": self.bucket_name, "Key": path},
+                ExpiresIn=expires_in,
+            )
+            for path in file_paths
+        }
+
+    async def download_s3_object(self, s3_obj_name: str, file_path: Optional[str] = None) -> str:
+        """Download to a local file with ranged parallel GETs; returns the file path."""
+        file_path = file_path or uuid4().hex
+        await self._call(
+            self.s3_client.download_file, self.bucket_name, s3_obj_name, file_path,
+            Config=_transfer_config())
+        return file_path
+
+    async def list_keys(self, prefix: str, delimiter: str = "/", max_keys: Optional[int] = None) -> List[str]:
+        """Every object key under `prefix` (all pages), folder markers excluded."""
+        def _list():
+            paginator = self.s3_client.get_paginator("list_objects_v2")
+            pagination = {"MaxItems": max_keys} if max_keys else {}
+            keys = []
+            for page in paginator.paginate(
+                    Bucket=self.bucket_name, Prefix=prefix, Delimiter=delimiter, PaginationConfig=pagination):
+                keys.extend(
+                    file_object["Key"] for file_object in page.get("Contents", [])
+                    if not file_object["Key"].endswith("/"))
+            return keys
+        return await self._call(_list)
 
     async def list_objects(self, prefix: str) -> List:
-        objects = self.s3_client.list_objects_v2(
-            Bucket=self.bucket_name, Prefix=prefix, Delimiter="/"
-        )
-        result = []
-        for file_object in objects.get("Contents", []):
-            key_is = file_object.get("Key")
-            if not key_is.endswith("/"):
-                url = self.s3_client.generate_presigned_url(
-                    ClientMethod="get_object",
-                    Params={"Bucket": self.bucket_name, "Key": key_is},
-                    ExpiresIn=43200,
-                )
-                result.append({"name": key_is.split("/")[-1], "url": url})
-        return result
+        keys = await self.list_keys(prefix)
+        urls = await self.presigned_urls(keys)
+        return [{"name": key.split("/")[-1], "url": urls[key]} for key in keys]
@@ -0,0 +1,239 @@
+import csv
+import io
+import json
+import time
+from datetime import datetime
+from typing import (
+    List, Tuple)
+from uuid import uuid4
+
+import redis.asyncio as redis
+from pydantic import ValidationError
+from sqlalchemy import (
+    String, any_, bindparam, select)
+from sqlalchemy.dialects.postgresql import (
+    ARRAY, insert)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.exceptions import (
+    BadRequestException, NotFoundException)
+from app.core.redis_config import get_redis_connection
+from app.core.session_store import store_session_tokens
+from app.db.models import Users
+from app.db.session import AsyncSessionLocal
+from app.schemas.user import UserCreate
+from app.services.email_outbox import EmailOutboxService
+from app.services.user_service import (
+    INVITATION_EMAIL_SUBJECT, USER_COUNTS_CACHE_KEY, create_invitation)
+
+
+BULK_INVITE_KEY_PREFIX = "bulk_invite"
+BULK_INVITE_JOB_TTL_SECONDS = 86400
+# Row errors kept on the job, the counters include every one
+BULK_INVITE_MAX_ERRORS = 100
+BULK_INVITE_CSV_COLUMNS = {"first_name", "last_name", "email", "department_id"}
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_FAILED_ERROR = "The job failed; invite the users again, existing ones are skipped"
+JOB_ORPHANED_ERROR = "The job stopped making progress (worker restarted); invite the users again, existing ones are skipped"
+
+# Fail a queued/running job whose heartbeat is older than ARGV[1] (epoch seconds)
+_FAIL_STALE_JOB_SCRIPT = """
+local status = redis.call('HGET', KEYS[1], 'status')
+if (status == 'queued' or status == 'running')
+        and tonumber(redis.call('HGET', KEYS[1], 'heartbeat_at') or '0') < tonumber(ARGV[1]) then
+    redis.call('HSET', KEYS[1], 'status', 'failed', 'finished_at', ARGV[2], 'error', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+
+def parse_invite_csv(content: bytes) -> Tuple[List[UserCreate], List[dict]]:
+    """
+    Invitations of a CSV file with a header row (first_name, last_name,
+    email, department_id and optionally role_id). Returns the valid rows
+    and an error per invalid row.
+    """
+    try:
+        reader = csv.DictReader(io.StringIO(content.decode("utf-8-sig")))
+        missing = BULK_INVITE_CSV_COLUMNS - set(reader.fieldnames or [])
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise BadRequestException(f"Unreadable CSV file: {e}")
+    if missing:
+        raise BadRequestException(f"CSV file is missing the columns {', '.join(sorted(missing))}")
+    users, errors = [], []
+    for line, row in enumerate(reader, start=2):
+        try:
+            users.append(UserCreate(**{key: value.strip() for key, value in row.items() if key and value}))
+        except ValidationError as e:
+            error = e.errors()[0]
+            errors.append({
+                "row": line,
+                "email": row.get("email"),
+                "error": f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}",
+            })
+    return users, errors
+
+
+class BulkInviteService:
+    """
+    Service class for bulk user invitations. A job inserts its users in
+    batches: one multi-row INSERT, one Redis pipeline for the invitation
+    tokens and one multi-row outbox insert per batch. Progress lives in a
+    Redis hash so any worker can report it.
+    Jobs run as background tasks of the API worker and do not survive its
+    restart: every batch refreshes a heartbeat, and a job whose heartbeat
+    is older than `stale_after` seconds is reported as failed.
+    """
+
+    def __init__(self, db: AsyncSession, redis_client: redis.Redis, stale_after: int = 300):
+        self.db = db
+        self.redis_client = redis_client
+        self.stale_after = stale_after
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"{BULK_INVITE_KEY_PREFIX}:{job_id}"
+
+    async def create_job(self, total: int, errors: List[dict]) -> str:
+        """Register a job; rows rejected before it started count as processed and failed."""
+        job_id = uuid4().hex
+        key = self._job_key(job_id)
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping={
+                "status": JOB_QUEUED,
+                "total": total,
+                "processed": len(errors),
+                "created": 0,
+                "skipped": 0,
+                "failed": len(errors),
+                "errors": json.dumps(errors[:BULK_INVITE_MAX_ERRORS]),
+                "created_at": datetime.utcnow().isoformat(),
+                "heartbeat_at": time.time(),
+            })
+            pipe.expire(key, BULK_INVITE_JOB_TTL_SECONDS)
+            await pipe.execute()
+        return job_id
+
+    async def get_progress(self, job_id: str) -> dict:
+        key = self._job_key(job_id)
+        job = await self.redis_client.hgetall(key)
+        if not job:
+            raise NotFoundException("Bulk invitation job not found")
+        if job["status"] in (JOB_QUEUED, JOB_RUNNING) and float(job.get("heartbeat_at") or 0) < time.time() - self.stale_after:
+            # Checked again in Redis, the job may have just made progress
+            if await self.redis_client.eval(
+                    _FAIL_STALE_JOB_SCRIPT, 1, key,
+                    time.time() - self.stale_after, datetime.utcnow().isoformat(), JOB_ORPHANED_ERROR):
+                job = await self.redis_client.hgetall(key)
+        return {
+            "job_id": job_id,
+            "status": job["status"],
+            "total": int(job["total"]),
+            "processed": int(job["processed"]),
+            "created": int(job["created"]),
+            "skipped": int(job["skipped"]),
+            "failed": int(job["failed"]),
+            "errors": json.loads(job.get("errors") or "[]"),
+            "created_at": job["created_at"],
+            "finished_at": job.get("finished_at"),
+            "error": job.get("error"),
+        }
+
+    async def _existing_emails(self, emails: List[str]) -> set:
+        result = await self.db.execute(
+            select(Users.email).where(
+                Users.email == any_(bindparam("emails", emails, type_=ARRAY(String)))))
+        return set(result.scalars())
+
+    async def _invite_batch(self, users: List[UserCreate]) -> int:
+        """Insert one batch of new users with their tokens and emails. Returns the number inserted."""
+        now = datetime.utcnow()
+        rows = [
+            {
+                "id": uuid4(),
+                "first_name": user.first_name,
+                "last_name": user.last_name,
+                "email": user.email,
+                "role_id": user.role_id,
+                "invited_at": now,
+                "is_active": True,
+                "is_deleted": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for user in users
+        ]
+        result = await self.db.execute(
+            insert(Users).values(rows)
+            # Invited meanwhile by someone else
+            .on_conflict_do_nothing(index_elements=[Users.email])
+            .returning(Users.id, Users.email)
+        )
+        inserted = {row.email: row.id for row in result}
+        tokens, emails = [], []
+        for user in users:
+            user_id = inserted.get(user.email)
+            if user_id is None:
+                continue
+            access_token, html_content = create_invitation(user_id, user.email, user.first_name, user.last_name)
+            tokens.append((user_id, "invitation", access_token))
+            emails.append({
+                "dedup_key": f"invitation:{user_id}",
+                "to_emails": [user.email],
+                "subject": INVITATION_EMAIL_SUBJECT,
+                "html_content": html_content,
+            })
+        # Tokens first: if the commit fails an unused token only expires
+        await store_session_tokens(self.redis_client, tokens, settings.INVITATION_TOKEN_EXPIRY)
+        await EmailOutboxService(self.db).enqueue_many(emails)
+        await self.db.commit()
+        return len(inserted)
+
+    async def run(self, job_id: str, users: List[UserCreate], batch_size: int) -> None:
+        key = self._job_key(job_id)
+        await self.redis_client.hset(key, mapping={"status": JOB_RUNNING, "heartbeat_at": time.time()})
+        try:
+            seen = set()
+            unique_users = []
+            for user in users:
+                user.email = user.email.lower()
+                if user.email not in seen:
+                    seen.add(user.email)
+                    unique_users.append(user)
+            existing = await self._existing_emails(list(seen))
+            # Duplicates within the request count as skipped right away
+            await self.redis_client.hincrby(key, "skipped", len(users) - len(unique_users))
+            await self.redis_client.hincrby(key, "processed", len(users) - len(unique_users))
+            for start in range(0, len(unique_users), batch_size):
+                batch = unique_users[start:start + batch_size]
+                new_users = [user for user in batch if user.email not in existing]
+                created = await self._invite_batch(new_users) if new_users else 0
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    pipe.hincrby(key, "processed", len(batch))
+                    pipe.hincrby(key, "created", created)
+                    pipe.hincrby(key, "skipped", len(batch) - created)
+                    pipe.hset(key, "heartbeat_at", time.time())
+                    await pipe.execute()
+            await self.redis_client.hset(key, mapping={
+                "status": JOB_COMPLETED, "finished_at": datetime.utcnow().isoformat()})
+        except Exception as e:
+            print(f"BulkInviteService job {job_id} failed: {e}")
+            await self.db.rollback()
+            await self.redis_client.hset(key, mapping={
+                "status": JOB_FAILED, "finished_at": datetime.utcnow().isoformat(), "error": JOB_FAILED_ERROR})
+        finally:
+            await response_cache.invalidate(USER_COUNTS_CACHE_KEY)
+
+
+async def run_bulk_invite_job(job_id: str, users: List[UserCreate]) -> None:
+    """Background task entry point, outside of the request's session."""
+    async with AsyncSessionLocal() as db:
+        await BulkInviteService(db, get_redis_connection()).run(
+            job_id, users, int(settings.BULK_INVITE_BATCH_SIZE))
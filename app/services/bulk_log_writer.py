@@ -0,0 +1,110 @@
+import time
+from typing import (
+    List, Optional, Sequence, Tuple)
+
+import redis.asyncio as redis
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection, AsyncEngine)
+
+from app.db.models.request_log import ApiRequestLogs
+from app.db.session import engine as default_engine
+
+
+REQUEST_LOG_COLUMNS = (
+    "created_at", "method", "route", "status_code",
+    "latency_ms", "request_bytes", "response_bytes",
+)
+# Totals across worker processes; Celery recycles a worker child every few
+# tasks (--max-tasks-per-child), so in-process totals only cover a couple of runs
+WRITER_STATS_KEY_PREFIX = "bulk_log_writer:stats"
+
+
+def _stats(rows: int, batches: int, seconds: float, last_batch_seconds: float) -> dict:
+    return {
+        "total_rows": rows,
+        "total_batches": batches,
+        "last_batch_latency_ms": round(last_batch_seconds * 1000, 2),
+        "avg_batch_latency_ms": round(seconds * 1000 / batches, 2) if batches else 0.0,
+        "rows_per_second": round(rows / seconds) if seconds else 0,
+    }
+
+
+class BulkLogWriter:
+    """
+    Persists request log batches with asyncpg's COPY protocol
+    (copy_records_to_table) on the raw driver connection, so a batch of
+    thousands of rows is a single round trip instead of one INSERT or
+    executemany per row.
+    Keeps running totals of the process so the ingest rate can be sized
+    from the logs; persist_totals adds them to totals kept in Redis.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine = default_engine,
+        table_name: str = ApiRequestLogs.__tablename__,
+        columns: Sequence[str] = REQUEST_LOG_COLUMNS
+    ):
+        self.engine = engine
+        self.table_name = table_name
+        self.columns = list(columns)
+        self.total_rows = 0
+        self.total_batches = 0
+        self.total_seconds = 0.0
+        self.last_batch_seconds = 0.0
+        # Part of the totals not yet added to Redis
+        self._unpersisted = (0, 0, 0.0)
+
+    async def _copy(self, connection: AsyncConnection, rows: List[Tuple]) -> None:
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            self.table_name, records=rows, columns=self.columns)
+
+    async def write(self, rows: List[Tuple], connection: Optional[AsyncConnection] = None) -> dict:
+        """
+        COPY `rows` (tuples in `columns` order) into the table.
+        With `connection` the rows join the caller's open transaction,
+        otherwise a pooled connection is taken from the engine and the COPY
+        commits on its own.
+        """
+        if not rows:
+            return self.stats()
+        started_at = time.perf_counter()
+        if connection is not None:
+            await self._copy(connection, rows)
+        else:
+            async with self.engine.begin() as own_connection:
+                await self._copy(own_connection, rows)
+        elapsed = time.perf_counter() - started_at
+        self.total_rows += len(rows)
+        self.total_batches += 1
+        self.total_seconds += elapsed
+        self.last_batch_seconds = elapsed
+        unpersisted_rows, unpersisted_batches, unpersisted_seconds = self._unpersisted
+        self._unpersisted = (unpersisted_rows + len(rows), unpersisted_batches + 1, unpersisted_seconds + elapsed)
+        print(
+            f"BulkLogWriter {self.table_name}: {len(rows)} rows in {elapsed * 1000:.1f} ms "
+            f"({len(rows) / elapsed if elapsed else 0:.0f} rows/s)"
+        )
+        return self.stats()
+
+    def stats(self) -> dict:
+        """Totals of this process only."""
+        return _stats(self.total_rows, self.total_batches, self.total_seconds, self.last_batch_seconds)
+
+    async def persist_totals(self, redis_client: redis.Redis) -> dict:
+        """Add the batches written since the last call to the totals in Redis, returns the combined stats."""
+        key = f"{WRITER_STATS_KEY_PREFIX}:{self.table_name}"
+        rows, batches, seconds = self._unpersisted
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.hincrby(key, "rows", rows)
+            pipe.hincrby(key, "batches", batches)
+            pipe.hincrbyfloat(key, "seconds", seconds)
+            if batches:
+                pipe.hset(key, "last_batch_seconds", self.last_batch_seconds)
+            pipe.hgetall(key)
+            totals = (await pipe.execute())[-1]
+        self._unpersisted = (0, 0, 0.0)
+        return _stats(
+            int(totals.get("rows", 0)), int(totals.get("batches", 0)),
+            float(totals.get("seconds", 0)), float(totals.get("last_batch_seconds", 0)))
@@ -0,0 +1,146 @@
+import asyncio
+import random
+from datetime import (
+    datetime, timedelta)
+from typing import (
+    List, Tuple)
+
+import httpx
+from sqlalchemy import (
+    bindparam, select, update)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.email_outbox import (
+    EMAIL_FAILED, EMAIL_PENDING, EMAIL_SENT, EmailOutbox)
+from app.services.email_send import BrevoEmailSending
+
+
+# A claimed email is retried by another mailer if not settled within this time
+EMAIL_CLAIM_LEASE_SECONDS = 120
+EMAIL_RETRY_BASE_SECONDS = 30
+EMAIL_RETRY_MAX_SECONDS = 3600
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter after `attempts` failed sends."""
+    delay = min(EMAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1), EMAIL_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+class EmailOutboxService:
+    """Service class for the transactional email outbox."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def enqueue(self, dedup_key: str, to_emails: List[str], subject: str, html_content: str) -> None:
+        """
+        Queue an email in the caller's transaction; it is only sent once the
+        caller commits. An email with the same `dedup_key` is queued once.
+        """
+        await self.db.execute(
+            insert(EmailOutbox).values(
+                dedup_key=dedup_key,
+                to_emails=list(to_emails),
+                subject=subject,
+                html_content=html_content,
+                status=EMAIL_PENDING,
+                attempts=0,
+                next_attempt_at=datetime.utcnow(),
+                created_at=datetime.utcnow()
+            ).on_conflict_do_nothing(index_elements=[EmailOutbox.dedup_key])
+        )
+
+    async def enqueue_many(self, emails: List[dict]) -> None:
+        """enqueue for many emails ({dedup_key, to_emails, subject, html_content}) in one statement."""
+        if not emails:
+            return
+        now = datetime.utcnow()
+        rows = [
+            {**email, "status": EMAIL_PENDING, "attempts": 0, "next_attempt_at": now, "created_at": now}
+            for email in emails
+        ]
+        await self.db.execute(
+            insert(EmailOutbox).values(rows).on_conflict_do_nothing(index_elements=[EmailOutbox.dedup_key]))
+
+    async def claim_due(self, limit: int) -> List[EmailOutbox]:
+        """
+        Lease up to `limit` due emails to this mailer. Rows locked by another
+        mailer are skipped, and a lease that is never settled (crash) makes
+        the email due again once it runs out.
+        """
+        now = datetime.utcnow()
+        due = select(EmailOutbox.id).where(
+            EmailOutbox.status == EMAIL_PENDING,
+            EmailOutbox.next_attempt_at <= now
+            ).order_by(EmailOutbox.next_attempt_at).limit(limit).with_for_update(skip_locked=True)
+        result = await self.db.execute(
+            update(EmailOutbox).where(EmailOutbox.id.in_(due.scalar_subquery()))
+            .values(next_attempt_at=now + timedelta(seconds=EMAIL_CLAIM_LEASE_SECONDS))
+            .returning(EmailOutbox)
+        )
+        emails = list(result.scalars())
+        await self.db.commit()
+        return emails
+
+    async def settle(self, sent: List[int], failed: List[Tuple[EmailOutbox, str]], max_attempts: int) -> None:
+        """Mark sent emails, and schedule a retry (or give up) for failed ones."""
+        now = datetime.utcnow()
+        if sent:
+            await self.db.execute(
+                update(EmailOutbox).where(EmailOutbox.id.in_(sent))
+                .values(status=EMAIL_SENT, sent_at=now, attempts=EmailOutbox.attempts + 1, last_error=None)
+            )
+        if failed:
+            table = EmailOutbox.__table__
+            await self.db.execute(
+                update(table).where(table.c.id == bindparam("b_id")).values(
+                    status=bindparam("b_status"), attempts=bindparam("b_attempts"),
+                    next_attempt_at=bindparam("b_next_attempt_at"), last_error=bindparam("b_last_error")),
+                [
+                    {
+                        "b_id": email.id,
+                        "b_status": EMAIL_FAILED if email.attempts + 1 >= max_attempts else EMAIL_PENDING,
+                        "b_attempts": email.attempts + 1,
+                        "b_next_attempt_at": now + timedelta(seconds=retry_delay(email.attempts + 1)),
+                        "b_last_error": error[:500],
+                    }
+                    for email, error in failed
+                ]
+            )
+        await self.db.commit()
+
+    async def deliver_due(
+        self,
+        client: httpx.AsyncClient,
+        batch_size: int,
+        concurrency: int,
+        max_attempts: int
+    ) -> int:
+        """Send one batch of due emails over the shared client. Returns the number claimed."""
+        emails = await self.claim_due(batch_size)
+        if not emails:
+            return 0
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def send(email: EmailOutbox) -> Tuple[EmailOutbox, str]:
+            async with semaphore:
+                sender = BrevoEmailSending(email.to_emails, email.subject, email.html_content)
+                try:
+                    if await sender.send_email(client):
+                        return email, ""
+                    return email, sender.last_error or "No messageId in the provider response"
+                except Exception as e:
+                    return email, f"{type(e).__name__}: {e}"
+
+        results = await asyncio.gather(*(send(email) for email in emails))
+        await self.settle(
+            [email.id for email, error in results if not error],
+            [(email, error) for email, error in results if error],
+            max_attempts
+        )
+        failed = sum(1 for _, error in results if error)
+        if failed:
+            print(f"EmailOutboxService {failed} of {len(emails)} emails failed, retrying later")
+        return len(emails)
@@ -1,6 +1,5 @@
-from typing import List
+from typing import List, Optional
 
-from typing import List
 import httpx
 from app.core.config import settings
 
@@ -14,30 +13,37 @@ class BrevoEmailSending:
         self.api_key = settings.BREVO_API_KEY
         self.sender_email = settings.BREVO_SENDER_EMAIL
         self.sender_name = "API Monitoring" 
-    async def send_email_handle_log(self, payload: dict) -> bool:
+        # Reason of the last failed send
+        self.last_error: Optional[str] = None
+
+    async def send_email_handle_log(self, payload: dict, client: Optional[httpx.AsyncClient] = None) -> bool:
         """Handles sending email and logs response."""
-        async with httpx.AsyncClient(timeout=10) as client:
-            try:
-                response = await client.post(
-                    self.api_url,
-                    json=payload,
-                    headers={
-                        "accept": "application/json",
-                        "api-key": self.api_key,
-                        "content-type": "application/json"
-                    }
-                )
-                response.raise_for_status()
-                res_json = response.json()
-                return "messageId" in res_json
-            except httpx.HTTPStatusError as e:
-                print(f"brevo HTTP error {e.response.status_code}: {e.response.text}")
-                return False
-            except httpx.RequestError as e:
-                print(f"brevo request error: {e}")
-                return False
+        if client is None:
+            async with httpx.AsyncClient(timeout=10) as client:
+                return await self.send_email_handle_log(payload, client)
+        try:
+            response = await client.post(
+                self.api_url,
+                json=payload,
+                headers={
+                    "accept": "application/json",
+                    "api-key": self.api_key,
+                    "content-type": "application/json"
+                }
+            )
+            response.raise_for_status()
+            res_json = response.json()
+            return "messageId" in res_json
+        except httpx.HTTPStatusError as e:
+            self.last_error = f"HTTP {e.response.status_code}: {e.response.text}"
+            print(f"brevo HTTP error {e.response.status_code}: {e.response.text}")
+            return False
+        except httpx.RequestError as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"brevo request error: {e}")
+            return False
 
-    async def send_email(self) -> bool:
+    async def send_email(self, client: Optional[httpx.AsyncClient] = None) -> bool:
         """Prepares payload and sends email."""
         payload = {
             "sender": {
@@ -48,4 +54,4 @@ class BrevoEmailSending:
             "subject": self.subject,
             "htmlContent": self.html_content
         }
-        return await self.send_email_handle_log(payload)
+        return await self.send_email_handle_log(payload, client)
@@ -0,0 +1,206 @@
+import hashlib
+import json
+import re
+from datetime import (
+    datetime, timedelta)
+from typing import (
+    Dict, Iterable, List, Optional)
+
+import redis.asyncio as redis
+from sqlalchemy import (
+    cast, func, select)
+from sqlalchemy.dialects.postgresql import (
+    JSONPATH, insert)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.error_group import ApiErrorGroups
+from app.services.request_metrics_service import UPSERT_CHUNK_SIZE
+from app.utils.datetime_utils import response_data_date_conversion
+from app.utils.lru import LRUCache
+
+
+ERROR_SAMPLE_LIMIT = 5
+ERROR_MESSAGE_LIMIT = 255
+FINGERPRINT_CACHE_SIZE = 10000
+# Fingerprints whose stored samples are already complete. Kept in Redis as
+# the Celery worker child is recycled every couple of tasks
+# (--max-tasks-per-child); expires so fingerprints that stopped failing go away
+SAMPLED_FINGERPRINTS_KEY = "error_groups:sampled"
+SAMPLED_FINGERPRINTS_TTL_IN_SECONDS = 86400
+
+# Variable parts of error messages, replaced so that the same failure with
+# different ids or values gets the same fingerprint
+_MESSAGE_NORMALIZERS = (
+    (re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I), "<uuid>"),
+    (re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+"), "<email>"),
+    (re.compile(r"'[^']*'|\"[^\"]*\""), "<str>"),
+    (re.compile(r"\b0x[0-9a-f]+\b|\b[0-9a-f]{16,}\b", re.I), "<hex>"),
+    (re.compile(r"\d+(\.\d+)?"), "<n>"),
+    (re.compile(r"\s+"), " "),
+)
+
+# Hot fingerprints of the ingest worker, so a flood of identical failures is
+# normalized and hashed once:
+# (method, route, status code, raw error) -> (fingerprint, normalized message)
+# Stays in process: a flood arrives within one ingest batch (up to
+# REQUEST_LOG_INGEST_BATCH_SIZE records), which a fresh worker child still
+# dedupes, and a miss costs a few regex substitutions, less than a Redis round trip.
+_fingerprint_cache = LRUCache(FINGERPRINT_CACHE_SIZE)
+
+
+def extract_error_message(error: Optional[str]) -> str:
+    """The `detail` of a JSON error body, otherwise the raw error text."""
+    if not error:
+        return ""
+    try:
+        body = json.loads(error)
+    except ValueError:
+        return error
+    detail = body.get("detail") if isinstance(body, dict) else None
+    if isinstance(detail, str):
+        return detail
+    if isinstance(detail, list):
+        # Request validation errors, grouped by location and kind, not by value
+        return "; ".join(
+            f"{'.'.join(str(part) for part in item.get('loc', []))}: {item.get('type', '')}"
+            for item in detail if isinstance(item, dict)
+        )
+    return error
+
+
+def normalize_error_message(message: str) -> str:
+    for pattern, replacement in _MESSAGE_NORMALIZERS:
+        message = pattern.sub(replacement, message)
+    return message.strip()[:ERROR_MESSAGE_LIMIT]
+
+
+def error_fingerprint(method: str, route: str, status_code: int, message: str) -> str:
+    return hashlib.sha1(f"{method} {route} {status_code} {message}".encode()).hexdigest()
+
+
+def group_failures(records: Iterable[list]) -> Dict[str, dict]:
+    """Fold the failed (4xx/5xx) request records of a batch into one group per fingerprint."""
+    groups: Dict[str, dict] = {}
+    for record in records:
+        timestamp, method, route, status_code, latency_ms = record[:5]
+        if status_code < 400:
+            continue
+        error = record[7] if len(record) > 7 else None
+        cache_key = (method, route, status_code, error)
+        cached = _fingerprint_cache.get(cache_key)
+        if cached is None:
+            message = normalize_error_message(extract_error_message(error))
+            cached = (error_fingerprint(method, route, status_code, message), message)
+            _fingerprint_cache.set(cache_key, cached)
+        fingerprint, message = cached
+        seen_at = datetime.utcfromtimestamp(timestamp)
+        group = groups.get(fingerprint)
+        if group is None:
+            group = groups[fingerprint] = {
+                "fingerprint": fingerprint,
+                "method": method,
+                "route": route,
+                "status_code": status_code,
+                "message": message,
+                "first_seen": seen_at,
+                "last_seen": seen_at,
+                "count": 0,
+                "samples": [],
+            }
+        group["count"] += 1
+        if seen_at < group["first_seen"]:
+            group["first_seen"] = seen_at
+        if seen_at > group["last_seen"]:
+            group["last_seen"] = seen_at
+        if len(group["samples"]) < ERROR_SAMPLE_LIMIT:
+            group["samples"].append({"at": seen_at.isoformat(), "error": error, "latency_ms": round(latency_ms, 3)})
+    return groups
+
+
+class ErrorGroupService:
+    """Service class for the grouped failed requests (api_error_groups)."""
+
+    def __init__(self, db: AsyncSession, redis_client: Optional[redis.Redis] = None):
+        self.db = db
+        self.redis_client = redis_client
+
+    async def apply_groups(self, groups: Dict[str, dict]) -> List[str]:
+        """
+        Add a batch of error groups to the stored ones (caller commits).
+        Samples of groups already known to be complete are not sent.
+        Returns the fingerprints whose samples are complete, for mark_sampled
+        once the caller committed.
+        """
+        if self.redis_client is not None and groups:
+            fingerprints = list(groups)
+            sampled = await self.redis_client.smismember(SAMPLED_FINGERPRINTS_KEY, fingerprints)
+            for fingerprint, is_sampled in zip(fingerprints, sampled):
+                if is_sampled:
+                    groups[fingerprint]["samples"] = []
+        complete = []
+        rows = list(groups.values())
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            stmt = insert(ApiErrorGroups).values(rows[start:start + UPSERT_CHUNK_SIZE])
+            excluded = stmt.excluded
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ApiErrorGroups.fingerprint],
+                set_={
+                    "count": ApiErrorGroups.count + excluded.count,
+                    "first_seen": func.least(ApiErrorGroups.first_seen, excluded.first_seen),
+                    "last_seen": func.greatest(ApiErrorGroups.last_seen, excluded.last_seen),
+                    "samples": func.jsonb_path_query_array(
+                        ApiErrorGroups.samples.concat(excluded.samples),
+                        cast(f"$[0 to {ERROR_SAMPLE_LIMIT - 1}]", JSONPATH)),
+                }
+            ).returning(ApiErrorGroups.fingerprint, func.jsonb_array_length(ApiErrorGroups.samples))
+            result = await self.db.execute(stmt)
+            complete += [
+                fingerprint for fingerprint, sample_count in result if sample_count >= ERROR_SAMPLE_LIMIT]
+        return complete
+
+    async def mark_sampled(self, fingerprints: List[str]) -> None:
+        """Remember groups whose samples are complete, so later batches skip their samples."""
+        if self.redis_client is None or not fingerprints:
+            return
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.sadd(SAMPLED_FINGERPRINTS_KEY, *fingerprints)
+            pipe.expire(SAMPLED_FINGERPRINTS_KEY, SAMPLED_FINGERPRINTS_TTL_IN_SECONDS)
+            await pipe.execute()
+
+    async def get_error_groups(
+        self,
+        timezone: str,
+        hours: int,
+        page: int,
+        per_page: int,
+        status_code: Optional[int] = None,
+        route: Optional[str] = None
+    ) -> dict:
+        """Error groups seen in the last `hours` hours, most recent first."""
+        query = select(
+            ApiErrorGroups.fingerprint, ApiErrorGroups.method, ApiErrorGroups.route,
+            ApiErrorGroups.status_code, ApiErrorGroups.message, ApiErrorGroups.first_seen,
+            ApiErrorGroups.last_seen, ApiErrorGroups.count, ApiErrorGroups.samples,
+            func.count().over().label("total_count")
+            ).where(ApiErrorGroups.last_seen >= datetime.utcnow() - timedelta(hours=hours))
+        if status_code:
+            query = query.where(ApiErrorGroups.status_code == status_code)
+        if route:
+            query = query.where(ApiErrorGroups.route == route)
+        result = await self.db.execute(
+            query.order_by(ApiErrorGroups.last_seen.desc()).offset((page - 1) * per_page).limit(per_page))
+        rows = result.all()
+        groups = []
+        for row in rows:
+            group = row._asdict()
+            group.pop("total_count")
+            groups.append(response_data_date_conversion(group, ["first_seen", "last_seen"], timezone))
+        return {
+            "data": groups,
+            "pagination": {
+                "current_page": page,
+                "per_page": per_page,
+                "length": len(groups),
+                "total": rows[0].total_count if rows else 0,
+            }
+        }
@@ -0,0 +1,279 @@
+import time
+from datetime import (
+    date, datetime, timedelta)
+from typing import (
+    Any, Awaitable, Dict, List, Optional, Tuple)
+from uuid import UUID
+
+import redis.asyncio as redis
+from sqlalchemy import (
+    func, select)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import (
+    OpenAIUsageDaily, Users)
+from app.services.request_metrics_service import UPSERT_CHUNK_SIZE
+
+
+PROVIDER_OPENAI = "openai"
+PROVIDER_AZURE = "azure"
+
+OPENAI_USAGE_KEY_PREFIX = "openai_usage"
+# Counter hashes touched since the last flush
+OPENAI_USAGE_DIRTY_KEY = "openai_usage:dirty"
+USAGE_COUNTERS = ("request_count", "prompt_tokens", "completion_tokens", "cached_tokens")
+
+# USD per million tokens: (input, cached input, output)
+MODEL_PRICING_PER_MILLION_TOKENS = {
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+}
+
+# Read and delete counter hashes in one step, so increments made while a
+# flush runs land in a fresh hash instead of being lost.
+_POP_COUNTERS_SCRIPT = """
+local result = {}
+for i, key in ipairs(KEYS) do
+    result[i] = redis.call('HGETALL', key)
+    redis.call('DEL', key)
+end
+return result
+"""
+
+
+def usage_key(usage_date: date, user_id: UUID, provider: str, model: str) -> str:
+    return f"{OPENAI_USAGE_KEY_PREFIX}:{usage_date.isoformat()}:{user_id}:{provider}:{model}"
+
+
+def parse_usage_key(key: str) -> Tuple[date, UUID, str, str]:
+    _, usage_date, user_id, provider, model = key.split(":", 4)
+    return date.fromisoformat(usage_date), UUID(user_id), provider, model
+
+
+def usage_from_response(response: Any) -> Tuple[int, int, int]:
+    """(prompt, completion, cached) tokens of a chat completion object or dict."""
+    usage = response.get("usage") if isinstance(response, dict) else getattr(response, "usage", None)
+    if usage is None:
+        return 0, 0, 0
+    if not isinstance(usage, dict):
+        usage = usage.model_dump() if hasattr(usage, "model_dump") else vars(usage)
+    details = usage.get("prompt_tokens_details") or {}
+    return (
+        usage.get("prompt_tokens") or 0,
+        usage.get("completion_tokens") or 0,
+        details.get("cached_tokens") or 0,
+    )
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int) -> Optional[float]:
+    """USD cost of the tokens, None for models without a known price."""
+    pricing = MODEL_PRICING_PER_MILLION_TOKENS.get(model)
+    if pricing is None:
+        return None
+    input_price, cached_price, output_price = pricing
+    cost = (
+        (prompt_tokens - cached_tokens) * input_price
+        + cached_tokens * cached_price
+        + completion_tokens * output_price
+    ) / 1_000_000
+    return round(cost, 6)
+
+
+class OpenAIUsageRecorder:
+    """
+    Counts the usage of every OpenAI/Azure completion into per user, model
+    and day Redis hashes with one pipelined round trip per completion.
+    The hashes are folded into openai_usage_daily by the flush task.
+    The completion client (app.services.open_ai) is not part of this tree
+    yet; until its calls go through track_completion the counters, and so
+    the usage and cost endpoints, stay empty.
+    """
+
+    def __init__(self, redis_client: redis.Redis):
+        self.redis_client = redis_client
+
+    async def record(
+        self,
+        user_id: UUID,
+        provider: str,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        cached_tokens: int,
+        latency_ms: float
+    ) -> None:
+        key = usage_key(datetime.utcnow().date(), user_id, provider, model)
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.hincrby(key, "request_count", 1)
+            pipe.hincrby(key, "prompt_tokens", prompt_tokens)
+            pipe.hincrby(key, "completion_tokens", completion_tokens)
+            pipe.hincrby(key, "cached_tokens", cached_tokens)
+            pipe.hincrbyfloat(key, "latency_sum_ms", latency_ms)
+            pipe.sadd(OPENAI_USAGE_DIRTY_KEY, key)
+            await pipe.execute()
+
+    async def track_completion(self, user_id: UUID, provider: str, model: str, completion: Awaitable) -> Any:
+        """
+        Await the completion call and record its usage and latency.
+        A failure to record is logged and never fails the completion.
+        """
+        started_at = time.perf_counter()
+        response = await completion
+        latency_ms = (time.perf_counter() - started_at) * 1000
+        try:
+            await self.record(user_id, provider, model, *usage_from_response(response), latency_ms)
+        except Exception as e:
+            print(f"OpenAIUsageRecorder record failed: {e}")
+        return response
+
+
+class OpenAIUsageService:
+    """Service class for the OpenAI usage counters."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def flush_counters(self, redis_client: redis.Redis, batch_size: int = 1000) -> int:
+        """
+        Move the Redis counters into openai_usage_daily, returns the number
+        of counter hashes flushed. Counters that could not be stored are
+        added back to Redis.
+        """
+        keys = await redis_client.spop(OPENAI_USAGE_DIRTY_KEY, batch_size)
+        if not keys:
+            return 0
+        values = await redis_client.eval(_POP_COUNTERS_SCRIPT, len(keys), *keys)
+        rows = []
+        for key, flat in zip(keys, values):
+            if not flat:
+                continue
+            counters = dict(zip(flat[::2], flat[1::2]))
+            usage_date, user_id, provider, model = parse_usage_key(key)
+            row = {
+                "usage_date": usage_date,
+                "user_id": user_id,
+                "provider": provider,
+                "model": model,
+                "latency_sum_ms": float(counters.get("latency_sum_ms", 0)),
+            }
+            for name in USAGE_COUNTERS:
+                row[name] = int(counters.get(name, 0))
+            rows.append(row)
+        try:
+            for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+                stmt = insert(OpenAIUsageDaily).values(rows[start:start + UPSERT_CHUNK_SIZE])
+                excluded = stmt.excluded
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[
+                        OpenAIUsageDaily.usage_date, OpenAIUsageDaily.user_id,
+                        OpenAIUsageDaily.provider, OpenAIUsageDaily.model
+                    ],
+                    set_={
+                        name: getattr(OpenAIUsageDaily, name) + getattr(excluded, name)
+                        for name in (*USAGE_COUNTERS, "latency_sum_ms")
+                    }
+                )
+                await self.db.execute(stmt)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for row in rows:
+                    key = usage_key(row["usage_date"], row["user_id"], row["provider"], row["model"])
+                    for name in USAGE_COUNTERS:
+                        pipe.hincrby(key, name, row[name])
+                    pipe.hincrbyfloat(key, "latency_sum_ms", row["latency_sum_ms"])
+                    pipe.sadd(OPENAI_USAGE_DIRTY_KEY, key)
+                await pipe.execute()
+            raise
+        return len(rows)
+
+    async def get_usage_statistics(self, days: int, user_id: Optional[UUID] = None) -> dict:
+        """
+        Requests and tokens of the last `days` days per model and per day,
+        read from the daily counters in one query.
+        """
+        since = datetime.utcnow().date() - timedelta(days=days - 1)
+        query = select(
+            OpenAIUsageDaily.usage_date, OpenAIUsageDaily.provider, OpenAIUsageDaily.model,
+            func.sum(OpenAIUsageDaily.request_count).label("request_count"),
+            func.sum(OpenAIUsageDaily.prompt_tokens).label("prompt_tokens"),
+            func.sum(OpenAIUsageDaily.completion_tokens).label("completion_tokens"),
+            func.sum(OpenAIUsageDaily.cached_tokens).label("cached_tokens"),
+            func.sum(OpenAIUsageDaily.latency_sum_ms).label("latency_sum_ms")
+            ).where(OpenAIUsageDaily.usage_date >= since)
+        if user_id is not None:
+            query = query.where(OpenAIUsageDaily.user_id == user_id)
+        result = await self.db.execute(
+            query.group_by(OpenAIUsageDaily.usage_date, OpenAIUsageDaily.provider, OpenAIUsageDaily.model))
+
+        models: Dict[Tuple[str, str], dict] = {}
+        daily: Dict[date, dict] = {}
+        for row in result:
+            model = models.setdefault((row.provider, row.model), {
+                "provider": row.provider, "model": row.model, "request_count": 0,
+                "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0, "latency_sum_ms": 0.0,
+            })
+            day = daily.setdefault(row.usage_date, {
+                "date": row.usage_date.isoformat(), "request_count": 0, "total_tokens": 0,
+            })
+            for name in (*USAGE_COUNTERS, "latency_sum_ms"):
+                model[name] += getattr(row, name)
+            day["request_count"] += row.request_count
+            day["total_tokens"] += row.prompt_tokens + row.completion_tokens
+
+        model_rows = []
+        for model in models.values():
+            latency_sum_ms = model.pop("latency_sum_ms")
+            model["total_tokens"] = model["prompt_tokens"] + model["completion_tokens"]
+            model["avg_latency_ms"] = round(latency_sum_ms / model["request_count"], 2) if model["request_count"] else None
+            model["estimated_cost"] = estimate_cost(
+                model["model"], model["prompt_tokens"], model["completion_tokens"], model["cached_tokens"])
+            model_rows.append(model)
+        model_rows.sort(key=lambda model: model["total_tokens"], reverse=True)
+        return {
+            "request_count": sum(model["request_count"] for model in model_rows),
+            "total_tokens": sum(model["total_tokens"] for model in model_rows),
+            "estimated_cost": round(sum(model["estimated_cost"] or 0 for model in model_rows), 6),
+            "models": model_rows,
+            "daily": [daily[usage_date] for usage_date in sorted(daily)],
+        }
+
+    async def get_cost_report(self, start: date, end: date) -> List[dict]:
+        """Tokens and estimated cost per user and model for the days [start, end]."""
+        result = await self.db.execute(
+            select(
+                OpenAIUsageDaily.user_id, Users.email, OpenAIUsageDaily.provider, OpenAIUsageDaily.model,
+                func.sum(OpenAIUsageDaily.request_count).label("request_count"),
+                func.sum(OpenAIUsageDaily.prompt_tokens).label("prompt_tokens"),
+                func.sum(OpenAIUsageDaily.completion_tokens).label("completion_tokens"),
+                func.sum(OpenAIUsageDaily.cached_tokens).label("cached_tokens")
+                ).outerjoin(
+                    Users, Users.id == OpenAIUsageDaily.user_id
+                ).where(
+                    OpenAIUsageDaily.usage_date >= start,
+                    OpenAIUsageDaily.usage_date <= end
+                ).group_by(
+                    OpenAIUsageDaily.user_id, Users.email, OpenAIUsageDaily.provider, OpenAIUsageDaily.model
+                )
+        )
+        report = [
+            {
+                "user_id": row.user_id,
+                "email": row.email,
+                "provider": row.provider,
+                "model": row.model,
+                "request_count": row.request_count,
+                "prompt_tokens": row.prompt_tokens,
+                "completion_tokens": row.completion_tokens,
+                "cached_tokens": row.cached_tokens,
+                "estimated_cost": estimate_cost(row.model, row.prompt_tokens, row.completion_tokens, row.cached_tokens),
+            }
+            for row in result
+        ]
+        report.sort(key=lambda row: row["estimated_cost"] or 0, reverse=True)
+        return report
@@ -0,0 +1,163 @@
+import base64
+import hashlib
+import json
+from datetime import datetime
+
+import redis.asyncio as redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.live_updates import publish_live_updates
+from app.core.redis_lock import RedisLock
+from app.core.request_capture import (
+    LATENCY_SKETCH_QUEUE_KEY, REQUEST_LOG_QUEUE_KEY)
+from app.services.bulk_log_writer import BulkLogWriter
+from app.services.error_group_service import (
+    ErrorGroupService, group_failures)
+from app.services.request_metrics_service import (
+    RequestMetricsService, aggregate_latency_sketches,
+    aggregate_request_records)
+from app.utils.ddsketch import DDSketch
+
+
+INGEST_LOCK_KEY = "request_logs:ingest_lock"
+DEAD_LETTER_KEY_SUFFIX = "dead_letter"
+FAILED_ATTEMPTS_TTL_IN_SECONDS = 86400
+
+
+def summarize_records(records: list) -> dict:
+    """Totals of an ingested batch, pushed to the live dashboards."""
+    client_errors = server_errors = 0
+    for record in records:
+        if 400 <= record[3] < 500:
+            client_errors += 1
+        elif record[3] >= 500:
+            server_errors += 1
+    return {
+        "request_count": len(records),
+        "client_error_count": client_errors,
+        "server_error_count": server_errors,
+        "latest_at": datetime.utcfromtimestamp(max(record[0] for record in records)).isoformat(),
+    }
+
+
+class RequestLogIngestService:
+    """
+    Drains the request capture and latency sketch queues filled by the API
+    workers, stores the detailed logs and folds every batch into the
+    rollup tables and the error groups.
+    Records are read with LRANGE and only trimmed from the queue after the
+    database commit, so a crashed run is retried instead of losing data.
+    This assumes a single consumer: two overlapping runs would read the same
+    head, count it twice and trim records nobody processed, so runs hold
+    INGEST_LOCK_KEY (see ingest_pending).
+    A batch that keeps failing is moved to `<queue>:dead_letter` after
+    `max_attempts` runs so it cannot block the queue behind it.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        redis_client: redis.Redis,
+        log_writer: BulkLogWriter,
+        max_attempts: int = 30,
+        dead_letter_max_length: int = 100000
+    ):
+        self.db = db
+        self.redis_client = redis_client
+        self.log_writer = log_writer
+        self.max_attempts = max_attempts
+        self.dead_letter_max_length = dead_letter_max_length
+
+    async def _record_failure(self, queue_key: str, payloads: list, error: Exception) -> None:
+        """Count a failed run of the batch at the head of `queue_key`, dead letter it after `max_attempts`."""
+        await self.db.rollback()
+        # Keyed on the batch head, a different batch starts counting from zero
+        head = payloads[0].encode() if isinstance(payloads[0], str) else payloads[0]
+        attempts_key = f"{queue_key}:failed_attempts:{hashlib.blake2b(head, digest_size=16).hexdigest()}"
+        attempts = await self.redis_client.incr(attempts_key)
+        await self.redis_client.expire(attempts_key, FAILED_ATTEMPTS_TTL_IN_SECONDS)
+        print(f"RequestLogIngestService {queue_key} batch of {len(payloads)} failed ({attempts}/{self.max_attempts}): {error}")
+        if attempts < self.max_attempts:
+            return
+        dead_letter_key = f"{queue_key}:{DEAD_LETTER_KEY_SUFFIX}"
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.rpush(dead_letter_key, *payloads)
+            pipe.ltrim(dead_letter_key, -self.dead_letter_max_length, -1)
+            pipe.ltrim(queue_key, len(payloads), -1)
+            pipe.delete(attempts_key)
+            await pipe.execute()
+        print(f"RequestLogIngestService moved {len(payloads)} records of {queue_key} to {dead_letter_key}")
+
+    async def ingest_batch(self, batch_size: int) -> int:
+        """Process up to `batch_size` queued records, returns how many were consumed (0 when the batch failed)."""
+        payloads = await self.redis_client.lrange(REQUEST_LOG_QUEUE_KEY, 0, batch_size - 1)
+        if not payloads:
+            return 0
+        try:
+            records = [json.loads(payload) for payload in payloads]
+            await RequestMetricsService(self.db).apply_aggregates(aggregate_request_records(records))
+            error_groups = ErrorGroupService(self.db, self.redis_client)
+            sampled_fingerprints = await error_groups.apply_groups(group_failures(records))
+            # The rollup upserts opened the transaction, the COPY joins it so logs
+            # and rollups are committed together
+            await self.log_writer.write(
+                [
+                    (datetime.utcfromtimestamp(timestamp), method, route, status_code,
+                     latency_ms, request_bytes, response_bytes)
+                    for timestamp, method, route, status_code, latency_ms, request_bytes, response_bytes, *_ in records
+                ],
+                connection=await self.db.connection()
+            )
+            await self.db.commit()
+        except Exception as e:
+            await self._record_failure(REQUEST_LOG_QUEUE_KEY, payloads, e)
+            return 0
+        await self.redis_client.ltrim(REQUEST_LOG_QUEUE_KEY, len(payloads), -1)
+        await error_groups.mark_sampled(sampled_fingerprints)
+        await publish_live_updates(self.redis_client, [("request_counts", summarize_records(records))])
+        return len(payloads)
+
+    async def ingest_sketch_batch(self, batch_size: int) -> int:
+        """Merge up to `batch_size` queued worker sketches into the stored bucket sketches."""
+        payloads = await self.redis_client.lrange(LATENCY_SKETCH_QUEUE_KEY, 0, batch_size - 1)
+        if not payloads:
+            return 0
+        try:
+            decoded = []
+            for payload in payloads:
+                item = json.loads(payload)
+                item["sketch"] = DDSketch.from_bytes(base64.b64decode(item.pop("s")))
+                decoded.append(item)
+            await RequestMetricsService(self.db).apply_latency_sketches(aggregate_latency_sketches(decoded))
+            await self.db.commit()
+        except Exception as e:
+            await self._record_failure(LATENCY_SKETCH_QUEUE_KEY, payloads, e)
+            return 0
+        await self.redis_client.ltrim(LATENCY_SKETCH_QUEUE_KEY, len(payloads), -1)
+        return len(payloads)
+
+    async def ingest_pending(self, batch_size: int, max_batches: int, lock_timeout: float = 120) -> int:
+        """
+        Drain the queues batch by batch, bounded so one task run cannot starve
+        the worker. A failed batch consumes nothing and ends the drain of its
+        queue for this run; the next run retries it.
+        Runs under INGEST_LOCK_KEY, extended after every batch; a run that
+        finds it taken does nothing.
+        """
+        lock = RedisLock(self.redis_client, INGEST_LOCK_KEY, lock_timeout)
+        if not await lock.acquire():
+            print("RequestLogIngestService another ingest run is in progress, skipped")
+            return 0
+        total = 0
+        try:
+            for _ in range(max_batches):
+                consumed = await self.ingest_batch(batch_size)
+                total += consumed
+                if consumed < batch_size or not await lock.extend():
+                    break
+            for _ in range(max_batches):
+                if await self.ingest_sketch_batch(batch_size) < batch_size or not await lock.extend():
+                    break
+        finally:
+            await lock.release()
+        return total
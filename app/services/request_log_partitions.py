@@ -0,0 +1,147 @@
+from datetime import (
+    date, datetime, timedelta)
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.request_log import ApiRequestLogs
+
+
+PARENT_TABLE = ApiRequestLogs.__tablename__
+PARTITION_PREFIX = f"{PARENT_TABLE}_p"
+# Catches rows outside of every daily partition (late or clock-skewed records,
+# a maintenance run that did not happen) so the ingest COPY never fails on them
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+
+
+def partition_name(day: date) -> str:
+    return f"{PARTITION_PREFIX}{day:%Y%m%d}"
+
+
+def partition_day(name: str) -> date | None:
+    """Day covered by a partition, None for tables that do not follow the naming scheme."""
+    try:
+        return datetime.strptime(name[len(PARTITION_PREFIX):], "%Y%m%d").date()
+    except ValueError:
+        return None
+
+
+class RequestLogPartitionService:
+    """
+    Maintains the daily partitions of api_request_logs: creates partitions
+    ahead of time and drops whole partitions once they fall out of the
+    retention window, instead of running DELETEs on the log table.
+    Rows that landed in the DEFAULT partition are moved into their daily
+    partition when it is created.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_partitions(self) -> List[str]:
+        result = await self.db.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+                "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+                "WHERE parent.relname = :parent"
+            ),
+            {"parent": PARENT_TABLE}
+        )
+        return sorted(result.scalars().all())
+
+    async def _default_has_rows(self, start: date, end: date) -> bool:
+        result = await self.db.execute(
+            text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end)"),
+            {"start": start, "end": end}
+        )
+        return bool(result.scalar())
+
+    async def create_partition(self, day: date) -> None:
+        """
+        Create the partition of `day`. Postgres refuses a new partition while
+        the DEFAULT partition holds rows of its range, so those rows are moved
+        into a standalone table first, which is then attached.
+        """
+        name = partition_name(day)
+        start, end = day.isoformat(), (day + timedelta(days=1)).isoformat()
+        if not await self._default_has_rows(day, day + timedelta(days=1)):
+            await self.db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+                f"FOR VALUES FROM ('{start}') TO ('{end}')"
+            ))
+            return
+        await self.db.execute(text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS)"))
+        await self.db.execute(text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            f"WHERE created_at >= '{start}' AND created_at < '{end}' RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ))
+        await self.db.execute(text(
+            f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')"
+        ))
+
+    async def create_partitions(self, start: date, days: int) -> List[str]:
+        """Create the partitions for `days` days from `start` if they do not exist yet."""
+        existing = set(await self.list_partitions())
+        created = []
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            name = partition_name(day)
+            if name in existing:
+                continue
+            await self.create_partition(day)
+            created.append(name)
+        await self.db.commit()
+        return created
+
+    async def create_partitions_for_default_rows(self, start: date, end: date) -> List[str]:
+        """
+        Create the partitions of the days in [start, end) found in the DEFAULT
+        partition, moving their rows out of it. Days outside of the range (far
+        off clocks) stay in the DEFAULT partition instead of adding a table each.
+        """
+        result = await self.db.execute(
+            text(
+                f"SELECT DISTINCT date_trunc('day', created_at)::date FROM {DEFAULT_PARTITION} "
+                "WHERE created_at >= :start AND created_at < :end"
+            ),
+            {"start": start, "end": end}
+        )
+        existing = set(await self.list_partitions())
+        created = []
+        for day in sorted(result.scalars().all()):
+            name = partition_name(day)
+            if name in existing:
+                continue
+            await self.create_partition(day)
+            created.append(name)
+        await self.db.commit()
+        return created
+
+    async def drop_expired_partitions(self, retention_days: int, today: date | None = None) -> List[str]:
+        """Drop every partition whose whole day is older than the retention window."""
+        cutoff = (today or datetime.utcnow().date()) - timedelta(days=retention_days)
+        dropped = []
+        for name in await self.list_partitions():
+            day = partition_day(name)
+            if day is not None and day < cutoff:
+                await self.db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                dropped.append(name)
+        # Rows of days without a partition expire with the same window
+        await self.db.execute(
+            text(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < :cutoff"),
+            {"cutoff": cutoff}
+        )
+        await self.db.commit()
+        return dropped
+
+    async def run_maintenance(self, days_ahead: int, retention_days: int) -> dict:
+        today = datetime.utcnow().date()
+        created = await self.create_partitions(today, days_ahead + 1)
+        dropped = await self.drop_expired_partitions(retention_days, today)
+        # Late rows of past days within the retention window get their own partition back
+        created += await self.create_partitions_for_default_rows(
+            today - timedelta(days=retention_days), today + timedelta(days=days_ahead + 1))
+        return {"created": created, "dropped": dropped}
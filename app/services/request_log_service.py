@@ -0,0 +1,86 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import (
+    AsyncIterator, Optional)
+
+from sqlalchemy import select
+
+from app.db.models.request_log import ApiRequestLogs
+from app.db.session import ReadSessionLocal
+from app.utils.datetime_utils import convert_datetime_utc_to_timezone_str
+
+
+# Rows fetched per round trip from the server side cursor
+EXPORT_FETCH_SIZE = 5000
+EXPORT_COLUMNS = (
+    "created_at", "method", "route", "status_code",
+    "latency_ms", "request_bytes", "response_bytes",
+)
+
+
+class RequestLogService:
+    """Service class for the detailed request logs (api_request_logs)."""
+
+    @staticmethod
+    def build_query(
+        start: datetime,
+        end: datetime,
+        route: Optional[str],
+        status_code: Optional[int]
+    ):
+        # The created_at range lets the planner prune to the partitions of the window
+        query = select(
+            ApiRequestLogs.created_at, ApiRequestLogs.method, ApiRequestLogs.route,
+            ApiRequestLogs.status_code, ApiRequestLogs.latency_ms,
+            ApiRequestLogs.request_bytes, ApiRequestLogs.response_bytes
+            ).where(
+                ApiRequestLogs.created_at >= start,
+                ApiRequestLogs.created_at < end
+            )
+        if route:
+            query = query.where(ApiRequestLogs.route == route)
+        if status_code:
+            query = query.where(ApiRequestLogs.status_code == status_code)
+        return query.order_by(ApiRequestLogs.created_at)
+
+    async def export_logs(
+        self,
+        timezone: str,
+        export_format: str,
+        start: datetime,
+        end: datetime,
+        route: Optional[str] = None,
+        status_code: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield the matching logs as NDJSON lines or CSV rows, one chunk per
+        cursor fetch.
+        Rows are read through a server side cursor so memory stays constant
+        however large the export is. The generator opens its own session
+        because it keeps running after the endpoint has returned.
+        """
+        query = self.build_query(start, end, route, status_code).execution_options(yield_per=EXPORT_FETCH_SIZE)
+        if export_format == "csv":
+            yield (",".join(EXPORT_COLUMNS) + "\r\n").encode()
+        async with ReadSessionLocal() as session:
+            result = await session.stream(query)
+            async for rows in result.partitions():
+                buffer = io.StringIO()
+                if export_format == "csv":
+                    writer = csv.writer(buffer)
+                    for row in rows:
+                        writer.writerow((
+                            convert_datetime_utc_to_timezone_str(row.created_at, timezone), row.method,
+                            row.route, row.status_code, round(row.latency_ms, 3),
+                            row.request_bytes, row.response_bytes,
+                        ))
+                else:
+                    for row in rows:
+                        data = row._asdict()
+                        data["created_at"] = convert_datetime_utc_to_timezone_str(row.created_at, timezone)
+                        data["latency_ms"] = round(row.latency_ms, 3)
+                        buffer.write(json.dumps(data, separators=(",", ":")))
+                        buffer.write("\n")
+                yield buffer.getvalue().encode()
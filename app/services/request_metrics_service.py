@@ -0,0 +1,356 @@
+import time
+from datetime import (
+    UTC, datetime, timedelta)
+from typing import (
+    Dict, Iterable, List, Optional, Tuple)
+
+from sqlalchemy import (
+    func, select, true, tuple_, union_all)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.request_rollup import ROLLUP_RESOLUTIONS
+from app.utils.datetime_utils import convert_datetime_utc_to_timezone_str
+from app.utils.ddsketch import DDSketch
+
+
+# Rows per INSERT ... ON CONFLICT statement, keeps bind parameters below asyncpg's limit
+UPSERT_CHUNK_SIZE = 2000
+
+# (resolution, bucket_start, route, method)
+RollupKey = Tuple[str, datetime, str, str]
+
+LATENCY_QUANTILES = {"p50": 0.5, "p95": 0.95, "p99": 0.99}
+# Upper edges (ms) of the latency heatmap rows, the last row is open ended
+LATENCY_HEATMAP_BANDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def bucket_start_for(timestamp: float, width_in_seconds: int) -> datetime:
+    """Naive UTC start of the bucket the epoch timestamp falls into."""
+    return datetime.fromtimestamp(timestamp - timestamp % width_in_seconds, UTC).replace(tzinfo=None)
+
+
+def rollup_resolution_for_window(hours: int) -> str:
+    """Pick the coarsest resolution that still gives a useful number of points."""
+    if hours <= 3:
+        return "1m"
+    if hours <= 24 * 14:
+        return "1h"
+    return "1d"
+
+
+def window_tiles(hours: int) -> List[Tuple[str, datetime, Optional[datetime]]]:
+    """
+    (resolution, start, end) ranges covering the window of `hours` hours
+    with as few rollup rows as possible, for reads without a time axis:
+    whole buckets of the next coarser resolution in the middle, the
+    window's own resolution only at the ragged edges.
+    """
+    resolution = rollup_resolution_for_window(hours)
+    width = ROLLUP_RESOLUTIONS[resolution][1]
+    now = time.time()
+    since = bucket_start_for(now, width) - timedelta(hours=hours)
+    coarser = [(name, coarse_width) for name, (_, coarse_width) in ROLLUP_RESOLUTIONS.items() if coarse_width > width]
+    if not coarser:
+        return [(resolution, since, None)]
+    coarse, coarse_width = min(coarser, key=lambda item: item[1])
+    since_epoch = since.replace(tzinfo=UTC).timestamp()
+    first = bucket_start_for(since_epoch + coarse_width - 1, coarse_width)
+    last = bucket_start_for(now, coarse_width)
+    if first >= last:
+        return [(resolution, since, None)]
+    return [(resolution, since, first), (coarse, first, last), (resolution, last, None)]
+
+
+def aggregate_latency_sketches(payloads: Iterable[dict]) -> Dict[RollupKey, DDSketch]:
+    """
+    Merge the per worker minute sketches into one sketch per bucket for
+    every rollup resolution.
+    Payload layout: {"b": minute epoch, "r": route, "m": method, "sketch": DDSketch}
+    """
+    merged: Dict[RollupKey, DDSketch] = {}
+    for payload in payloads:
+        for resolution, (_, width) in ROLLUP_RESOLUTIONS.items():
+            key = (resolution, bucket_start_for(payload["b"], width), payload["r"], payload["m"])
+            sketch = merged.get(key)
+            if sketch is None:
+                merged[key] = sketch = DDSketch(payload["sketch"].relative_accuracy)
+            sketch.merge(payload["sketch"])
+    return merged
+
+
+def summarize_sketch(sketch: DDSketch) -> dict:
+    summary = {
+        "request_count": sketch.count,
+        "avg_latency_ms": _round(sketch.average),
+        "max_latency_ms": _round(sketch.max if sketch.count else None),
+    }
+    for label, q in LATENCY_QUANTILES.items():
+        summary[f"{label}_ms"] = _round(sketch.quantile(q))
+    return summary
+
+
+def aggregate_request_records(records: Iterable[list]) -> Dict[RollupKey, list]:
+    """
+    Fold captured request records into per bucket counters for every
+    rollup resolution.
+    Counter layout: [requests, 4xx, 5xx, latency sum, latency max, request bytes, response bytes]
+    """
+    aggregates: Dict[RollupKey, list] = {}
+    for timestamp, method, route, status_code, latency_ms, request_bytes, response_bytes, *_ in records:
+        for resolution, (_, width) in ROLLUP_RESOLUTIONS.items():
+            key = (resolution, bucket_start_for(timestamp, width), route, method)
+            counters = aggregates.get(key)
+            if counters is None:
+                counters = aggregates[key] = [0, 0, 0, 0.0, 0.0, 0, 0]
+            counters[0] += 1
+            if 400 <= status_code < 500:
+                counters[1] += 1
+            elif status_code >= 500:
+                counters[2] += 1
+            counters[3] += latency_ms
+            if latency_ms > counters[4]:
+                counters[4] = latency_ms
+            counters[5] += request_bytes
+            counters[6] += response_bytes
+    return aggregates
+
+
+class RequestMetricsService:
+    """Service class for the pre-aggregated request metrics."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def apply_aggregates(self, aggregates: Dict[RollupKey, list]) -> None:
+        """Add the aggregated deltas to the rollup tables (caller commits)."""
+        rows_by_resolution: Dict[str, List[dict]] = {resolution: [] for resolution in ROLLUP_RESOLUTIONS}
+        for (resolution, bucket_start, route, method), counters in aggregates.items():
+            rows_by_resolution[resolution].append({
+                "bucket_start": bucket_start,
+                "route": route,
+                "method": method,
+                "request_count": counters[0],
+                "client_error_count": counters[1],
+                "server_error_count": counters[2],
+                "latency_sum_ms": counters[3],
+                "latency_max_ms": counters[4],
+                "request_bytes": counters[5],
+                "response_bytes": counters[6],
+            })
+        for resolution, rows in rows_by_resolution.items():
+            model = ROLLUP_RESOLUTIONS[resolution][0]
+            for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+                stmt = insert(model).values(rows[start:start + UPSERT_CHUNK_SIZE])
+                excluded = stmt.excluded
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[model.bucket_start, model.route, model.method],
+                    set_={
+                        "request_count": model.request_count + excluded.request_count,
+                        "client_error_count": model.client_error_count + excluded.client_error_count,
+                        "server_error_count": model.server_error_count + excluded.server_error_count,
+                        "latency_sum_ms": model.latency_sum_ms + excluded.latency_sum_ms,
+                        "latency_max_ms": func.greatest(model.latency_max_ms, excluded.latency_max_ms),
+                        "request_bytes": model.request_bytes + excluded.request_bytes,
+                        "response_bytes": model.response_bytes + excluded.response_bytes,
+                    }
+                )
+                await self.db.execute(stmt)
+
+    async def apply_latency_sketches(self, sketches: Dict[RollupKey, DDSketch]) -> None:
+        """
+        Merge incoming sketches into the stored ones (caller commits).
+        The stored rows are locked while merging so concurrent ingest runs
+        cannot lose each other's updates.
+        """
+        keys_by_resolution: Dict[str, List[Tuple[datetime, str, str]]] = {resolution: [] for resolution in ROLLUP_RESOLUTIONS}
+        for resolution, bucket_start, route, method in sketches:
+            keys_by_resolution[resolution].append((bucket_start, route, method))
+        for resolution, keys in keys_by_resolution.items():
+            model = ROLLUP_RESOLUTIONS[resolution][0]
+            for start in range(0, len(keys), UPSERT_CHUNK_SIZE):
+                chunk = keys[start:start + UPSERT_CHUNK_SIZE]
+                existing = await self.db.execute(
+                    select(
+                        model.bucket_start, model.route, model.method, model.latency_sketch
+                    ).where(
+                        tuple_(model.bucket_start, model.route, model.method).in_(chunk)
+                    ).with_for_update()
+                )
+                for row in existing:
+                    if row.latency_sketch:
+                        sketches[(resolution, row.bucket_start, row.route, row.method)].merge(
+                            DDSketch.from_bytes(row.latency_sketch))
+                rows = [
+                    {
+                        "bucket_start": bucket_start,
+                        "route": route,
+                        "method": method,
+                        "request_count": 0,
+                        "client_error_count": 0,
+                        "server_error_count": 0,
+                        "latency_sum_ms": 0,
+                        "latency_max_ms": 0,
+                        "request_bytes": 0,
+                        "response_bytes": 0,
+                        "latency_sketch": sketches[(resolution, bucket_start, route, method)].to_bytes(),
+                        "latency_band_counts": sketches[(resolution, bucket_start, route, method)].band_counts(
+                            LATENCY_HEATMAP_BANDS_MS),
+                    }
+                    for bucket_start, route, method in chunk
+                ]
+                stmt = insert(model).values(rows)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[model.bucket_start, model.route, model.method],
+                    set_={
+                        "latency_sketch": stmt.excluded.latency_sketch,
+                        "latency_band_counts": stmt.excluded.latency_band_counts,
+                    }
+                )
+                await self.db.execute(stmt)
+
+    async def _load_sketches(self, hours: int, route: Optional[str]):
+        """Sketches of the window from the coarsest rollups covering it (see window_tiles)."""
+        queries = []
+        for resolution, start, end in window_tiles(hours):
+            model = ROLLUP_RESOLUTIONS[resolution][0]
+            query = select(model.route, model.method, model.latency_sketch).where(
+                model.bucket_start >= start,
+                model.latency_sketch.is_not(None)
+            )
+            if end is not None:
+                query = query.where(model.bucket_start < end)
+            if route:
+                query = query.where(model.route == route)
+            queries.append(query)
+        query = queries[0] if len(queries) == 1 else union_all(*queries)
+        return (await self.db.execute(query)).all()
+
+    async def get_latency_percentiles(self, hours: int, route: Optional[str]) -> dict:
+        """p50/p95/p99 over the window, overall and per route, from merged sketches."""
+        rows = await self._load_sketches(hours, route)
+        overall = DDSketch()
+        per_route: Dict[Tuple[str, str], DDSketch] = {}
+        for row in rows:
+            sketch = DDSketch.from_bytes(row.latency_sketch)
+            overall.merge(sketch)
+            route_sketch = per_route.get((row.route, row.method))
+            if route_sketch is None:
+                per_route[(row.route, row.method)] = route_sketch = DDSketch(sketch.relative_accuracy)
+            route_sketch.merge(sketch)
+        routes = [
+            {"route": route_path, "method": method, **summarize_sketch(sketch)}
+            for (route_path, method), sketch in per_route.items()
+        ]
+        routes.sort(key=lambda item: item["p95_ms"] or 0, reverse=True)
+        return {**summarize_sketch(overall), "routes": routes}
+
+    async def get_latency_heatmap(self, timezone: str, hours: int, route: Optional[str]) -> dict:
+        """
+        Request counts per (bucket, latency band), summed in SQL from the
+        band counts stored next to each sketch.
+        """
+        resolution = rollup_resolution_for_window(hours)
+        model, width = ROLLUP_RESOLUTIONS[resolution]
+        since = bucket_start_for(time.time(), width) - timedelta(hours=hours)
+        bands = func.unnest(model.latency_band_counts).table_valued(
+            "band_count", with_ordinality="band").render_derived(name="bands").lateral()
+        query = select(
+            model.bucket_start, bands.c.band, func.sum(bands.c.band_count).label("count")
+            ).select_from(model).join(bands, true()).where(model.bucket_start >= since)
+        if route:
+            query = query.where(model.route == route)
+        query = query.group_by(model.bucket_start, bands.c.band)
+        band_count = len(LATENCY_HEATMAP_BANDS_MS) + 1
+        columns: Dict[datetime, List[int]] = {}
+        for row in await self.db.execute(query):
+            counts = columns.get(row.bucket_start)
+            if counts is None:
+                counts = columns[row.bucket_start] = [0] * band_count
+            # WITH ORDINALITY counts from 1
+            counts[row.band - 1] = int(row.count)
+        return {
+            "resolution": resolution,
+            "bands_ms": list(LATENCY_HEATMAP_BANDS_MS),
+            "buckets": [
+                {
+                    "bucket_start": convert_datetime_utc_to_timezone_str(bucket_start, timezone),
+                    "counts": columns[bucket_start],
+                }
+                for bucket_start in sorted(columns)
+            ]
+        }
+
+    async def get_request_traffic(self, timezone: str, hours: int, route: Optional[str]) -> dict:
+        """Request, error and latency totals per bucket for the last `hours` hours."""
+        resolution = rollup_resolution_for_window(hours)
+        model, width = ROLLUP_RESOLUTIONS[resolution]
+        since = bucket_start_for(time.time(), width) - timedelta(hours=hours)
+        query = select(
+            model.bucket_start,
+            func.sum(model.request_count).label("request_count"),
+            func.sum(model.client_error_count + model.server_error_count).label("error_count"),
+            func.sum(model.latency_sum_ms).label("latency_sum_ms"),
+            ).where(model.bucket_start >= since)
+        if route:
+            query = query.where(model.route == route)
+        query = query.group_by(model.bucket_start).order_by(model.bucket_start)
+        result = (await self.db.execute(query)).all()
+        return {
+            "resolution": resolution,
+            "buckets": [
+                {
+                    "bucket_start": convert_datetime_utc_to_timezone_str(row.bucket_start, timezone),
+                    "request_count": row.request_count,
+                    "error_count": row.error_count,
+                    "avg_latency_ms": round(row.latency_sum_ms / row.request_count, 2) if row.request_count else 0,
+                }
+                for row in result
+            ]
+        }
+
+    async def get_error_rate(self, hours: int) -> dict:
+        """Totals and error rate for the last `hours` hours, overall and per route."""
+        resolution = rollup_resolution_for_window(hours)
+        model, width = ROLLUP_RESOLUTIONS[resolution]
+        since = bucket_start_for(time.time(), width) - timedelta(hours=hours)
+        result = (await self.db.execute(
+            select(
+                model.route,
+                model.method,
+                func.sum(model.request_count).label("request_count"),
+                func.sum(model.client_error_count).label("client_error_count"),
+                func.sum(model.server_error_count).label("server_error_count"),
+            ).where(
+                model.bucket_start >= since
+            ).group_by(model.route, model.method)
+        )).all()
+        routes = []
+        total_requests = total_client_errors = total_server_errors = 0
+        for row in result:
+            total_requests += row.request_count
+            total_client_errors += row.client_error_count
+            total_server_errors += row.server_error_count
+            routes.append({
+                "route": row.route,
+                "method": row.method,
+                "request_count": row.request_count,
+                "error_count": row.client_error_count + row.server_error_count,
+                "error_rate": _rate(row.client_error_count + row.server_error_count, row.request_count),
+            })
+        routes.sort(key=lambda item: item["error_rate"], reverse=True)
+        return {
+            "total_requests": total_requests,
+            "client_error_count": total_client_errors,
+            "server_error_count": total_server_errors,
+            "error_rate": _rate(total_client_errors + total_server_errors, total_requests),
+            "routes": routes,
+        }
+
+
+def _rate(errors: int, total: int) -> float:
+    return round(errors * 100 / total, 2) if total else 0.0
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
@@ -0,0 +1,252 @@
+from datetime import (
+    datetime, timedelta)
+from typing import (
+    Dict, List, Optional, Tuple)
+from uuid import UUID
+
+import redis.asyncio as redis
+from sqlalchemy import (
+    bindparam, func, or_, select, update)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import NotFoundException
+from app.core.live_updates import publish_live_updates
+from app.db.models.monitored_endpoint import (
+    EndpointStateIntervals, MonitoredEndpoints, MonitoredEndpointStatus)
+from app.services.request_metrics_service import UPSERT_CHUNK_SIZE
+from app.services.uptime_prober import (
+    PROBE_DEGRADED, PROBE_DOWN, PROBE_UP, ProbeResult, ProbeTarget)
+from app.utils.datetime_utils import convert_datetime_utc_to_timezone_str
+
+
+# A silence longer than this many probe intervals means the prober was not
+# running; the open interval is closed instead of being stretched over it.
+PROBE_GAP_INTERVALS = 3
+
+# endpoint id -> (state of the open interval, last checked at, probe interval seconds)
+OpenState = Dict[UUID, Tuple[Optional[str], Optional[datetime], float]]
+
+
+def fold_probe_results(
+    results: List[ProbeResult],
+    open_states: OpenState
+) -> Tuple[Dict[UUID, datetime], List[dict]]:
+    """
+    Run-length encode a batch of probe results against the open interval of
+    every endpoint. Probes repeating the open state cost nothing; a state
+    change closes the open interval and starts a new one.
+    Returns the ended_at of the stored open intervals to close and the new
+    interval rows (the last one per endpoint left open).
+    """
+    closes: Dict[UUID, datetime] = {}
+    new_intervals: List[dict] = []
+    open_rows: Dict[UUID, dict] = {}
+    for endpoint_id, checked_at, state, _, _, _ in sorted(results, key=lambda result: (result[0], result[1])):
+        open_state, last_checked_at, interval_seconds = open_states.get(endpoint_id, (None, None, 0))
+        ended_at = None
+        if open_state is not None and last_checked_at is not None and \
+                checked_at - last_checked_at > timedelta(seconds=interval_seconds * PROBE_GAP_INTERVALS):
+            ended_at = last_checked_at + timedelta(seconds=interval_seconds)
+        elif open_state is not None and state != open_state:
+            ended_at = checked_at
+        if ended_at is not None:
+            if endpoint_id in open_rows:
+                open_rows.pop(endpoint_id)["ended_at"] = ended_at
+            else:
+                closes[endpoint_id] = ended_at
+            open_state = None
+        if open_state is None:
+            row = {"endpoint_id": endpoint_id, "state": state, "started_at": checked_at, "ended_at": None}
+            new_intervals.append(row)
+            open_rows[endpoint_id] = row
+            open_state = state
+        open_states[endpoint_id] = (open_state, checked_at, interval_seconds)
+    return closes, new_intervals
+
+
+class UptimeService:
+    """Service class for the monitored endpoints and their uptime history."""
+
+    def __init__(self, db: AsyncSession, redis_client: Optional[redis.Redis] = None):
+        self.db = db
+        # When set, state changes are pushed to the live dashboards
+        self.redis_client = redis_client
+
+    async def get_probe_targets(self) -> List[ProbeTarget]:
+        result = await self.db.execute(
+            select(MonitoredEndpoints).where(MonitoredEndpoints.is_active == True))
+        return [ProbeTarget.from_model(endpoint) for endpoint in result.scalars()]
+
+    async def create_monitored_endpoint(self, payload) -> MonitoredEndpoints:
+        endpoint = MonitoredEndpoints(**payload.model_dump())
+        self.db.add(endpoint)
+        await self.db.commit()
+        await self.db.refresh(endpoint)
+        return endpoint
+
+    async def _load_open_states(self, endpoint_ids: List[UUID]) -> OpenState:
+        result = await self.db.execute(
+            select(
+                MonitoredEndpoints.id, MonitoredEndpoints.interval_seconds,
+                MonitoredEndpointStatus.checked_at, EndpointStateIntervals.state
+                ).outerjoin(
+                    MonitoredEndpointStatus, MonitoredEndpointStatus.endpoint_id == MonitoredEndpoints.id
+                ).outerjoin(
+                    EndpointStateIntervals,
+                    (EndpointStateIntervals.endpoint_id == MonitoredEndpoints.id) & EndpointStateIntervals.ended_at.is_(None)
+                ).where(MonitoredEndpoints.id.in_(endpoint_ids))
+        )
+        return {row.id: (row.state, row.checked_at, row.interval_seconds) for row in result}
+
+    async def record_probe_results(self, results: List[ProbeResult]) -> None:
+        """
+        Store a batch of probe results: state changes become interval rows,
+        everything else only moves the latest status of the endpoint.
+        A stable endpoint therefore costs one row per outage, not one per probe.
+        """
+        if not results:
+            return
+        open_states = await self._load_open_states(list({result[0] for result in results}))
+        # Results of endpoints deleted since they were probed are ignored
+        results = [result for result in results if result[0] in open_states]
+        closes, new_intervals = fold_probe_results(results, open_states)
+
+        if closes:
+            table = EndpointStateIntervals.__table__
+            await self.db.execute(
+                update(table).where(
+                    table.c.endpoint_id == bindparam("b_endpoint_id"),
+                    table.c.ended_at.is_(None)
+                ).values(ended_at=bindparam("b_ended_at")),
+                [{"b_endpoint_id": endpoint_id, "b_ended_at": ended_at} for endpoint_id, ended_at in closes.items()]
+            )
+        for start in range(0, len(new_intervals), UPSERT_CHUNK_SIZE):
+            await self.db.execute(insert(EndpointStateIntervals).values(new_intervals[start:start + UPSERT_CHUNK_SIZE]))
+
+        latest: Dict[UUID, ProbeResult] = {}
+        for result in results:
+            current = latest.get(result[0])
+            if current is None or result[1] >= current[1]:
+                latest[result[0]] = result
+        rows = [
+            {
+                "endpoint_id": endpoint_id,
+                "checked_at": checked_at,
+                "state": state,
+                "status_code": status_code,
+                "latency_ms": latency_ms,
+                "error": error,
+            }
+            for endpoint_id, checked_at, state, status_code, latency_ms, error in latest.values()
+        ]
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            stmt = insert(MonitoredEndpointStatus).values(rows[start:start + UPSERT_CHUNK_SIZE])
+            excluded = stmt.excluded
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[MonitoredEndpointStatus.endpoint_id],
+                set_={
+                    "checked_at": excluded.checked_at,
+                    "state": excluded.state,
+                    "status_code": excluded.status_code,
+                    "latency_ms": excluded.latency_ms,
+                    "error": excluded.error,
+                },
+                # Batches are flushed in order, but never let an older result win
+                where=MonitoredEndpointStatus.checked_at <= excluded.checked_at
+            )
+            await self.db.execute(stmt)
+        await self.db.commit()
+        if self.redis_client is not None:
+            await publish_live_updates(self.redis_client, [
+                ("uptime", {"endpoint_id": row["endpoint_id"], "state": row["state"], "since": row["started_at"].isoformat()})
+                for row in new_intervals
+            ])
+
+    @staticmethod
+    def _clipped_bounds(start: datetime, end: datetime):
+        """Interval bounds clipped to the window; open intervals end at the latest probe."""
+        clipped_start = func.greatest(EndpointStateIntervals.started_at, start)
+        clipped_end = func.least(
+            func.coalesce(EndpointStateIntervals.ended_at, MonitoredEndpointStatus.checked_at), end)
+        return clipped_start, clipped_end
+
+    @staticmethod
+    def _overlapping(query, start: datetime, end: datetime):
+        return query.join(
+            MonitoredEndpointStatus, MonitoredEndpointStatus.endpoint_id == EndpointStateIntervals.endpoint_id
+            ).where(
+                EndpointStateIntervals.started_at < end,
+                or_(EndpointStateIntervals.ended_at.is_(None), EndpointStateIntervals.ended_at > start)
+            )
+
+    async def get_uptime(self, timezone: str, start: datetime, end: datetime) -> List[dict]:
+        """
+        Uptime of every active endpoint over [start, end) computed from the
+        overlapping intervals only, so a 90 day window reads a handful of
+        rows per endpoint. Degraded time counts as available; time without
+        probes is left out of the monitored time.
+        """
+        clipped_start, clipped_end = self._clipped_bounds(start, end)
+        duration = func.greatest(func.extract("epoch", clipped_end - clipped_start), 0)
+        result = await self.db.execute(
+            self._overlapping(
+                select(
+                    EndpointStateIntervals.endpoint_id, EndpointStateIntervals.state,
+                    func.sum(duration).label("seconds")),
+                start, end
+            ).group_by(EndpointStateIntervals.endpoint_id, EndpointStateIntervals.state)
+        )
+        seconds_by_endpoint: Dict[UUID, Dict[str, float]] = {}
+        for row in result:
+            seconds_by_endpoint.setdefault(row.endpoint_id, {})[row.state] = float(row.seconds or 0)
+
+        endpoints = await self.db.execute(
+            select(
+                MonitoredEndpoints.id, MonitoredEndpoints.name, MonitoredEndpoints.url,
+                MonitoredEndpointStatus.state, MonitoredEndpointStatus.checked_at
+                ).outerjoin(
+                    MonitoredEndpointStatus, MonitoredEndpointStatus.endpoint_id == MonitoredEndpoints.id
+                ).where(MonitoredEndpoints.is_active == True).order_by(MonitoredEndpoints.name)
+        )
+        data = []
+        for row in endpoints:
+            seconds = seconds_by_endpoint.get(row.id, {})
+            up, degraded, down = (seconds.get(state, 0.0) for state in (PROBE_UP, PROBE_DEGRADED, PROBE_DOWN))
+            monitored = up + degraded + down
+            data.append({
+                "id": row.id,
+                "name": row.name,
+                "url": row.url,
+                "state": row.state,
+                "last_checked_at": convert_datetime_utc_to_timezone_str(row.checked_at, timezone) if row.checked_at else None,
+                "uptime_percentage": round((up + degraded) * 100 / monitored, 3) if monitored else None,
+                "up_seconds": round(up),
+                "degraded_seconds": round(degraded),
+                "down_seconds": round(down),
+                "monitored_seconds": round(monitored),
+            })
+        return data
+
+    async def get_state_intervals(self, endpoint_id: UUID, timezone: str, start: datetime, end: datetime) -> List[dict]:
+        """State intervals of one endpoint clipped to the window, oldest first."""
+        if await self.db.get(MonitoredEndpoints, endpoint_id) is None:
+            raise NotFoundException("Monitored endpoint not found")
+        clipped_start, clipped_end = self._clipped_bounds(start, end)
+        result = await self.db.execute(
+            self._overlapping(
+                select(
+                    EndpointStateIntervals.state, EndpointStateIntervals.ended_at,
+                    clipped_start.label("started_at"), clipped_end.label("clipped_end")),
+                start, end
+            ).where(EndpointStateIntervals.endpoint_id == endpoint_id).order_by(EndpointStateIntervals.started_at)
+        )
+        return [
+            {
+                "state": row.state,
+                "started_at": convert_datetime_utc_to_timezone_str(row.started_at, timezone),
+                "ended_at": convert_datetime_utc_to_timezone_str(row.clipped_end, timezone) if row.ended_at else None,
+                "duration_seconds": max(round((row.clipped_end - row.started_at).total_seconds()), 0),
+            }
+            for row in result
+        ]
@@ -0,0 +1,41 @@
+from sqlalchemy import (
+    func, literal_column, or_)
+
+from app.db.models import Users
+
+
+# Must stay identical to the expression of the ix_users_full_name_trgm index,
+# the separator is a literal so the planner can match the index expression.
+USER_FULL_NAME = Users.first_name + literal_column("' '") + Users.last_name
+
+
+def escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class UserSearch:
+    """
+    pg_trgm backed user search over the full name and the email prefix.
+    Every predicate is served by the trigram GIN indexes (substring ILIKE,
+    fuzzy `%` similarity and prefix LIKE), and results are ranked by
+    trigram similarity so the closest matches come first.
+    """
+
+    def __init__(self, term: str):
+        self.term = term.strip().lower()
+
+    def condition(self):
+        pattern = escape_like(self.term)
+        if "@" in self.term:
+            return Users.email.like(f"{pattern}%", escape="\\")
+        return or_(
+            USER_FULL_NAME.ilike(f"%{pattern}%", escape="\\"),
+            USER_FULL_NAME.op("%")(self.term),
+            Users.email.like(f"{pattern}%", escape="\\")
+        )
+
+    def rank(self):
+        return func.greatest(
+            func.similarity(USER_FULL_NAME, self.term),
+            func.similarity(Users.email, self.term)
+        ).label("search_rank")
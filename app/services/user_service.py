@@ -1,24 +1,89 @@
 from datetime import datetime
 from typing import (Optional)
+from uuid import UUID
 
 import redis
 from sqlalchemy import (
-    or_, select, update, func, exists, and_, case)
+    select, update, func, exists, and_, case, lambda_stmt, literal_column, tuple_)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
+from app.core.cache import response_cache
 from app.core.exceptions import (
     BadRequestException,
     NotFoundException
     )
-from app.core.security import (
-    get_password_hash, verify_password, 
-    create_access_token)
+from app.core.password_hasher import password_hasher
+from app.core.session_store import store_session_token
+from app.core.security import create_access_token
 from app.db.models import Users
 from app.schemas.user import (UserCreate)
 from app.core.config import settings
-from app.core.templates import templates
-from app.services.email_send import BrevoEmailSending 
+from app.core.templates import get_templates
+from app.services.email_outbox import EmailOutboxService
+from app.services.user_search import UserSearch
 from app.utils.datetime_utils import response_data_date_conversion
+from app.utils.pagination import (
+    decode_cursor, keyset_page)
+
+
+USER_CURSOR_CONVERTERS = (datetime.fromisoformat, UUID)
+USER_COUNTS_CACHE_KEY = "users:dashboard_counts"
+INVITATION_EMAIL_SUBJECT = "API Monitoring Application Invitation"
+USER_DETAIL_COLUMNS = (
+    Users.id, Users.first_name, Users.last_name,
+    Users.role_id,
+    Users.registered_at, Users.updated_at, Users.created_at,
+    Users.email, Users.is_active
+    )
+USER_LIST_COLUMNS = (
+    Users.id, Users.first_name, Users.last_name, Users.role_id,
+    Users.is_active, Users.registered_at, Users.email,
+    Users.created_at, Users.invited_at, Users.updated_at
+    )
+
+
+def user_page_statement(
+    with_total: bool,
+    is_active: Optional[bool],
+    cursor_values: Optional[tuple],
+    offset: int,
+    per_page: int
+) -> StatementLambdaElement:
+    """
+    Users list page without a search, ordered by (updated_at, id) like
+    apply_keyset, whose keyset rules it must stay in step with. One lambda
+    per part, so each combination of total, is_active filter and
+    cursor/offset is built and keyed once and only the values change
+    between calls.
+    """
+    if with_total:
+        stmt = lambda_stmt(lambda: select(*USER_LIST_COLUMNS, func.count().over().label("total_count")))
+    else:
+        stmt = lambda_stmt(lambda: select(*USER_LIST_COLUMNS))
+    if is_active is not None:
+        stmt += lambda s: s.where(Users.is_active == is_active)
+    if cursor_values is not None:
+        updated_at, user_id = cursor_values
+        stmt += lambda s: s.where(tuple_(Users.updated_at, Users.id) < tuple_(updated_at, user_id))
+    # One extra row tells whether there is a next page (keyset_page)
+    limit = per_page + 1
+    stmt += lambda s: s.order_by(Users.updated_at.desc(), Users.id.desc()).limit(limit)
+    if cursor_values is None:
+        stmt += lambda s: s.offset(offset)
+    return stmt
+
+
+def create_invitation(user_id, email: str, first_name: str, last_name: str) -> tuple:
+    """Invitation token of a new user and the html of its invitation email."""
+    access_token = create_access_token("invitation", {"id": str(user_id), "email": email}, settings.INVITATION_TOKEN_EXPIRY)
+    html_content = get_templates().get_template("user_invitation.html").render({
+        "first_name": first_name,
+        "registration_url": f"{settings.FRONT_END_REGISTRATION_URL}/{access_token}?first_name={first_name}&last_name={last_name}"
+        })
+    return access_token, html_content
+
+
 class UserService:
     """Service class for user-related database operations."""
     
@@ -38,43 +103,34 @@ class UserService:
             invited_at=datetime.utcnow()
         )
         self.db.add(user)
+        # Assigns the id the token needs; the user and the email commit together
+        await self.db.flush()
+        access_token, html_content = create_invitation(user.id, data.email, data.first_name, data.last_name)
+        await store_session_token(redis_client, user.id, "invitation", access_token, settings.INVITATION_TOKEN_EXPIRY)
+        await EmailOutboxService(self.db).enqueue(
+            f"invitation:{user.id}", [user.email], INVITATION_EMAIL_SUBJECT, html_content)
         await self.db.commit()
-        await self.db.refresh(user)
-        access_token = create_access_token("invitation", {"id": str(user.id), "email": data.email}, settings.INVITATION_TOKEN_EXPIRY)
-        await redis_client.setex(f"{user.id}_invitation", settings.INVITATION_TOKEN_EXPIRY, access_token)    
-        html_content = templates.get_template("user_invitation.html").render({
-            "first_name": data.first_name,
-            "registration_url": f"{settings.FRONT_END_REGISTRATION_URL}/{access_token}?first_name={data.first_name}&last_name={data.last_name}"
-            })
-        
-        await BrevoEmailSending(
-            to_emails=[user.email], 
-            subject="API Monitoring Application Invitation",
-            html_content= html_content).send_email()
+        await response_cache.invalidate(USER_COUNTS_CACHE_KEY)
         return True
     
     async def get_user_by_id(self, user_id: str) -> Users:
         """Get user by ID."""
+        # Lambda statements are built and keyed once per call site, the
+        # arguments only become bound values (see scripts/bench_user_queries.py)
         result = await self.db.execute(
-            select(
-                Users.id, Users.first_name, Users.last_name, 
-                Users.role_id, 
-                Users.registered_at, Users.updated_at, Users.created_at,
-                Users.email, Users.is_active
-                ).where(Users.id == user_id)
+            lambda_stmt(lambda: select(*USER_DETAIL_COLUMNS).where(Users.id == user_id))
             )
         return result.first()
     
     async def user_email_exist_or_not(self, email: str) -> bool:
         """Get user by email."""
-        stmt = select(exists().where(Users.email == email))
-        result = await self.db.execute(stmt)
+        result = await self.db.execute(lambda_stmt(lambda: select(exists().where(Users.email == email))))
         return result.scalar()
 
     async def get_user_by_email(self, email: str) -> Optional[Users]:
         """Get user by email."""
         result = await self.db.execute(
-            select(Users).where(Users.email == email)
+            lambda_stmt(lambda: select(Users).where(Users.email == email))
             )
         return result.scalar_one_or_none()
 
@@ -84,70 +140,71 @@ class UserService:
         page: int, 
         per_page: int,
         is_active: bool | None,
-        name_email_search: str | None
+        name_email_search: str | None,
+        cursor: str | None = None
     ) -> dict:
-        """Get list of users with optional filters."""
+        """
+        Get list of users with optional filters.
+        Pages are addressed either by `page` (OFFSET) or by the opaque
+        `cursor` returned as next_cursor, which continues right after the
+        last (updated_at, id) seen and stays fast however deep it goes.
+        Searches are ranked by similarity and paged by `page` only.
+        The total of the first page comes from a window count in the same
+        query as the rows.
+        """
         offset = (page - 1) * per_page
-        query = select(
-            Users.id, Users.first_name, Users.last_name, Users.role_id,
-            Users.is_active, Users.registered_at, Users.email,
-            Users.created_at, Users.invited_at, Users.updated_at
-            )
-        if is_active is not None:
-            query = query.where(Users.is_active == is_active)
-        if name_email_search:
-            if "@" not in name_email_search:
-                query = query.where(
-                    or_(
-                        Users.first_name.ilike(f"%{name_email_search.strip()}%"),
-                        Users.last_name.ilike(f"%{name_email_search.strip()}%")
-                    )
-                )
-            else:
-                query = query.where(Users.email == name_email_search.lower().strip())
-        if page == 1:
-            total_count_query = select(func.count()).select_from(Users)
+        with_total = page == 1 and not cursor
+        search = UserSearch(name_email_search) if name_email_search and name_email_search.strip() else None
+        next_cursor = None
+        if search:
+            # Built per call: UserSearch picks its conditions from the term, and
+            # the trigram scan outweighs building the statement
+            columns = list(USER_LIST_COLUMNS)
+            if with_total:
+                columns.append(func.count().over().label("total_count"))
+            query = select(*columns, search.rank())
             if is_active is not None:
-                total_count_query = total_count_query.where(Users.is_active == is_active)
-            if name_email_search:
-                if "@" not in name_email_search:
-                    total_count_query = total_count_query.where(
-                        or_(
-                        Users.first_name.ilike(f"%{name_email_search.strip()}%"),
-                        Users.last_name.ilike(f"%{name_email_search.strip()}%")
-                        )
-                    )
-                else:
-                    total_count_query = total_count_query.where(Users.email == name_email_search.lower().strip())
-                    total_count_query = await self.db.execute(total_count_query)
-            total_count_result = await self.db.execute(total_count_query)
-            total_count_result = total_count_result.scalar_one()
+                query = query.where(Users.is_active == is_active)
+            query = query.where(search.condition()).order_by(
+                literal_column("search_rank").desc(), Users.updated_at.desc(), Users.id.desc()
+                ).offset(offset).limit(per_page)
+            result = (await self.db.execute(query)).all()
         else:
-            total_count_result = 0
-        query = query.order_by(Users.updated_at.desc()).offset(offset).limit(per_page)
-        result = (await self.db.execute(query)).all()
+            cursor_values = decode_cursor(cursor, USER_CURSOR_CONVERTERS) if cursor else None
+            result = (await self.db.execute(
+                user_page_statement(with_total, is_active, cursor_values, offset, per_page))).all()
+            result, next_cursor = keyset_page(result, per_page, ["updated_at", "id"])
         if not result:
             raise NotFoundException()
-        users = [response_data_date_conversion(user._asdict(), ['created_at', 'invited_at', 'registered_at', 'updated_at'], timezone) for user in result]
+        total_count_result = result[0].total_count if with_total else 0
+        users = []
+        for user in result:
+            user = user._asdict()
+            user.pop("total_count", None)
+            user.pop("search_rank", None)
+            users.append(response_data_date_conversion(user, ['created_at', 'invited_at', 'registered_at', 'updated_at'], timezone))
         return {
             "data": users,
             "pagination": {
                 "current_page": page,
                 "per_page": per_page,
                 "length": len(users),
-                "total": total_count_result
+                "total": total_count_result,
+                "next_cursor": next_cursor
             }
         }
         
     async def register_user(self, user_id: str, password: str, user_data: dict) -> bool:
         """User registration information."""
         if user_data:
+            hashed_password = await password_hasher.hash(password)
             await self.db.execute(
                 update(Users)
                 .where(Users.id == user_id)
-                .values(**user_data, updated_at=datetime.utcnow(), registered_at=datetime.utcnow(), hashed_password=get_password_hash(password))
+                .values(**user_data, updated_at=datetime.utcnow(), registered_at=datetime.utcnow(), hashed_password=hashed_password)
             )
             await self.db.commit()        
+            await response_cache.invalidate(USER_COUNTS_CACHE_KEY)
         return True
     
     async def update_user(self, user_id: str, user_data: dict) -> bool:
@@ -161,6 +218,7 @@ class UserService:
                 .values(**user_data, updated_at=datetime.utcnow())
             )
             await self.db.commit()        
+            await response_cache.invalidate(USER_COUNTS_CACHE_KEY)
         return True
 
     async def authenticate_user(self, email: str, password: str) -> Users:
@@ -168,7 +226,7 @@ class UserService:
         user = await self.get_user_by_email(email)
         if not user or not user.is_active or user.is_deleted or not user.registered_at:
             raise BadRequestException("Incorrect username or password")
-        if not verify_password(password, user.hashed_password):
+        if not await password_hasher.verify(password, user.hashed_password):
             raise BadRequestException("Incorrect username or password")
         return user
     
@@ -179,11 +237,18 @@ class UserService:
         if not user:
             return False
         if user.is_active:
-            user.hashed_password = get_password_hash(new_password)
+            user.hashed_password = await password_hasher.hash(new_password)
             await self.db.commit()
         return True
     
     async def get_user_counts(self) -> dict:
+        """
+        User counts of the dashboard, cached in Redis and recomputed by a
+        single request when missing; writes to users invalidate them.
+        """
+        return await response_cache.get_or_compute(USER_COUNTS_CACHE_KEY, self._count_users)
+
+    async def _count_users(self) -> dict:
         query = await self.db.execute(
             select(
                 func.count(Users.id).label('total_users'),
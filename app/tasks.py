@@ -7,11 +7,15 @@ from celery import Celery
 from celery.exceptions import MaxRetriesExceededError
 # from asgiref.sync import async_to_sync
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import NullPool
+import redis.asyncio as async_redis
 
 from app.core.config import settings
-from app.services.open_ai import (
-    ai_completion_call_redis_status_set, 
-    ai_completion_call)
+from app.services.anomaly_detector import AnomalyDetectionService
+from app.services.bulk_log_writer import BulkLogWriter
+from app.services.openai_usage import OpenAIUsageService
+from app.services.request_log_ingest import RequestLogIngestService
+from app.services.request_log_partitions import RequestLogPartitionService
 
 
 celery = Celery(__name__)
@@ -28,6 +32,48 @@ celery.conf.timezone = 'UTC'
 celery.conf.event_queue_ttl = 60
 celery.conf.event_queue_expires = 120
 
+celery.conf.beat_schedule = {
+    "aggregate-request-logs": {
+        "task": "aggregate_request_logs",
+        "schedule": settings.REQUEST_LOG_INGEST_INTERVAL_IN_SECONDS,
+    },
+    "maintain-request-log-partitions": {
+        "task": "maintain_request_log_partitions",
+        "schedule": 3600.0,
+    },
+    "detect-traffic-anomalies": {
+        "task": "detect_traffic_anomalies",
+        "schedule": settings.ANOMALY_DETECTION_INTERVAL_IN_SECONDS,
+    },
+    "flush-openai-usage": {
+        "task": "flush_openai_usage",
+        "schedule": settings.OPEN_AI_USAGE_FLUSH_INTERVAL_IN_SECONDS,
+    },
+}
+
+# Every task runs its own event loop (asyncio.run), so connections must not be
+# pooled across tasks.
+worker_engine = create_async_engine(
+    settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"),
+    poolclass=NullPool,
+    connect_args={"timeout": settings.DATABASE_CONNECT_TIMEOUT},
+    )
+WorkerSessionLocal = async_sessionmaker(
+    bind=worker_engine,
+    expire_on_commit=False,
+    class_=AsyncSession
+)
+
+# One per worker child; --max-tasks-per-child recycles it every couple of
+# tasks, so the rows/s and batch latency totals are accumulated in Redis
+request_log_writer = BulkLogWriter(worker_engine)
+
+
+def get_worker_redis() -> async_redis.Redis:
+    return async_redis.Redis.from_url(
+        settings.REDIS_URL, decode_responses=True,
+        ssl_cert_reqs=ssl.CERT_NONE, ssl_check_hostname=False)
+
 
 # @celery.task(
 #     bind=True,
@@ -37,3 +83,86 @@ celery.conf.event_queue_expires = 120
 #     retry_jitter=True,        # add randomness (good for load)
 #     max_retries=5
 # )
+
+
+async def _aggregate_request_logs() -> int:
+    redis_client = get_worker_redis()
+    try:
+        async with WorkerSessionLocal() as db:
+            consumed = await RequestLogIngestService(
+                db, redis_client, request_log_writer,
+                int(settings.REQUEST_LOG_INGEST_MAX_ATTEMPTS),
+                int(settings.REQUEST_LOG_DEAD_LETTER_MAX_LENGTH)
+            ).ingest_pending(
+                settings.REQUEST_LOG_INGEST_BATCH_SIZE,
+                settings.REQUEST_LOG_INGEST_MAX_BATCHES,
+                float(settings.REQUEST_LOG_INGEST_LOCK_TIMEOUT_IN_SECONDS)
+            )
+        if consumed:
+            print(f"aggregate_request_logs writer totals {await request_log_writer.persist_totals(redis_client)}")
+        return consumed
+    finally:
+        await redis_client.aclose()
+
+
+@celery.task(name="aggregate_request_logs", ignore_result=True)
+def aggregate_request_logs() -> int:
+    """Fold captured requests into the 1m/1h/1d rollup tables."""
+    return asyncio.run(_aggregate_request_logs())
+
+
+async def _maintain_request_log_partitions() -> dict:
+    async with WorkerSessionLocal() as db:
+        return await RequestLogPartitionService(db).run_maintenance(
+            settings.REQUEST_LOG_PARTITIONS_AHEAD_DAYS,
+            settings.REQUEST_LOG_RETENTION_DAYS
+        )
+
+
+@celery.task(name="maintain_request_log_partitions", ignore_result=True)
+def maintain_request_log_partitions() -> dict:
+    """Create upcoming api_request_logs partitions and drop the expired ones."""
+    result = asyncio.run(_maintain_request_log_partitions())
+    print(f"maintain_request_log_partitions {result}")
+    return result
+
+
+async def _detect_traffic_anomalies() -> int:
+    redis_client = get_worker_redis()
+    try:
+        async with WorkerSessionLocal() as db:
+            return await AnomalyDetectionService(db, redis_client).run_tick(
+                float(settings.ANOMALY_Z_SCORE_THRESHOLD),
+                float(settings.ANOMALY_MIN_EXPECTED_REQUESTS),
+                # Leave the ingest task time to fold in the last records of a minute
+                float(settings.REQUEST_LOG_INGEST_INTERVAL_IN_SECONDS) * 3,
+                float(settings.ANOMALY_DETECTION_LOCK_TIMEOUT_IN_SECONDS)
+            )
+    finally:
+        await redis_client.aclose()
+
+
+@celery.task(name="detect_traffic_anomalies", ignore_result=True)
+def detect_traffic_anomalies() -> int:
+    """Score the minutes closed since the last run for spikes and drops."""
+    return asyncio.run(_detect_traffic_anomalies())
+
+
+async def _flush_openai_usage() -> int:
+    redis_client = get_worker_redis()
+    try:
+        async with WorkerSessionLocal() as db:
+            service = OpenAIUsageService(db)
+            flushed = batch = await service.flush_counters(redis_client)
+            while batch:
+                batch = await service.flush_counters(redis_client)
+                flushed += batch
+            return flushed
+    finally:
+        await redis_client.aclose()
+
+
+@celery.task(name="flush_openai_usage", ignore_result=True)
+def flush_openai_usage() -> int:
+    """Move the per user/model/day OpenAI usage counters from Redis to openai_usage_daily."""
+    return asyncio.run(_flush_openai_usage())
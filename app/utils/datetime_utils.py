@@ -1,5 +1,6 @@
 from datetime import datetime
-from zoneinfo import ZoneInfo
+from zoneinfo import (
+    ZoneInfo, ZoneInfoNotFoundError)
 from typing import Union
 
 from app.core.config import settings
@@ -26,6 +27,17 @@ def date_object_to_date_string(dt: Union[datetime.date, datetime]) -> str | None
         return
 
 
+def is_valid_timezone(timezone: str) -> bool:
+    """
+    Whether `timezone` is a known IANA time zone name (e.g. 'Asia/Kolkata')
+    """
+    try:
+        ZoneInfo(timezone)
+        return True
+    except (ZoneInfoNotFoundError, ValueError, OSError):
+        return False
+
+
 def convert_timezone_to_utc_object(dt_object: datetime, timezone: str) -> datetime:
     """
     Converts a datetime object from a specific timezone to UTC.
@@ -0,0 +1,136 @@
+import math
+import struct
+from bisect import bisect_left
+from typing import (
+    Dict, Iterator, List, Optional, Sequence, Tuple)
+
+
+# version, relative accuracy, count, zero count, sum, min, max, number of bins
+_HEADER = struct.Struct("<BdQQdddI")
+_BIN = struct.Struct("<iQ")
+_VERSION = 1
+
+# Values at or below this are counted in the zero bucket
+MIN_INDEXABLE_VALUE = 1e-3
+
+
+class DDSketch:
+    """
+    Mergeable quantile sketch with relative-error guarantees (DDSketch).
+
+    Values are counted in logarithmically sized bins, so every quantile is
+    returned within `relative_accuracy` of the exact value while memory is
+    bounded by `max_bins` regardless of how many values were added.
+    Two sketches with the same accuracy merge exactly by adding bin counts,
+    which lets per minute sketches be combined into any larger window.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._multiplier = 1 / math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _index(self, value: float) -> int:
+        return math.ceil(math.log(value) * self._multiplier)
+
+    def _value(self, index: int) -> float:
+        """Representative value of a bin, within relative accuracy of every value in it."""
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value <= MIN_INDEXABLE_VALUE:
+            self.zero_count += count
+        else:
+            index = self._index(value)
+            self.bins[index] = self.bins.get(index, 0) + count
+            if len(self.bins) > self.max_bins:
+                self._collapse()
+        self.count += count
+        self.sum += value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def _collapse(self) -> None:
+        """Fold the lowest bins together so the highest quantiles keep their accuracy."""
+        indexes = sorted(self.bins)
+        overflow = len(indexes) - self.max_bins
+        target = indexes[overflow]
+        for index in indexes[:overflow]:
+            self.bins[target] += self.bins.pop(index)
+
+    def merge(self, other: "DDSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        cumulative = self.zero_count
+        for index in sorted(self.bins):
+            cumulative += self.bins[index]
+            if cumulative > rank:
+                return min(max(self._value(index), self.min), self.max)
+        return self.max
+
+    def bin_ranges(self) -> Iterator[Tuple[float, float, int]]:
+        """(lower bound, upper bound, count) of every non-empty bin, lowest first."""
+        if self.zero_count:
+            yield 0.0, MIN_INDEXABLE_VALUE, self.zero_count
+        for index in sorted(self.bins):
+            yield self.gamma ** (index - 1), self.gamma ** index, self.bins[index]
+
+    def band_counts(self, upper_edges: Sequence[float]) -> List[int]:
+        """Value counts per band of the sorted `upper_edges`, plus one open ended band."""
+        counts = [0] * (len(upper_edges) + 1)
+        for _, upper, count in self.bin_ranges():
+            counts[bisect_left(upper_edges, upper)] += count
+        return counts
+
+    @property
+    def average(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def to_bytes(self) -> bytes:
+        header = _HEADER.pack(
+            _VERSION, self.relative_accuracy, self.count, self.zero_count,
+            self.sum, self.min, self.max, len(self.bins))
+        return header + b"".join(_BIN.pack(index, count) for index, count in self.bins.items())
+
+    @classmethod
+    def from_bytes(cls, data: bytes, max_bins: int = 2048) -> "DDSketch":
+        version, relative_accuracy, count, zero_count, total, minimum, maximum, bins = _HEADER.unpack_from(data)
+        if version != _VERSION:
+            raise ValueError(f"Unsupported sketch version {version}")
+        sketch = cls(relative_accuracy, max_bins)
+        sketch.count = count
+        sketch.zero_count = zero_count
+        sketch.sum = total
+        sketch.min = minimum
+        sketch.max = maximum
+        offset = _HEADER.size
+        for _ in range(bins):
+            index, bin_count = _BIN.unpack_from(data, offset)
+            sketch.bins[index] = bin_count
+            offset += _BIN.size
+        return sketch
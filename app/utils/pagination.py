@@ -0,0 +1,71 @@
+import base64
+import json
+from datetime import datetime
+from typing import (
+    Any, Callable, List, Optional, Sequence, Tuple)
+from uuid import UUID
+
+from sqlalchemy import (
+    Select, tuple_)
+
+from app.core.exceptions import BadRequestException
+
+
+def _encode_value(value: Any):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor holding the sort key of the last row of a page."""
+    raw = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, converters: Sequence[Callable[[Any], Any]]) -> Tuple:
+    """Decode a cursor back into typed sort key values, e.g. (datetime.fromisoformat, UUID)."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if len(values) != len(converters):
+            raise ValueError("cursor length mismatch")
+        return tuple(convert(value) for convert, value in zip(converters, values))
+    except (ValueError, TypeError) as e:
+        print(f"decode_cursor {e}")
+        raise BadRequestException("Invalid pagination cursor")
+
+
+def apply_keyset(
+    query: Select,
+    order_columns: Sequence,
+    cursor_values: Optional[Tuple],
+    per_page: int,
+    descending: bool = True
+) -> Select:
+    """
+    Order `query` by `order_columns` and start right after `cursor_values`.
+    The columns must be unique together (end with the primary key) and be
+    covered by a composite index in the same order, then every page is an
+    index range scan however deep it is. One extra row is fetched to know
+    whether another page exists.
+    The users list (user_service.user_page_statement) spells out the same
+    predicate, ordering and look-ahead row as cached lambda parts; a change
+    to the keyset rules here must be made there too.
+    """
+    if cursor_values is not None:
+        key = tuple_(*order_columns)
+        query = query.where(key < tuple_(*cursor_values) if descending else key > tuple_(*cursor_values))
+    ordering = [column.desc() if descending else column.asc() for column in order_columns]
+    return query.order_by(*ordering).limit(per_page + 1)
+
+
+def keyset_page(rows: List, per_page: int, key_names: Sequence[str]) -> Tuple[List, Optional[str]]:
+    """Trim the look-ahead row and build the cursor of the next page."""
+    if len(rows) <= per_page:
+        return rows, None
+    rows = rows[:per_page]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, name) for name in key_names])
@@ -0,0 +1,86 @@
+"""
+Benchmark BulkLogWriter (COPY) against an executemany INSERT for sizing
+the request log ingest.
+
+Rows go into a temporary table on a single connection, so nothing is left
+behind in the database configured by DATABASE_URL.
+
+    python -m scripts.bench_bulk_log_writer --batches 10 --batch-size 10000
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from sqlalchemy import (
+    BigInteger, Column, DateTime, Float, Integer, MetaData, String, Table, text)
+
+from app.db.session import engine
+from app.services.bulk_log_writer import (
+    REQUEST_LOG_COLUMNS, BulkLogWriter)
+
+
+BENCH_TABLE = "bench_request_logs"
+ROUTES = ["/api/v1/auth/login", "/api/v1/users/", "/api/v1/users/{user_id}", "/api/v1/metrics/traffic"]
+
+bench_table = Table(
+    BENCH_TABLE, MetaData(),
+    Column("created_at", DateTime),
+    Column("method", String(10)),
+    Column("route", String(255)),
+    Column("status_code", Integer),
+    Column("latency_ms", Float),
+    Column("request_bytes", BigInteger),
+    Column("response_bytes", BigInteger),
+)
+
+
+def make_rows(count: int) -> list:
+    now = datetime.utcnow()
+    return [
+        (now - timedelta(milliseconds=i), "GET", random.choice(ROUTES), random.choice((200, 200, 200, 404, 500)),
+         random.uniform(1, 250), random.randint(0, 2048), random.randint(0, 65536))
+        for i in range(count)
+    ]
+
+
+async def main(batches: int, batch_size: int) -> None:
+    writer = BulkLogWriter(table_name=BENCH_TABLE)
+    async with engine.connect() as connection:
+        await connection.execute(text(
+            f"CREATE TEMP TABLE {BENCH_TABLE} (created_at timestamp, method varchar(10), route varchar(255), "
+            "status_code integer, latency_ms float, request_bytes bigint, response_bytes bigint)"
+        ))
+        copy_seconds = insert_seconds = 0.0
+        for _ in range(batches):
+            rows = make_rows(batch_size)
+            started_at = time.perf_counter()
+            await writer.write(rows, connection=connection)
+            copy_seconds += time.perf_counter() - started_at
+
+            started_at = time.perf_counter()
+            await connection.execute(
+                bench_table.insert(), [dict(zip(REQUEST_LOG_COLUMNS, row)) for row in rows])
+            insert_seconds += time.perf_counter() - started_at
+        await connection.rollback()
+
+    total = batches * batch_size
+    print(f"rows:               {total} in batches of {batch_size}")
+    print(f"COPY:               {total / copy_seconds:,.0f} rows/s, {copy_seconds * 1000 / batches:.1f} ms per batch")
+    print(f"executemany INSERT: {total / insert_seconds:,.0f} rows/s, {insert_seconds * 1000 / batches:.1f} ms per batch")
+    print(f"writer stats:       {writer.stats()}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batches", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+    asyncio.run(main(args.batches, args.batch_size))
@@ -0,0 +1,59 @@
+"""
+Measure the per-client cost of LiveUpdateBroker: memory held by idle SSE
+streams and the time to fan one message out to all of them.
+
+Only the broker is measured (no Redis, no sockets), the HTTP connection
+itself adds the server's own per-connection buffers on top.
+
+    python -m scripts.bench_live_updates --clients 5000
+"""
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from app.core.live_updates import (
+    LiveUpdateBroker, encode_live_update)
+
+
+def _no_redis():
+    raise RuntimeError("not used by the benchmark")
+
+
+async def main(clients: int) -> None:
+    broker = LiveUpdateBroker(_no_redis)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    streams = [broker.stream() for _ in range(clients)]
+    # Start every stream (first frame) and park it waiting for updates
+    for stream in streams:
+        await stream.__anext__()
+    waiters = [asyncio.ensure_future(stream.__anext__()) for stream in streams]
+    await asyncio.sleep(0)
+    idle = tracemalloc.get_traced_memory()[0] - before
+
+    frame = f"data: {encode_live_update('request_counts', {'request_count': 1000})}\n\n".encode()
+    started_at = time.perf_counter()
+    broker.broadcast(frame)
+    await asyncio.gather(*waiters)
+    fan_out = time.perf_counter() - started_at
+    tracemalloc.stop()
+
+    print(f"clients:        {len(broker)}")
+    print(f"idle memory:    {idle / 1024 / 1024:.2f} MiB ({idle / clients:.0f} bytes per client)")
+    print(f"fan out:        {fan_out * 1000:.2f} ms for one message to every client")
+    await broker.stop()
+    for stream in streams:
+        await stream.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.clients))
@@ -0,0 +1,89 @@
+"""
+Benchmark the per-request overhead of RequestCaptureMiddleware.
+
+Runs a minimal ASGI app with and without the middleware and reports the
+added cost per request. Exits with status 1 when the overhead is above
+the budget.
+
+    python -m scripts.bench_request_capture --requests 200000 --budget-us 50
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from app.core.request_capture import (
+    RequestCaptureMiddleware, RequestLogBuffer)
+
+
+class _Route:
+    path = "/api/v1/users/{user_id}"
+
+
+_ROUTE = _Route()
+_START = {"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]}
+_BODY = {"type": "http.response.body", "body": b'{"status":"healthy"}'}
+_REQUEST = {"type": "http.request", "body": b'{"first_name":"Arun"}', "more_body": False}
+
+
+async def endpoint(scope, receive, send):
+    scope["route"] = _ROUTE
+    await receive()
+    await send(_START)
+    await send(_BODY)
+
+
+async def receive():
+    return _REQUEST
+
+
+async def send(message):
+    return None
+
+
+async def measure(app, requests: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/users/1"}
+    started_at = time.perf_counter()
+    for i in range(requests):
+        await app(dict(scope), receive, send)
+        if i % 500 == 0:
+            # Give the background flusher a chance to run, like a real server would
+            await asyncio.sleep(0)
+    return time.perf_counter() - started_at
+
+
+async def main(requests: int, budget_us: float) -> int:
+    buffer = RequestLogBuffer(capacity=50000, batch_size=1000, flush_interval=2)
+
+    async def sink(batch):
+        return None
+
+    buffer.start(sink)
+    wrapped = RequestCaptureMiddleware(endpoint, buffer=buffer)
+    # Warm up both paths before measuring
+    await measure(endpoint, 10000)
+    await measure(wrapped, 10000)
+
+    bare = min([await measure(endpoint, requests) for _ in range(3)])
+    captured = min([await measure(wrapped, requests) for _ in range(3)])
+    await buffer.stop()
+
+    overhead_us = (captured - bare) / requests * 1_000_000
+    print(f"requests per run:       {requests}")
+    print(f"bare app:               {bare / requests * 1_000_000:.2f} us/request")
+    print(f"with request capture:   {captured / requests * 1_000_000:.2f} us/request")
+    print(f"middleware overhead:    {overhead_us:.2f} us/request (budget {budget_us} us)")
+    print(f"flushed / dropped:      {buffer.flushed} / {buffer.dropped}")
+    return 0 if overhead_us < budget_us else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--budget-us", type=float, default=50.0)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.requests, args.budget_us)))
@@ -0,0 +1,63 @@
+"""
+Refresh a cached dashboard read from many clients at once and count how
+often the underlying aggregate runs. Requests are spread over several
+ResponseCache instances, each standing in for one worker process, and all
+share the Redis at REDIS_URL.
+
+    python -m scripts.bench_response_cache --requests 200 --workers 4
+"""
+import argparse
+import asyncio
+import ssl
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+import redis.asyncio as redis
+
+from app.core.cache import ResponseCache
+from app.core.config import settings
+
+
+async def main(requests: int, workers: int, query_seconds: float) -> None:
+    client = redis.Redis.from_url(
+        settings.REDIS_URL, decode_responses=True,
+        ssl_cert_reqs=ssl.CERT_NONE, ssl_check_hostname=False)
+    caches = [ResponseCache(lambda: client, default_ttl=60) for _ in range(workers)]
+    key = f"bench:{uuid4().hex}"
+    computed = 0
+
+    async def aggregate() -> dict:
+        nonlocal computed
+        computed += 1
+        await asyncio.sleep(query_seconds)
+        return {"total_users": 1000, "active_users": 900}
+
+    try:
+        for label in ("cold", "warm", "after invalidate"):
+            computed = 0
+            started = time.perf_counter()
+            await asyncio.gather(*(
+                caches[i % workers].get_or_compute(key, aggregate) for i in range(requests)))
+            elapsed = time.perf_counter() - started
+            print(f"{label:>16}: {requests} requests over {workers} workers, "
+                  f"aggregate ran {computed}x, {elapsed * 1000:.1f} ms")
+            if label == "warm":
+                await caches[0].invalidate(key)
+    finally:
+        generation_key, value_prefix, lock_key, settling_key = ResponseCache._keys(key)
+        await client.delete(generation_key, lock_key, settling_key, f"{value_prefix}0", f"{value_prefix}1")
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--query-seconds", type=float, default=0.2, help="Simulated aggregate duration")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.workers, args.query_seconds))
@@ -0,0 +1,115 @@
+"""
+Compare logging a user out of all devices with the old KEYS scan and with
+the per-user session hash, in a Redis holding `--keys` unrelated keys.
+Run it against a throwaway Redis: the filler keys are written to REDIS_URL
+(and removed afterwards).
+
+    python -m scripts.bench_session_revoke --keys 1000000 --sessions 5
+"""
+import argparse
+import asyncio
+import ssl
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.core.session_store import (
+    revoke_sessions, session_field, store_session_token)
+
+
+FILLER_PREFIX = "bench_filler"
+FILL_BATCH_SIZE = 10000
+
+
+async def fill(client: redis.Redis, keys: int) -> None:
+    for start in range(0, keys, FILL_BATCH_SIZE):
+        async with client.pipeline(transaction=False) as pipe:
+            for i in range(start, min(start + FILL_BATCH_SIZE, keys)):
+                pipe.set(f"{FILLER_PREFIX}:{i}", "x")
+            await pipe.execute()
+
+
+async def drop_filler(client: redis.Redis) -> None:
+    batch = []
+    async for key in client.scan_iter(match=f"{FILLER_PREFIX}:*", count=FILL_BATCH_SIZE):
+        batch.append(key)
+        if len(batch) >= FILL_BATCH_SIZE:
+            await client.unlink(*batch)
+            batch = []
+    if batch:
+        await client.unlink(*batch)
+
+
+async def timed(label: str, runs: int, operation) -> None:
+    samples = []
+    for _ in range(runs):
+        await operation.setup()
+        started = time.perf_counter()
+        await operation.run()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    print(f"{label:>14}: median {samples[len(samples) // 2] * 1000:.2f} ms, max {samples[-1] * 1000:.2f} ms")
+
+
+class KeysScanRevoke:
+    """The previous logout_user_from_all_devices."""
+
+    def __init__(self, client: redis.Redis, sessions: int):
+        self.client = client
+        self.sessions = sessions
+        self.user_id = uuid4()
+
+    async def setup(self):
+        # The old layout held one key per purpose
+        for purpose in ("login", "forgot_pwd", "invitation")[:self.sessions]:
+            await self.client.setex(f"{self.user_id}_{purpose}", 600, "token")
+
+    async def run(self):
+        keys = await self.client.keys(f"{self.user_id}_*")
+        for key in keys:
+            await self.client.delete(key)
+
+
+class SessionHashRevoke:
+    def __init__(self, client: redis.Redis, sessions: int):
+        self.client = client
+        self.sessions = sessions
+        self.user_id = uuid4()
+
+    async def setup(self):
+        for _ in range(self.sessions):
+            await store_session_token(self.client, self.user_id, session_field("login", uuid4().hex), "token", 600)
+
+    async def run(self):
+        await revoke_sessions(self.client, self.user_id)
+
+
+async def main(keys: int, sessions: int, runs: int) -> None:
+    client = redis.Redis.from_url(
+        settings.REDIS_URL, decode_responses=True,
+        ssl_cert_reqs=ssl.CERT_NONE, ssl_check_hostname=False)
+    try:
+        started = time.perf_counter()
+        await fill(client, keys)
+        print(f"filled {keys} keys in {time.perf_counter() - started:.1f}s, dbsize {await client.dbsize()}")
+        await timed("KEYS scan", runs, KeysScanRevoke(client, sessions))
+        await timed("session hash", runs, SessionHashRevoke(client, sessions))
+    finally:
+        await drop_filler(client)
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--keys", type=int, default=1_000_000)
+    parser.add_argument("--sessions", type=int, default=3, help="Tokens held by the benchmarked user")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.keys, args.sessions, args.runs))
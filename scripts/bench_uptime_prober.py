@@ -0,0 +1,115 @@
+"""
+Run UptimeProber against a local stub server and report probe throughput,
+result states and the CPU used by the prober.
+
+The stub runs in its own process (keep-alive HTTP/1.1) and serves
+/ok (200), /slow (200 after a delay) and /error (500), so the expected
+mix of up, degraded and down results is known. Nothing is stored.
+
+    python -m scripts.bench_uptime_prober --endpoints 1000 --interval 30 --duration 90
+"""
+import argparse
+import asyncio
+import multiprocessing
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from uuid import uuid4
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from app.core.request_capture import RequestLogBuffer
+from app.services.uptime_prober import (
+    ProbeTarget, UptimeProber, build_probe_client)
+
+
+STUB_HOST = "127.0.0.1"
+SLOW_RESPONSE_SECONDS = 0.3
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            path = head.split(b" ", 2)[1].split(b"?", 1)[0]
+            status = b"200 OK"
+            if path == b"/slow":
+                await asyncio.sleep(SLOW_RESPONSE_SECONDS)
+            elif path == b"/error":
+                status = b"500 Internal Server Error"
+            writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Length: 2\r\nContent-Type: text/plain\r\n\r\nok")
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def run_stub_server(port: int) -> None:
+    async def serve():
+        server = await asyncio.start_server(_handle, STUB_HOST, port, backlog=4096)
+        async with server:
+            await server.serve_forever()
+    asyncio.run(serve())
+
+
+def make_targets(count: int, port: int, interval: float) -> list:
+    targets = []
+    for i in range(count):
+        path = "/error" if i % 20 == 0 else "/slow" if i % 20 == 1 else "/ok"
+        targets.append(ProbeTarget(
+            id=uuid4(),
+            url=f"http://{STUB_HOST}:{port}{path}?endpoint={i}",
+            method="GET",
+            expected_status=200,
+            interval_seconds=interval,
+            timeout_seconds=5,
+            degraded_latency_ms=SLOW_RESPONSE_SECONDS * 1000 / 2,
+        ))
+    return targets
+
+
+async def main(endpoints: int, interval: float, duration: float, port: int, max_concurrency: int) -> None:
+    states = Counter()
+
+    async def count_results(batch):
+        states.update(result[2] for result in batch)
+
+    buffer = RequestLogBuffer(capacity=endpoints * 4, batch_size=1000, flush_interval=1)
+    buffer.start(count_results)
+    async with build_probe_client(max_concurrency) as client:
+        # The stub is a single host, so allow the whole pool on it
+        prober = UptimeProber(
+            client, buffer, max_concurrency=max_concurrency,
+            max_connections_per_host=max_concurrency, jitter_ratio=0.1)
+        started_at, cpu_started_at = time.perf_counter(), time.process_time()
+        prober.sync_targets(make_targets(endpoints, port, interval))
+        await asyncio.sleep(duration)
+        await prober.stop()
+        elapsed, cpu = time.perf_counter() - started_at, time.process_time() - cpu_started_at
+    await buffer.stop()
+
+    print(f"endpoints:  {endpoints} every {interval:g}s for {duration:g}s")
+    print(f"probes:     {prober.probes} ({prober.probes / elapsed:.1f}/s)")
+    print(f"results:    {dict(states)}, dropped {buffer.dropped}")
+    print(f"prober CPU: {cpu:.2f}s ({cpu / elapsed * 100:.1f}% of one core)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--endpoints", type=int, default=1000)
+    parser.add_argument("--interval", type=float, default=30)
+    parser.add_argument("--duration", type=float, default=90)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    stub = multiprocessing.Process(target=run_stub_server, args=(args.port,), daemon=True)
+    stub.start()
+    time.sleep(0.5)
+    try:
+        asyncio.run(main(args.endpoints, args.interval, args.duration, args.port, args.max_concurrency))
+    finally:
+        stub.terminate()
@@ -0,0 +1,144 @@
+"""
+Per-call statement overhead of the UserService hot queries: building the
+select() and computing its cache key (what every execute pays before the
+compiled cache is hit), compiling it (paid on a cache miss), plain select()
+against the lambda statements UserService uses, including the users list
+pages (first page with total, OFFSET page, cursor page). With --execute the
+service methods also run against DATABASE_URL.
+
+    python -m scripts.bench_user_queries --iterations 20000
+    python -m scripts.bench_user_queries --execute --user-id <uuid> --email <email>
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from sqlalchemy import (
+    exists, func, select)
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+
+from app.db.models import Users
+from app.services.user_service import (
+    USER_DETAIL_COLUMNS, USER_LIST_COLUMNS, UserService, user_page_statement)
+from app.utils.pagination import apply_keyset
+
+
+class _StatementCapture:
+    """Stands in for the session to grab the statement a service method executes."""
+
+    def __init__(self):
+        self.statement = None
+
+    async def execute(self, statement):
+        self.statement = statement
+        raise LookupError
+
+
+def service_statement(method: str, argument):
+    capture = _StatementCapture()
+    # The method stops at its first execute, no event loop needed
+    try:
+        getattr(UserService(capture), method)(argument).send(None)
+    except LookupError:
+        pass
+    return capture.statement
+
+
+# The queries as they were built before the lambda statements
+PLAIN_QUERIES = {
+    "get_user_by_id": lambda value: select(*USER_DETAIL_COLUMNS).where(Users.id == value),
+    "get_user_by_email": lambda value: select(Users).where(Users.email == value),
+    "user_email_exist_or_not": lambda value: select(exists().where(Users.email == value)),
+}
+
+
+def plain_user_page(with_total, is_active, cursor_values, offset, per_page):
+    """get_users without a search, as built before user_page_statement."""
+    columns = list(USER_LIST_COLUMNS)
+    if with_total:
+        columns.append(func.count().over().label("total_count"))
+    query = select(*columns)
+    if is_active is not None:
+        query = query.where(Users.is_active == is_active)
+    query = apply_keyset(query, [Users.updated_at, Users.id], cursor_values, per_page)
+    if cursor_values is None:
+        query = query.offset(offset)
+    return query
+
+
+# (with_total, is_active, cursor_values, offset, per_page) of the list pages
+USER_PAGES = {
+    "get_users first page": (True, None, None, 0, 20),
+    "get_users offset page": (False, True, None, 40, 20),
+    "get_users cursor page": (False, None, (datetime(2026, 1, 1), uuid4()), 0, 20),
+}
+
+
+def per_call_us(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def bench_statements(iterations: int) -> None:
+    dialect = asyncpg_dialect()
+    arguments = {
+        "get_user_by_id": str(uuid4()),
+        "get_user_by_email": "someone@example.com",
+        "user_email_exist_or_not": "someone@example.com",
+    }
+    print(f"{'query':<26}{'plain key us':>14}{'lambda key us':>15}{'compile us':>12}")
+    for method, argument in arguments.items():
+        plain = PLAIN_QUERIES[method]
+        lambda_statement = service_statement(method, argument)
+        assert str(lambda_statement.compile(dialect=dialect)) == str(plain(argument).compile(dialect=dialect))
+        plain_key = per_call_us(lambda: plain(argument)._generate_cache_key(), iterations)
+        # A fresh lambda_stmt per call, like UserService
+        lambda_key = per_call_us(lambda: service_statement(method, argument)._generate_cache_key(), iterations)
+        compile_us = per_call_us(lambda: plain(argument).compile(dialect=dialect), max(iterations // 10, 1))
+        print(f"{method:<26}{plain_key:>14.1f}{lambda_key:>15.1f}{compile_us:>12.1f}")
+    for name, page in USER_PAGES.items():
+        # Same SQL up to the bound parameter names
+        plain_key = per_call_us(lambda: plain_user_page(*page)._generate_cache_key(), iterations)
+        lambda_key = per_call_us(lambda: user_page_statement(*page)._generate_cache_key(), iterations)
+        compile_us = per_call_us(lambda: plain_user_page(*page).compile(dialect=dialect), max(iterations // 10, 1))
+        print(f"{name:<26}{plain_key:>14.1f}{lambda_key:>15.1f}{compile_us:>12.1f}")
+    print("(lambda key includes the service call through a stub session)")
+
+
+async def bench_execute(iterations: int, user_id: str, email: str) -> None:
+    from app.db.session import (
+        AsyncSessionLocal, engine)
+    async with AsyncSessionLocal() as db:
+        service = UserService(db)
+        for name, call in (
+                ("get_user_by_id", lambda: service.get_user_by_id(user_id)),
+                ("get_user_by_email", lambda: service.get_user_by_email(email)),
+                ("user_email_exist_or_not", lambda: service.user_email_exist_or_not(email)),
+                ("get_users first page", lambda: service.get_users("UTC", 1, 20, None, None))):
+            await call()
+            started = time.perf_counter()
+            for _ in range(iterations):
+                await call()
+            print(f"{name:<26}{(time.perf_counter() - started) / iterations * 1000:>8.3f} ms per call")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--execute", action="store_true", help="Also time the queries against DATABASE_URL")
+    parser.add_argument("--user-id", default=str(uuid4()))
+    parser.add_argument("--email", default="someone@example.com")
+    args = parser.parse_args()
+    bench_statements(args.iterations)
+    if args.execute:
+        asyncio.run(bench_execute(max(args.iterations // 20, 1), args.user_id, args.email))
@@ -0,0 +1,73 @@
+"""
+Fail (exit 1) when a cold import of the app modules takes longer than the
+budget, or when it pulls in a package that should only load on first use.
+Every gunicorn restart pays this import. Defaults to every module of
+app.core, app.services and app.api.endpoints (app.main does not import in
+this tree).
+
+    python -m scripts.check_import_budget --budget-ms 1500
+    python -m scripts.check_import_budget --module app.services.user_service
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from scripts.import_time_report import app_modules
+
+# Loaded on first use only; importing the app must not load them
+LAZY_PACKAGES = ("boto3", "botocore", "celery", "jinja2", "numpy", "passlib")
+
+PROBE = """
+import importlib, json, sys, time
+started = time.perf_counter()
+for module in {modules!r}:
+    importlib.import_module(module)
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def cold_import(modules: List[str]) -> dict:
+    env = {**os.environ, "PYTHONPATH": str(ROOT_DIR)}
+    process = subprocess.run(
+        [sys.executable, "-c", PROBE.format(modules=modules)],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True)
+    if process.returncode:
+        sys.exit(f"FAIL import:\n{process.stderr.strip().splitlines()[-1]}")
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main(modules: List[str], budget_ms: float, runs: int) -> None:
+    # Best of a few runs, the first one also compiles the bytecode
+    results = [cold_import(modules) for _ in range(runs)]
+    best_ms = min(result["seconds"] for result in results) * 1000
+    loaded = {name.split(".")[0] for name in results[-1]["modules"]}
+    eager = [package for package in LAZY_PACKAGES if package in loaded]
+
+    print(f"import of {len(modules)} modules: {best_ms:.0f} ms (best of {runs}), budget {budget_ms:.0f} ms")
+    failed = False
+    if best_ms > budget_ms:
+        print("FAIL over budget, see: python -m scripts.import_time_report " + " ".join(modules))
+        failed = True
+    if eager:
+        print(f"FAIL loaded at import: {', '.join(eager)}")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", action="append", dest="modules", help="Module to import, repeatable")
+    parser.add_argument("--budget-ms", type=float, default=float(os.environ.get("IMPORT_BUDGET_MS", 1500)))
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    main(args.modules or app_modules(), args.budget_ms, args.runs)
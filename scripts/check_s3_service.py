@@ -0,0 +1,82 @@
+"""
+Exercise AmazonServices against a local S3 stand-in and time the calls:
+multipart upload and download, paginated listing, presigning (cold and
+cached) and many concurrent small uploads.
+
+    moto_server -p 5001 &   # or MinIO
+    S3_ENDPOINT_URL=http://localhost:5001 python -m scripts.check_s3_service
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from uuid import uuid4
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from app.core.config import settings
+from app.services.aws_services import (
+    MB, AmazonServices, get_s3_client)
+
+
+async def main(objects: int, large_mb: int) -> None:
+    if not settings.S3_ENDPOINT_URL:
+        sys.exit("S3_ENDPOINT_URL must point at a local S3 stand-in")
+    client = get_s3_client()
+    try:
+        client.create_bucket(Bucket=settings.S3_BUCKET_NAME)
+    except client.exceptions.BucketAlreadyOwnedByYou:
+        pass
+    s3 = AmazonServices()
+    prefix = f"check/{uuid4().hex}/"
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        s3.put_object(b"x" * 100, f"{prefix}small/{i}.txt", "text/plain") for i in range(objects)))
+    print(f"{objects} concurrent small uploads: {time.perf_counter() - started:.2f}s")
+
+    started = time.perf_counter()
+    keys = await s3.list_keys(f"{prefix}small/")
+    print(f"listed {len(keys)} keys (paginated): {time.perf_counter() - started:.2f}s")
+    assert len(keys) == objects
+
+    for label in ("cold", "cached"):
+        started = time.perf_counter()
+        listing = await s3.list_objects(f"{prefix}small/")
+        print(f"list_objects with presigned URLs ({label}): {time.perf_counter() - started:.3f}s")
+    assert len(listing) == objects and all(item["url"] for item in listing)
+
+    payload = os.urandom(large_mb * MB)
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory, "upload.bin")
+        source.write_bytes(payload)
+        started = time.perf_counter()
+        with source.open("rb") as file_object:
+            await s3.upload_fileobj(file_object, f"{prefix}large.bin", "application/octet-stream")
+        print(f"{large_mb} MB multipart upload: {time.perf_counter() - started:.2f}s")
+
+        started = time.perf_counter()
+        target = await s3.download_s3_object(f"{prefix}large.bin", str(Path(directory, "download.bin")))
+        print(f"{large_mb} MB ranged download: {time.perf_counter() - started:.2f}s")
+        assert hashlib.sha256(Path(target).read_bytes()).digest() == hashlib.sha256(payload).digest()
+
+    digest = hashlib.sha256()
+    async for chunk in s3.stream_object(f"{prefix}large.bin"):
+        digest.update(chunk)
+    assert digest.digest() == hashlib.sha256(payload).digest()
+    print("streamed download matches")
+
+    await asyncio.gather(*(s3.delete_s3_object(key) for key in keys + [f"{prefix}large.bin"]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--objects", type=int, default=1500, help="Small objects (more than one listing page)")
+    parser.add_argument("--large-mb", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(main(args.objects, args.large_mb))
@@ -0,0 +1,79 @@
+"""
+Import-time report of modules: the slowest imports (cumulative) and the
+time spent per top-level package, from `python -X importtime` in a fresh
+interpreter. Defaults to every module the API workers load (APP_PACKAGES);
+app.main itself does not import in this tree, app.api.router imports
+endpoint modules that are missing.
+
+    python -m scripts.import_time_report --top 30
+    python -m scripts.import_time_report app.services.user_service
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# Packages whose modules make up the API worker
+APP_PACKAGES = ("app.core", "app.services", "app.api.endpoints")
+# Imported by the API on first use only (numpy), see the anomalies route
+LAZY_APP_MODULES = ("app.services.anomaly_detector",)
+
+
+def app_modules() -> List[str]:
+    """Every module of APP_PACKAGES the API workers import at startup."""
+    modules = []
+    for package in APP_PACKAGES:
+        for path in sorted(ROOT_DIR.joinpath(*package.split(".")).glob("*.py")):
+            module = f"{package}.{path.stem}"
+            if path.stem != "__init__" and module not in LAZY_APP_MODULES:
+                modules.append(module)
+    return modules
+
+
+def import_times(modules: List[str]) -> List[Tuple[str, int, int, int]]:
+    """(module, depth, self us, cumulative us) per import of a cold import of `modules`."""
+    env = {**os.environ, "PYTHONPATH": str(ROOT_DIR), "PYTHONDONTWRITEBYTECODE": "1"}
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "; ".join(f"import {module}" for module in modules)],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True)
+    if process.returncode:
+        sys.exit(f"import failed:\n{process.stderr.strip().splitlines()[-1]}")
+    rows = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main(modules: List[str], top: int) -> None:
+    rows = import_times(modules)
+    # Top level rows do not overlap, together they are the whole import
+    total = sum(cumulative for _, depth, _, cumulative in rows if depth == 0)
+    print(f"import of {len(modules)} modules: {total / 1000:.0f} ms, {len(rows)} modules loaded\n")
+
+    print(f"{'cumulative ms':>13}  {'self ms':>7}  module")
+    for name, depth, self_us, cumulative_us in sorted(rows, key=lambda row: -row[3])[:top]:
+        print(f"{cumulative_us / 1000:>13.1f}  {self_us / 1000:>7.1f}  {'  ' * depth}{name}")
+
+    packages = defaultdict(int)
+    for name, _, self_us, _ in rows:
+        packages[name.split(".")[0]] += self_us
+    print(f"\n{'self ms':>7}  package")
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"{self_us / 1000:>7.1f}  {package}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("modules", nargs="*", help="Modules to import, defaults to the app modules")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+    main(args.modules or app_modules(), args.top)
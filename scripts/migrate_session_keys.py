@@ -0,0 +1,84 @@
+"""
+Move tokens stored in the old `{user_id}_{purpose}` string keys into the
+per-user session hashes, keeping their remaining lifetime. Safe to run
+while the API is serving: both layouts are accepted until it finishes and
+running it again only moves what is left.
+
+    python -m scripts.migrate_session_keys --batch-size 1000
+"""
+import argparse
+import asyncio
+import ssl
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.core.session_store import (
+    LEGACY_TOKEN_PURPOSES, session_key)
+
+
+# KEYS[1] = legacy key, KEYS[2] = session hash, ARGV = field, now.
+# Atomic, so a logout running meanwhile can not be undone by the move.
+_MIGRATE_SCRIPT = """
+local token = redis.call('GET', KEYS[1])
+local ttl = redis.call('TTL', KEYS[1])
+if not token or ttl <= 0 then
+    return 0
+end
+redis.call('HSET', KEYS[2], ARGV[1], (tonumber(ARGV[2]) + ttl) .. ':' .. token)
+if redis.call('TTL', KEYS[2]) < ttl then
+    redis.call('EXPIRE', KEYS[2], ttl)
+end
+redis.call('DEL', KEYS[1])
+return 1
+"""
+
+
+async def migrate(client: redis.Redis, purpose: str, batch_size: int) -> int:
+    moved = 0
+    batch = []
+
+    async def flush():
+        nonlocal moved
+        now = int(time.time())
+        async with client.pipeline(transaction=False) as pipe:
+            for key in batch:
+                user_id = key[:-len(purpose) - 1]
+                pipe.eval(_MIGRATE_SCRIPT, 2, key, session_key(user_id), purpose, now)
+            moved += sum(await pipe.execute())
+        batch.clear()
+
+    # SCAN walks the keyspace in small steps instead of blocking Redis like KEYS
+    async for key in client.scan_iter(match=f"*_{purpose}", count=batch_size):
+        batch.append(key)
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+    return moved
+
+
+async def main(batch_size: int) -> None:
+    client = redis.Redis.from_url(
+        settings.REDIS_URL, decode_responses=True,
+        ssl_cert_reqs=ssl.CERT_NONE, ssl_check_hostname=False)
+    try:
+        for purpose in LEGACY_TOKEN_PURPOSES:
+            started = time.perf_counter()
+            moved = await migrate(client, purpose, batch_size)
+            print(f"{purpose}: moved {moved} tokens in {time.perf_counter() - started:.1f}s")
+    finally:
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))